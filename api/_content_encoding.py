@@ -0,0 +1,64 @@
+"""
+Response compression for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/compression_service.py.
+"""
+import gzip
+from typing import Optional
+import _timing
+from _cache import LRUCache
+
+try:
+    import brotli # pyright: ignore[reportMissingImports]
+except ImportError: # brotli is optional; gzip is always available
+    brotli = None
+
+# Below this size the compressed body plus headers is rarely smaller than the original.
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Compressed bodies keyed by (content hash, encoding), so hot responses are compressed once.
+_compressed = LRUCache('compressed', maxsize=512)
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks the best encoding the client accepts, honouring q-values.
+    Brotli wins over gzip at equal preference; returns None for identity.
+    """
+    if not accept_encoding:
+        return None
+    preferences = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        preferences[coding] = q
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = preferences.get(encoding, preferences.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress(data: bytes, encoding: str, cache_key: Optional[str] = None) -> bytes:
+    if cache_key is not None:
+        cached = _compressed.get((cache_key, encoding))
+        if cached is not None:
+            return cached
+    with _timing.phase('compress'):
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if cache_key is not None:
+        _compressed.set((cache_key, encoding), compressed)
+    return compressed
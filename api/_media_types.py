@@ -0,0 +1,102 @@
+"""
+JSON/MessagePack/CBOR response encodings for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/encoding_service.py.
+"""
+import json
+from typing import Any, Callable, Optional, Tuple, Union
+import _timing
+
+try:
+    import orjson # pyright: ignore[reportMissingImports]
+except ImportError: # orjson is an optional, faster JSON encoder
+    orjson = None
+
+try:
+    import msgpack # pyright: ignore[reportMissingImports]
+except ImportError: # MessagePack support is optional
+    msgpack = None
+
+try:
+    import cbor2 # pyright: ignore[reportMissingImports]
+except ImportError: # CBOR support is optional
+    cbor2 = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CBOR = 'application/cbor'
+
+# Media types clients may ask for, mapped to the canonical type we answer with.
+_ALIASES = {
+    'application/json': JSON,
+    'application/msgpack': MSGPACK,
+    'application/x-msgpack': MSGPACK,
+    'application/vnd.msgpack': MSGPACK,
+    'application/cbor': CBOR,
+}
+
+def _stdlib_dumps(body: Any) -> bytes:
+    return json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+_json_dumps: Callable[[Any], Union[bytes, str]] = orjson.dumps if orjson is not None else _stdlib_dumps
+
+def set_json_encoder(dumps: Optional[Callable[[Any], Union[bytes, str]]]):
+    """
+    Plugs in a JSON encoder (e.g. rapidjson.dumps) returning bytes or str.
+    Passing None restores the default: orjson when installed, otherwise the stdlib.
+    """
+    global _json_dumps
+    if dumps is None:
+        dumps = orjson.dumps if orjson is not None else _stdlib_dumps
+    _json_dumps = dumps
+
+def encode_json(body: Any) -> bytes:
+    try:
+        data = _json_dumps(body)
+    except (TypeError, ValueError, OverflowError):
+        # Fast encoders are stricter (e.g. about integer size); the stdlib handles the rest.
+        data = _stdlib_dumps(body)
+    return data.encode('utf-8') if isinstance(data, str) else data
+
+def available_media_types() -> Tuple[str, ...]:
+    types = [JSON]
+    if msgpack is not None:
+        types.append(MSGPACK)
+    if cbor2 is not None:
+        types.append(CBOR)
+    return tuple(types)
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Picks the response media type from the Accept header. Binary encodings are only
+    chosen when explicitly preferred and their library is installed; anything else,
+    including wildcards, gets JSON so existing clients are unaffected.
+    """
+    if not accept:
+        return JSON
+    available = available_media_types()
+    best, best_q = JSON, 0.0
+    for part in accept.split(','):
+        media_type, _, params = part.strip().partition(';')
+        canonical = _ALIASES.get(media_type.strip().lower())
+        if canonical is None or canonical not in available:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = canonical, q
+    return best
+
+def encode(body: Any, media_type: str) -> bytes:
+    """Encodes a response body as JSON, MessagePack or CBOR."""
+    with _timing.phase('serialize'):
+        if media_type == MSGPACK:
+            return msgpack.packb(body, use_bin_type=True)
+        if media_type == CBOR:
+            return cbor2.dumps(body)
+        return encode_json(body)
@@ -0,0 +1,82 @@
+"""
+Text normalization and script classification for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/normalization_service.py.
+"""
+import unicodedata
+from bisect import bisect_right
+from typing import Optional
+
+HIRAGANA = 'hiragana'
+KATAKANA = 'katakana'
+KANJI = 'kanji'
+LATIN = 'latin'
+PUNCTUATION = 'punctuation'  # CJK symbols and punctuation such as 。 and 〜
+JAPANESE_SCRIPTS = (HIRAGANA, KATAKANA, KANJI)
+
+# (first, last, script), sorted by first code point. NFKC output never contains
+# half-width katakana or full-width Latin, so those blocks are not listed.
+# frontend/src/js/utils/textNormalization.js has the same table.
+_SCRIPT_RANGES = (
+    (0x0030, 0x0039, LATIN),  # digits count with the Latin letters around them
+    (0x0041, 0x005A, LATIN),
+    (0x0061, 0x007A, LATIN),
+    (0x00C0, 0x024F, LATIN),
+    (0x3000, 0x3004, PUNCTUATION),
+    (0x3005, 0x3007, KANJI),  # 々 〆 〇
+    (0x3008, 0x303F, PUNCTUATION),
+    (0x3041, 0x309F, HIRAGANA),
+    (0x30A0, 0x30FF, KATAKANA),  # includes the long vowel mark ー
+    (0x31F0, 0x31FF, KATAKANA),
+    (0x3400, 0x4DBF, KANJI),  # Extension A
+    (0x4E00, 0x9FFF, KANJI),
+    (0xF900, 0xFAFF, KANJI),
+    (0x20000, 0x3134F, KANJI),  # Extensions B-G and the compatibility supplement
+)
+_RANGE_STARTS = tuple(first for first, _, _ in _SCRIPT_RANGES)
+
+# Katakana ァ..ヶ sit exactly this far above their hiragana.
+KANA_OFFSET = 0x60
+_KATAKANA_TO_HIRAGANA = {code: code - KANA_OFFSET for code in range(ord('ァ'), ord('ヶ') + 1)}
+
+
+def script_of(ch: str) -> Optional[str]:
+    """The script of one character (HIRAGANA, KATAKANA, KANJI, LATIN or PUNCTUATION), or None for anything else."""
+    code = ord(ch)
+    i = bisect_right(_RANGE_STARTS, code) - 1
+    if i >= 0 and code <= _SCRIPT_RANGES[i][1]:
+        return _SCRIPT_RANGES[i][2]
+    return None
+
+
+def is_kanji(ch: str) -> bool:
+    return script_of(ch) == KANJI
+
+
+def is_japanese(text: str) -> bool:
+    """Whether text contains any hiragana, katakana or kanji."""
+    return any(script_of(ch) in JAPANESE_SCRIPTS for ch in text)
+
+
+def kanji_in(text: str) -> list:
+    """The distinct kanji in text, in order of first appearance."""
+    return list(dict.fromkeys(ch for ch in text if is_kanji(ch)))
+
+
+def normalize(text: str) -> str:
+    """
+    The canonical form of a query: NFKC (which folds full-width Latin and half-width
+    katakana to their usual width and compatibility kanji to unified ones), trimmed,
+    with runs of whitespace collapsed and Latin letters lower-cased. Kana stay as typed,
+    because Jisho answers hiragana and katakana queries differently.
+    """
+    return ' '.join(unicodedata.normalize('NFKC', text).split()).lower()
+
+
+def fold_kana(text: str) -> str:
+    """Text with katakana replaced by the corresponding hiragana."""
+    return text.translate(_KATAKANA_TO_HIRAGANA)
+
+
+def match_key(text: str) -> str:
+    """The form local lookups compare: normalized and kana-folded, so ニチ, ﾆﾁ and にち match."""
+    return fold_kana(normalize(text))
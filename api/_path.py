@@ -0,0 +1,140 @@
+"""
+Shortest paths between words through shared kanji, for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/path_service.py.
+"""
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+import _timing
+from _shared import kanji_node, word_node
+
+# Marks a node the search has not reached from that side.
+UNSEEN = -1
+
+
+class WordKanjiIndex:
+    """
+    The dataset as a bipartite graph in CSR form: nodes 0..len(words)-1 are words,
+    the rest are kanji, and the neighbours of node n are targets[offsets[n]:offsets[n + 1]].
+    Plain integer arrays keep the index small and the search free of per-node objects.
+    """
+    def __init__(self, words: Sequence):
+        self.words = list(words)
+        self.kanji = []
+        self._word_nodes: Dict[str, int] = {}
+        kanji_nodes: Dict[str, int] = {}
+        pairs = []
+        for node, word in enumerate(self.words):
+            self._word_nodes.setdefault(word.text, node)
+            for kanji in word.kanji_components:
+                if kanji.character not in kanji_nodes:
+                    kanji_nodes[kanji.character] = len(self.words) + len(self.kanji)
+                    self.kanji.append(kanji)
+                pairs.append((node, kanji_nodes[kanji.character]))
+        pairs = sorted(set(pairs))
+
+        size = len(self.words) + len(self.kanji)
+        degrees = array('i', [0]) * (size + 1)
+        for word_node, kanji_node in pairs:
+            degrees[word_node + 1] += 1
+            degrees[kanji_node + 1] += 1
+        for node in range(size):
+            degrees[node + 1] += degrees[node]
+        self.offsets = degrees
+        self.targets = array('i', [0]) * (2 * len(pairs))
+        fill = array('i', degrees[:-1])
+        for word_node, kanji_node in pairs:
+            self.targets[fill[word_node]] = kanji_node
+            fill[word_node] += 1
+            self.targets[fill[kanji_node]] = word_node
+            fill[kanji_node] += 1
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def word_node(self, text: str) -> Optional[int]:
+        return self._word_nodes.get(text)
+
+    def neighbours(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def shortest_path(self, source: int, target: int) -> Optional[List[int]]:
+        """
+        A shortest node path from source to target, or None when they are not
+        connected. Searches from both ends, always growing the smaller frontier by
+        one level, so it visits about the square root of what a one-sided search would.
+        """
+        if source == target:
+            return [source]
+        parents = (array('i', [UNSEEN]) * len(self), array('i', [UNSEEN]) * len(self))
+        parents[0][source] = source
+        parents[1][target] = target
+        frontiers = ([source], [target])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = parents[side], parents[1 - side]
+            next_frontier = []
+            for node in frontiers[side]:
+                for neighbour in self.neighbours(node):
+                    if seen[neighbour] != UNSEEN:
+                        continue
+                    seen[neighbour] = node
+                    if other[neighbour] != UNSEEN:
+                        return self._join(parents, neighbour)
+                    next_frontier.append(neighbour)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    @staticmethod
+    def _join(parents, meeting: int) -> List[int]:
+        path = [meeting]
+        for side in (0, 1):
+            node = meeting
+            half = []
+            while parents[side][node] != node:
+                node = parents[side][node]
+                half.append(node)
+            path = half[::-1] + path if side == 0 else path + half
+        return path
+
+    def to_graph(self, path: List[int]) -> Dict:
+        """The path as a node/edge graph with /api/graph's node shapes, every edge pointing from word to kanji."""
+        nodes = [self._node(n) for n in path]
+        edges = []
+        for a, b in zip(path, path[1:]):
+            word, kanji = (a, b) if a < len(self.words) else (b, a)
+            edges.append({'source': self._node_id(word), 'target': self._node_id(kanji), 'type': 'contains'})
+        return {'nodes': nodes, 'edges': edges}
+
+    def _node_id(self, node: int):
+        if node < len(self.words):
+            return self.words[node].id
+        return self.kanji[node - len(self.words)].character
+
+    def _node(self, node: int) -> Dict:
+        if node < len(self.words):
+            return word_node(self.words[node])
+        kanji = self.kanji[node - len(self.words)]
+        return kanji_node(kanji.character, [kanji.meaning] if kanji.meaning else [])
+
+
+# The index for the word list it was built from; load_words() returns the same list while warm.
+_index = (None, None)
+
+
+def word_index(words) -> WordKanjiIndex:
+    global _index
+    if _index[0] is not words:
+        _index = (words, WordKanjiIndex(words))
+    return _index[1]
+
+
+def find_path(words, source: str, target: str) -> Optional[Dict]:
+    """The shortest path between two dataset words as a graph, or None when there is none."""
+    index = word_index(words)
+    start, end = index.word_node(source), index.word_node(target)
+    if start is None or end is None:
+        return None
+    with _timing.phase('path'):
+        path = index.shortest_path(start, end)
+    return None if path is None else index.to_graph(path)
@@ -0,0 +1,93 @@
+"""
+Opt-in cProfile hook for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/profiling_service.py; on Vercel the stats are
+written under /tmp of the function instance, so the X-Profile-Top summary is
+usually the part to read.
+"""
+import cProfile
+import hmac
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+PROFILE_HEADER = 'X-Rinkuji-Profile'
+PROFILE_PARAM = '_profile'
+TOP_N = 5
+
+# Only one request is profiled at a time: the interpreter allows a single active profiler.
+_lock = threading.Lock()
+
+def is_authorized(supplied: Optional[str]) -> bool:
+    """
+    Profiling is disabled unless RINKUJI_PROFILE_TOKEN is set, and then only
+    requests presenting that exact token are profiled.
+    """
+    token = os.environ.get('RINKUJI_PROFILE_TOKEN')
+    if not token or not supplied:
+        return False
+    return hmac.compare_digest(token.encode(), supplied.encode())
+
+def output_dir() -> str:
+    return os.environ.get('RINKUJI_PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'rinkuji-profiles')
+
+
+class RequestProfiler:
+    """
+    Runs cProfile for the duration of a single request, writes the stats to
+    a .prof file (readable with pstats or snakeviz) and summarises the
+    functions with the highest self time.
+    """
+    def __init__(self, label: str):
+        self.label = label
+        self._profile: Optional[cProfile.Profile] = None
+
+    def start(self) -> bool:
+        if not _lock.acquire(blocking=False):
+            return False
+        self._profile = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is already attached to the interpreter.
+            self._profile = None
+            _lock.release()
+            return False
+        return True
+
+    def stop(self) -> Tuple[str, str]:
+        """Stops profiling and returns the path of the written stats file and a top-N summary."""
+        profile = self._finish()
+        if profile is None:
+            return '', ''
+        directory = output_dir()
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', self.label).strip('-') or 'root'
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{slug}.prof")
+        stats = pstats.Stats(profile)
+        stats.dump_stats(path)
+        return path, summarize(stats)
+
+    def discard(self):
+        self._finish()
+
+    def _finish(self) -> Optional[cProfile.Profile]:
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return None
+        profile.disable()
+        _lock.release()
+        return profile
+
+
+def summarize(stats: pstats.Stats, limit: int = TOP_N) -> str:
+    """Formats the functions with the most self time as 'file:line(func)=12.34ms; ...'."""
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    parts = []
+    for (filename, line, func), (_, _, self_time, _, _) in entries[:limit]:
+        location = f'{os.path.basename(filename)}:{line}' if line else filename
+        parts.append(f'{location}({func})={self_time * 1000:.2f}ms')
+    return '; '.join(parts)
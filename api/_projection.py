@@ -0,0 +1,80 @@
+"""
+Field projection for Jisho results in the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/projection_service.py.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+SLIM_VIEW = 'slim'
+# What the frontend needs to draw and label an expansion node.
+SLIM_FIELDS = ('slug', 'is_consolidated', 'readings', 'meanings', 'consolidated_members')
+# MeaningDisplayManager shows at most this many senses per consolidated member.
+MAX_MEMBER_SENSES = 3
+
+class Projection(NamedTuple):
+    """The subset of per-item fields a client asked for. Hashable, so it can key caches."""
+    fields: Tuple[str, ...]
+    slim: bool = False
+
+
+def parse_projection(fields: Optional[str], view: Optional[str]) -> Optional[Projection]:
+    """
+    Builds a Projection from the 'fields' (comma-separated) and 'view' query parameters.
+    Returns None when neither is given; raises ValueError for an unknown view.
+    """
+    if view:
+        if view != SLIM_VIEW:
+            raise ValueError(f"Unknown view '{view}'. Supported views: {SLIM_VIEW}.")
+        return Projection(SLIM_FIELDS, slim=True)
+    if fields:
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+        if names:
+            return Projection(names)
+    return None
+
+
+def _readings(item: Dict[str, Any]) -> List[str]:
+    if 'readings' in item:
+        return item['readings']
+    return [jp['reading'] for jp in item.get('japanese', []) if jp.get('reading')]
+
+def _meanings(item: Dict[str, Any]) -> List[str]:
+    if 'meanings' in item:
+        return item['meanings']
+    definitions = (item.get('senses') or [{}])[0].get('english_definitions') or []
+    return definitions[:1]
+
+def _slim_member(member: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'slug': member.get('slug'),
+        'japanese': [{'reading': jp['reading']} for jp in member.get('japanese', []) if jp.get('reading')],
+        'senses': [
+            {'english_definitions': sense.get('english_definitions', [])}
+            for sense in member.get('senses', [])[:MAX_MEMBER_SENSES]
+        ],
+    }
+
+# Fields that are derived when a raw Jisho item does not carry them directly.
+_DERIVED_FIELDS = {
+    'readings': _readings,
+    'meanings': _meanings,
+    'is_consolidated': lambda item: item.get('is_consolidated', False),
+}
+
+
+def project_item(item: Dict[str, Any], projection: Projection) -> Dict[str, Any]:
+    projected = {}
+    for name in projection.fields:
+        if name in _DERIVED_FIELDS:
+            projected[name] = _DERIVED_FIELDS[name](item)
+        elif name in item:
+            projected[name] = item[name]
+    if projection.slim and 'consolidated_members' in projected:
+        projected['consolidated_members'] = [_slim_member(m) for m in projected['consolidated_members']]
+    return projected
+
+
+def project_results(result: Dict[str, Any], projection: Projection) -> Dict[str, Any]:
+    """Projects every item in result['data'], leaving other top-level keys (e.g. 'meta') untouched."""
+    projected = dict(result)
+    projected['data'] = [project_item(item, projection) for item in result.get('data', [])]
+    return projected
@@ -0,0 +1,78 @@
+"""
+Kana reading lookups over data.json for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/reading_service.py.
+"""
+from typing import Dict, List, Sequence
+
+from _normalization import HIRAGANA, KATAKANA, fold_kana, normalize, script_of
+
+# Dictionary notation inside readings: okurigana dots (かた.る) and affix dashes (-び).
+READING_MARKS = str.maketrans('', '', '.-')
+
+
+def fold_reading(reading: str) -> str:
+    """A reading in the form the index uses: normalized hiragana, without okurigana dots or affix dashes."""
+    return fold_kana(normalize(reading).translate(READING_MARKS))
+
+
+def is_kana(text: str) -> bool:
+    """Whether text is a (possibly marked-up) reading: hiragana, katakana and the long vowel mark only."""
+    folded = fold_reading(text)
+    return bool(folded) and all(script_of(ch) in (HIRAGANA, KATAKANA) for ch in folded)
+
+
+class ReadingIndex:
+    """
+    Maps folded readings to the dataset kanji and words read that way. A kun reading
+    with okurigana is indexed both whole (かたる) and by its stem (かた), since either
+    is what someone typing the kanji's reading would enter.
+    """
+    def __init__(self, words: Sequence):
+        self._kanji: Dict[str, Dict] = {}
+        self._words: Dict[str, List] = {}
+        for word in words:
+            if word.reading and is_kana(word.reading):
+                self._words.setdefault(fold_reading(word.reading), []).append(word)
+            for kanji in word.kanji_components:
+                for reading in list(kanji.on_reading) + list(kanji.kun_reading):
+                    forms = {fold_reading(reading)}
+                    if '.' in reading:
+                        forms.add(fold_reading(reading.split('.', 1)[0]))
+                    for form in forms:
+                        if form:
+                            self._kanji.setdefault(form, {}).setdefault(kanji.character, kanji)
+
+    def kanji(self, reading: str) -> List:
+        return list(self._kanji.get(fold_reading(reading), {}).values())
+
+    def words(self, reading: str) -> List:
+        return list(self._words.get(fold_reading(reading), []))
+
+
+# The index for the word list load_words() last returned.
+_index = (None, None)
+
+
+def reading_index(words) -> ReadingIndex:
+    global _index
+    if _index[0] is not words:
+        _index = (words, ReadingIndex(words))
+    return _index[1]
+
+
+def words_for_reading(words, reading: str) -> List:
+    """Dataset words read as `reading`; empty for anything that is not kana."""
+    if not is_kana(reading):
+        return []
+    return reading_index(words).words(reading)
+
+
+def lookup(words, reading: str) -> Dict:
+    """The kanji having `reading` as an on or kun reading, and the words read that way."""
+    index = reading_index(words)
+    return {
+        'reading': fold_reading(reading),
+        'kanji': [kanji.to_dict() for kanji in index.kanji(reading)],
+        'words': [{'id': w.id, 'text': w.text, 'reading': w.reading, 'meaning': w.meaning}
+                  for w in index.words(reading)],
+    }
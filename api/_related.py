@@ -0,0 +1,155 @@
+"""
+Kanji co-occurrence neighbours for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/related_kanji_service.py.
+"""
+import gzip
+import json
+import math
+import os
+from collections import Counter
+from itertools import combinations
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import _metrics
+import _timing
+
+RELATED_VERSION = 1
+DEFAULT_RELATED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'related_kanji.json.gz')
+RELATED_PATH_ENV = 'RINKUJI_RELATED_KANJI'
+# Neighbours kept per kanji, and the most /api/related_kanji returns.
+DEFAULT_TOP_K = 20
+# Most related kanji /api/graph adds per component kanji with 'related'.
+MAX_GRAPH_RELATED = 5
+
+# kanji -> [(neighbour, score, words containing both)], best first
+Neighbours = Mapping[str, List[Tuple[str, float, int]]]
+
+
+class RelatedIndex(NamedTuple):
+    """Top neighbours per kanji, with the dataset version they were computed from."""
+    dataset_version: Optional[str]
+    neighbours: Neighbours
+
+
+def related_path() -> str:
+    return os.environ.get(RELATED_PATH_ENV) or DEFAULT_RELATED_PATH
+
+
+def _npmi(pair: int, a: int, b: int, total: int) -> float:
+    """Normalized PMI of two kanji over `total` words: 1 when they always appear together, 0 when independent."""
+    if pair == total:
+        return 1.0
+    return math.log(pair * total / (a * b)) / -math.log(pair / total)
+
+
+def build_related(words: Sequence, top_k: int = DEFAULT_TOP_K, min_count: int = 1) -> Dict[str, List[Tuple[str, float, int]]]:
+    """
+    Counts, for every pair of kanji, the words containing both, and keeps each kanji's
+    top_k neighbours by normalized PMI. Pairs seen in fewer than min_count words or
+    not positively associated are dropped. Every dataset kanji gets an entry.
+    """
+    codes: Dict[str, int] = {}
+    per_word = []
+    for word in words:
+        kanji = sorted({codes.setdefault(k.character, len(codes)) for k in word.kanji_components})
+        if kanji:
+            per_word.append(kanji)
+    characters = list(codes)
+    size = len(characters)
+    # Pairs are packed into one int, so the counting stays inside Counter's C loop.
+    singles = Counter(code for kanji in per_word for code in kanji)
+    pairs = Counter(a * size + b for kanji in per_word for a, b in combinations(kanji, 2))
+
+    candidates: Dict[int, List[Tuple[float, int, int]]] = {code: [] for code in range(size)}
+    total = len(per_word)
+    for packed, count in pairs.items():
+        if count < min_count:
+            continue
+        a, b = divmod(packed, size)
+        score = _npmi(count, singles[a], singles[b], total)
+        if score <= 0:
+            continue
+        candidates[a].append((score, count, b))
+        candidates[b].append((score, count, a))
+
+    related = {}
+    for code, neighbours in candidates.items():
+        neighbours.sort(key=lambda n: (-n[0], -n[1], characters[n[2]]))
+        related[characters[code]] = [(characters[b], round(score, 4), count) for score, count, b in neighbours[:top_k]]
+    return related
+
+
+def load_related(path: Optional[str] = None) -> Optional[RelatedIndex]:
+    """Loads neighbours written by `flask build-related-kanji`; None when there is no usable file."""
+    path = path or related_path()
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable related kanji file {path}: {e}")
+        return None
+    if data.get('version') != RELATED_VERSION:
+        return None
+    return RelatedIndex(data.get('dataset_version'), MappingProxyType({
+        kanji: [tuple(n) for n in neighbours] for kanji, neighbours in data.get('related', {}).items()
+    }))
+
+
+def parse_limit(value: Optional[str]) -> int:
+    """The 'limit' query parameter of /api/related_kanji: neighbours returned, all that are kept when absent."""
+    if value is None:
+        return DEFAULT_TOP_K
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= DEFAULT_TOP_K:
+        raise ValueError(f"'limit' must be between 1 and {DEFAULT_TOP_K}.")
+    return limit
+
+
+def parse_related(value: Optional[str]) -> int:
+    """The 'related' query parameter of /api/graph: related kanji added per component kanji, 0 when absent."""
+    if value is None:
+        return 0
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if not 0 <= count <= MAX_GRAPH_RELATED:
+        raise ValueError(f"'related' must be between 0 and {MAX_GRAPH_RELATED}.")
+    return count
+
+
+_precomputed = load_related()
+# (word list, neighbours, kanji meanings) for the word list load_words() last returned.
+_index = (None, None, {})
+
+
+def index(words, dataset_version: str) -> Neighbours:
+    """The neighbour index for `words`: the precomputed one when it matches their version, else built once."""
+    global _index
+    if _index[0] is not words:
+        hit = _precomputed is not None and _precomputed.dataset_version == dataset_version
+        if hit:
+            neighbours = _precomputed.neighbours
+        else:
+            with _timing.phase('related'):
+                neighbours = build_related(words)
+        _metrics.record_cache_lookup('related_precomputed', hit=hit)
+        meanings = {k.character: k.meaning for w in words for k in w.kanji_components}
+        _index = (words, neighbours, meanings)
+    return _index[1]
+
+
+def related(words, dataset_version: str, kanji: str, limit: int = DEFAULT_TOP_K) -> Optional[List[Dict]]:
+    """The kanji most associated with `kanji`, best first; None when it is not in the dataset."""
+    neighbours = index(words, dataset_version).get(kanji)
+    if neighbours is None:
+        return None
+    meanings = _index[2]
+    return [{'kanji': other, 'meaning': meanings.get(other, ''), 'score': score, 'count': count}
+            for other, score, count in neighbours[:limit]]
@@ -3,11 +3,35 @@ Shared utilities for Rinkuji Vercel serverless functions.
 This module provides data loading, Jisho API access, and graph generation
 without relying on Flask's application context or app-level state.
 """
+import contextvars
+import gzip
+import hashlib
 import json
+import math
 import os
-import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from types import MappingProxyType
+from urllib.parse import urlparse, parse_qs
 import requests as _requests
 
+import _content_encoding
+import _media_types
+import _metrics
+import _normalization
+from _cache import LRUCache
+from _circuit_breaker import OPEN, CircuitBreaker, CircuitOpenError
+from _latency import HedgeBudget, LatencyTracker, hedged_call
+from _exclusion import exclude_known
+from _projection import project_results
+import _related
+from _sampling import select
+import _profiling
+from _scheduler import EXPANSION, INTERACTIVE, QueueRejected, UpstreamScheduler
+import _timing
+
 # ---------------------------------------------------------------------------
 # Path helpers
 # ---------------------------------------------------------------------------
@@ -80,21 +104,53 @@ class Word:
 # ---------------------------------------------------------------------------
 
 _words_cache = None
+_dataset_version = None
 
 def load_words():
     """Load and cache word data from data.json."""
-    global _words_cache
+    global _words_cache, _dataset_version
     if _words_cache is not None:
+        _metrics.record_cache_lookup('words', hit=True)
         return _words_cache
-    with open(_data_file_path(), 'r', encoding='utf-8') as f:
+    _metrics.record_cache_lookup('words', hit=False)
+    with _timing.phase('load'), open(_data_file_path(), 'r', encoding='utf-8') as f:
         data = json.load(f)
     _words_cache = [Word.from_dict(item) for item in data]
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    _dataset_version = hashlib.blake2b(canonical, digest_size=8).hexdigest()
+    _metrics.set_dataset_size('words', len(_words_cache))
+    _metrics.set_dataset_size('kanji', len({k.id for w in _words_cache for k in w.kanji_components}))
     return _words_cache
 
+def dataset_version():
+    """Content hash of data.json; keys caches derived from it."""
+    load_words()
+    return _dataset_version
+
+# (word list, kanji by character) for the list load_words() last returned.
+_kanji_index = (None, {})
+
+def kanji_by_character():
+    """Dataset kanji keyed by character (the first entry wins when one appears in several words)."""
+    global _kanji_index
+    words = load_words()
+    if _kanji_index[0] is not words:
+        index = {}
+        for word in words:
+            for kanji in word.kanji_components:
+                index.setdefault(kanji.character, kanji)
+        _kanji_index = (words, index)
+    return _kanji_index[1]
+
+_raw_data = None
+
 def load_raw_data():
-    """Load raw JSON list from data.json (used by suggestions)."""
-    with open(_data_file_path(), 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load and cache the raw JSON list from data.json (used by suggestions)."""
+    global _raw_data
+    if _raw_data is None:
+        with open(_data_file_path(), 'r', encoding='utf-8') as f:
+            _raw_data = json.load(f)
+    return _raw_data
 
 
 # ---------------------------------------------------------------------------
@@ -102,118 +158,588 @@ def load_raw_data():
 # ---------------------------------------------------------------------------
 
 JISHO_API_URL = "https://jisho.org/api/v1/search/words"
+# Jisho entries change rarely; an hour keeps hot lookups local without serving stale data for long.
+JISHO_CACHE_TTL = 3600
+_jisho_results = LRUCache('jisho', maxsize=1024, ttl=JISHO_CACHE_TTL)
+_jisho_projections = LRUCache('jisho_projection', maxsize=1024, ttl=JISHO_CACHE_TTL)
+# Empty result sets expire quickly so words Jisho adds later are not hidden for an hour.
+JISHO_NEGATIVE_CACHE_TTL = 300
+# Last good results, used to answer while Jisho is failing.
+_jisho_stale = LRUCache('jisho_stale', maxsize=1024, ttl=86400)
+_jisho_breaker = CircuitBreaker('jisho')
+# (connect, read) seconds; the read timeout adapts to observed latency, up to this maximum.
+JISHO_TIMEOUT = (3.05, 10)
+JISHO_HEDGE_REQUESTS = True
+# Jisho returns at most this many words per page; a shorter page is the last one.
+JISHO_PAGE_SIZE = 20
+# Most pages one request may read, and how many of them are requested from Jisho at once.
+JISHO_MAX_PAGES = 5
+JISHO_PAGE_CONCURRENCY = 3
+_jisho_latency = LatencyTracker('jisho', max_timeout=JISHO_TIMEOUT[1])
+_jisho_hedge_budget = HedgeBudget()
+_jisho_scheduler = UpstreamScheduler('jisho')
+# Upstream calls that were not attempted; answered from stale data or with a 503.
+_UNAVAILABLE = (CircuitOpenError, QueueRejected)
+JISHO_SNAPSHOT_VERSION = 1
+
+def _load_jisho_snapshot():
+    """
+    Read-only results precomputed by `flask warm-cache`, bundled next to data.json.
+    Mirrors backend/src/services/snapshot_service.load_snapshot.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = os.environ.get('RINKUJI_JISHO_SNAPSHOT') or os.path.join(here, '..', 'backend', 'jisho_snapshot.json.gz')
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable Jisho snapshot {path}: {e}")
+        return {}
+    if data.get('version') != JISHO_SNAPSHOT_VERSION:
+        return {}
+    entries = {
+        (endpoint, query): result
+        for endpoint, results in data.get('entries', {}).items()
+        for query, result in results.items()
+    }
+    _metrics.set_dataset_size('jisho_snapshot', len(entries))
+    return MappingProxyType(entries)
+
+_jisho_snapshot = _load_jisho_snapshot()
 
 def is_japanese(text: str) -> bool:
-    return bool(re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', text))
-
-def search_words(query: str):
-    """Proxy search to Jisho words API, filtering non-Japanese results."""
+    return _normalization.is_japanese(text)
+
+def _jisho_get(url: str, endpoint: str, priority=INTERACTIVE):
+    """GET a Jisho URL through the scheduler and circuit breaker, recording latency and outcome."""
+    if _jisho_breaker.state == OPEN: # fail fast instead of queueing for a call that cannot go out
+        raise CircuitOpenError("Circuit 'jisho' is open")
+    with _jisho_scheduler.slot(priority):
+        return _jisho_send(url, endpoint)
+
+def _jisho_send(url: str, endpoint: str):
+    admission = _jisho_breaker.allow()
+    if not admission:
+        raise CircuitOpenError("Circuit 'jisho' is open")
+    timeout = (JISHO_TIMEOUT[0], _jisho_latency.timeout())
+    hedge_delay = _jisho_latency.hedge_delay() if JISHO_HEDGE_REQUESTS else None
+    start = time.perf_counter()
+    try:
+        with _timing.phase('jisho'):
+            resp = hedged_call('jisho', lambda: _jisho_attempt(url, timeout), hedge_delay, _jisho_hedge_budget,
+                               _jisho_scheduler.take_token)
+    except BaseException: # anything but success, so a half-open probe always gives its slot back
+        _jisho_breaker.record_failure(admission)
+        _metrics.observe_jisho_call(endpoint, time.perf_counter() - start, ok=False)
+        raise
+    _jisho_breaker.record_success(admission)
+    _metrics.observe_jisho_call(endpoint, time.perf_counter() - start, ok=True)
+    return resp
+
+def _jisho_attempt(url: str, timeout):
+    """One upstream request; a timeout counts as a sample at the timeout value."""
+    start = time.perf_counter()
+    try:
+        resp = _requests.get(url, timeout=timeout)
+    except _requests.exceptions.Timeout:
+        _jisho_latency.observe(timeout[1])
+        raise
+    _jisho_latency.observe(time.perf_counter() - start)
+    resp.raise_for_status()
+    return resp
+
+def _jisho_ttl(has_data):
+    """Mirrors JishoService._ttl: results upstream had nothing for, and their projections, expire early."""
+    return None if has_data else JISHO_NEGATIVE_CACHE_TTL
+
+def _cached(key, fetch, projection):
+    """
+    Serve a result (or its projection) from the cache, fetching it on a miss.
+    Failed fetches fall back to the last good result when there is one.
+    """
+    if projection is not None:
+        projected = _jisho_projections.get((key, projection))
+        if projected is not None:
+            return projected, 200
+    stale = False
+    result = _jisho_results.get(key)
+    if result is None and _jisho_snapshot:
+        result = _jisho_snapshot.get(key)
+        _metrics.record_cache_lookup('jisho_snapshot', hit=result is not None)
+    if result is None:
+        try:
+            result = fetch()
+        except (_requests.exceptions.RequestException, *_UNAVAILABLE) as e:
+            result = _jisho_stale.get(key)
+            if result is None:
+                if isinstance(e, _UNAVAILABLE):
+                    _metrics.record_jisho_fallback('rejected')
+                    return {"error": "The external API is temporarily unavailable."}, 503
+                print(f"Jisho {key[0]} error: {e}")
+                return {"error": "Failed to fetch data from the external API."}, 502
+            stale = True
+            _metrics.record_jisho_fallback('stale')
+            _timing.describe('jisho', 'stale')
+        else:
+            _jisho_results.set(key, result, ttl=_jisho_ttl(result.get('data')))
+            _jisho_stale.set(key, result)
+    if projection is None:
+        return result, 200
+    projected = project_results(result, projection)
+    if not stale:
+        _jisho_projections.set((key, projection), projected, ttl=_jisho_ttl(result.get('data')))
+    return projected, 200
+
+
+def search_words(query: str, projection=None, priority=INTERACTIVE, max_pages: int = 1):
+    """
+    Proxy search to Jisho words API, filtering non-Japanese results; reads up to max_pages pages.
+    The query is normalized first, so width and case variants share cache entries.
+    """
+    query = _normalization.normalize(query or '')
     if not query:
         return {"error": "A 'query' parameter is required."}, 400
-    try:
-        resp = _requests.get(f"{JISHO_API_URL}?keyword={query}", timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        if 'data' in data:
-            data['data'] = [
-                item for item in data['data']
-                if 'slug' in item and is_japanese(item['slug'])
-            ]
-        return data, 200
-    except _requests.exceptions.RequestException as e:
-        print(f"Jisho search_words error: {e}")
-        return {"error": "Failed to fetch data from the external API."}, 502
-
-
-def search_by_kanji(kanji: str):
-    """Proxy single-kanji search to Jisho, consolidating duplicate slugs."""
+    if max_pages > 1:
+        return _multi_page('search_words', query, projection, priority, max_pages)
+    return _cached(('search_words', query), lambda: _fetch_words(query, priority), projection)
+
+def _fetch_words(query: str, priority=INTERACTIVE, page_number=1):
+    url = f"{JISHO_API_URL}?keyword={query}"
+    if page_number > 1:
+        url += f"&page={page_number}"
+    resp = _jisho_get(url, 'search_words', priority)
+    data = resp.json()
+    if 'data' in data:
+        data['data'] = [
+            item for item in data['data']
+            if 'slug' in item and is_japanese(item['slug'])
+        ]
+    return data
+
+
+def search_by_kanji(kanji: str, projection=None, priority=INTERACTIVE, page=None, exclude=None, max_pages: int = 1):
+    """
+    Proxy single-kanji search to Jisho, consolidating duplicate slugs (across up to
+    max_pages pages). With a page, returns that window (or seeded sample); slugs in
+    exclude are left out first.
+    """
+    kanji = _normalization.normalize(kanji or '')
     if not kanji or len(kanji) != 1:
         return {"error": "A single 'kanji' character parameter is required."}, 400
-    try:
-        resp = _requests.get(f"{JISHO_API_URL}?keyword={kanji}", timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
+    if page is not None:
+        return _paged_by_kanji(kanji, page, projection, priority, exclude)
+    if max_pages > 1:
+        result, status = _multi_page('search_by_kanji', kanji, projection, priority, max_pages)
+    else:
+        result, status = _cached(('search_by_kanji', kanji), lambda: _fetch_kanji(kanji, priority), projection)
+    if exclude is not None and status == 200:
+        return exclude_known(result, exclude), status
+    return result, status
+
+def _fetch_kanji(kanji: str, priority=INTERACTIVE, page_number=1):
+    url = f"{JISHO_API_URL}?keyword={kanji}"
+    if page_number > 1:
+        url += f"&page={page_number}"
+    resp = _jisho_get(url, 'search_by_kanji', priority)
+    return _consolidate(resp.json())
+
+
+def _jisho_page(endpoint: str, query: str, page_number: int, priority):
+    """One upstream page, cached on its own; page 1 is the unpaginated result."""
+    key = (endpoint, query) if page_number == 1 else (endpoint, query, page_number)
+    fetch = _fetch_kanji if endpoint == 'search_by_kanji' else _fetch_words
+    return key, _cached(key, lambda: fetch(query, priority, page_number), None)
+
+def _is_full_page(result) -> bool:
+    """Whether a page held a full page of upstream words (consolidated entries count per member)."""
+    count = sum(len(item['consolidated_members']) if item.get('is_consolidated') else 1
+                for item in result.get('data', []))
+    return count >= JISHO_PAGE_SIZE
+
+def _read_pages(endpoint: str, query: str, priority, max_pages: int, wanted=math.inf):
+    """
+    Read pages until they hold `wanted` items, a short page ends the results or
+    max_pages is reached. Later pages are requested JISHO_PAGE_CONCURRENCY at a time
+    and merged in page order; pages past a short one are discarded.
+    Returns (merger, keys, last page was full) or (error, status, None).
+    """
+    key, (first, status) = _jisho_page(endpoint, query, 1, priority)
+    if status != 200:
+        return first, status, None
+    merger = PageMerger(consolidate=endpoint == 'search_by_kanji')
+    merger.add(first)
+    keys = [key]
+    last_full = _is_full_page(first)
+    while last_full and len(keys) < max_pages and len(merger) < wanted:
+        start = len(keys) + 1
+        count = min(JISHO_PAGE_CONCURRENCY, max_pages - len(keys))
+        if wanted != math.inf:
+            count = min(count, math.ceil((wanted - len(merger)) / JISHO_PAGE_SIZE))
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, _jisho_page, endpoint, query, n, priority)
+                       for n in range(start, start + count)]
+            for future in futures:
+                key, (result, status) = future.result()
+                if status != 200:
+                    return result, status, None
+                merger.add(result)
+                keys.append(key)
+                last_full = _is_full_page(result)
+                if not last_full:
+                    break
+    return merger, keys, last_full
+
+def _fresh(keys) -> bool:
+    return all(key in _jisho_results or key in _jisho_snapshot for key in keys)
+
+def _multi_page(endpoint: str, query: str, projection, priority, max_pages: int):
+    max_pages = min(max_pages, JISHO_MAX_PAGES)
+    cache_key = ((endpoint, query), projection, ('pages', max_pages))
+    cached = _jisho_projections.get(cache_key)
+    if cached is not None:
+        return cached, 200
+    merger, keys, more_upstream = _read_pages(endpoint, query, priority, max_pages)
+    if more_upstream is None: # merger and keys hold the error body and status
+        return merger, keys
+    body = {'data': merger.items(), 'pages': len(keys), 'has_more': more_upstream}
+    if projection is not None:
+        body = project_results(body, projection)
+    if _fresh(keys):
+        _jisho_projections.set(cache_key, body, ttl=_jisho_ttl(len(merger)))
+    return body, 200
+
+def _paged_by_kanji(kanji: str, page, projection, priority, exclude):
+    cache_key = (('search_by_kanji', kanji), projection, page)
+    if exclude is None:
+        cached = _jisho_projections.get(cache_key)
+        if cached is not None:
+            return cached, 200
+    # A seeded sample is drawn from the first page; a plain window reads as many pages as its end needs.
+    wanted = JISHO_PAGE_SIZE if page.seed is not None else page.offset + page.limit
+    merger, keys, more_upstream = _read_pages('search_by_kanji', kanji, priority,
+                                              1 if page.seed is not None else JISHO_MAX_PAGES, wanted)
+    if more_upstream is None: # merger and keys hold the error body and status
+        return merger, keys
+    items = merger.items()
+    if exclude is not None:
+        items = [item for item in items if item.get('slug') not in exclude]
+    end = page.offset + page.limit
+    body = {'data': select(items, page, kanji), 'offset': page.offset, 'limit': page.limit,
+            'has_more': len(items) > end or (page.seed is None and more_upstream and len(keys) < JISHO_MAX_PAGES)}
+    if page.seed is not None:
+        body['seed'] = page.seed
+    if projection is not None:
+        body = project_results(body, projection)
+    if exclude is None and _fresh(keys):
+        _jisho_projections.set(cache_key, body, ttl=_jisho_ttl(len(merger)))
+    return body, 200
+
+
+def _consolidate(data):
+    """Group Jisho results by base slug, merging duplicates into consolidated entries."""
+    with _timing.phase('consolidate'):
         processed = {}
         for result in data.get("data", []):
             slug = result.get("slug")
             if slug and is_japanese(slug):
                 base = slug.split('-')[0]
                 processed.setdefault(base, []).append(result)
-
-        final = []
-        for base, results in processed.items():
-            if len(results) > 1:
-                final.append({
-                    "slug": base,
-                    "meanings": [
-                        res.get("senses", [{}])[0].get("english_definitions", [])[0] or ""
-                        for res in results
-                    ],
-                    "readings": [
-                        jp.get("reading")
-                        for res in results
-                        for jp in res.get("japanese", [])
-                        if jp.get("reading")
-                    ],
-                    "is_consolidated": True,
-                    "consolidated_members": results,
-                })
-            else:
-                final.append(results[0])
-        return {"data": final}, 200
-    except _requests.exceptions.RequestException as e:
-        print(f"Jisho search_by_kanji error: {e}")
-        return {"error": "Failed to fetch data from the external API."}, 502
+        return {"data": [_consolidated_entry(base, results) for base, results in processed.items()]}
+
+def _consolidated_entry(base, results):
+    """The entry for one base slug: the word itself, or a consolidated entry for several."""
+    if len(results) == 1:
+        return results[0]
+    return {
+        "slug": base,
+        "meanings": [
+            res.get("senses", [{}])[0].get("english_definitions", [])[0] or ""
+            for res in results
+        ],
+        "readings": [
+            jp.get("reading")
+            for res in results
+            for jp in res.get("japanese", [])
+            if jp.get("reading")
+        ],
+        "is_consolidated": True,
+        "consolidated_members": results,
+    }
+
+
+class PageMerger:
+    """
+    Accumulates result pages in order. Kanji results are regrouped by base slug as
+    each page arrives (a group may span pages); word results are deduplicated by slug.
+    Mirrors backend/src/services/jisho_service.PageMerger.
+    """
+    def __init__(self, consolidate: bool):
+        self.consolidate = consolidate
+        self._groups = {}
+        self._pages = []
+
+    def add(self, result):
+        self._pages.append(result)
+        with _timing.phase('consolidate'):
+            for item in result.get('data', []):
+                if self.consolidate:
+                    members = item['consolidated_members'] if item.get('is_consolidated') else [item]
+                    self._groups.setdefault(item['slug'].split('-')[0], []).extend(members)
+                else:
+                    self._groups.setdefault(item.get('slug'), [item])
+
+    def __len__(self):
+        return len(self._groups)
+
+    def items(self):
+        if len(self._pages) == 1:
+            return self._pages[0].get('data', [])
+        if not self.consolidate:
+            return [group[0] for group in self._groups.values()]
+        return [_consolidated_entry(base, members) for base, members in self._groups.items()]
 
 
 # ---------------------------------------------------------------------------
 # Graph generation
 # ---------------------------------------------------------------------------
 
-def generate_graph(target_words):
+_graphs = LRUCache('graph', maxsize=256)
+# Upper bound on a cached graph's life; it also expires with the first Jisho result it used.
+GRAPH_CACHE_TTL = 86400
+GRAPH_CACHE_VERSION = 1
+
+def _load_precomputed_graphs():
+    """
+    Read-only graphs built by `flask precompute-graphs`, keyed by (dataset version, word ids).
+    Mirrors backend/src/services/graph_cache_service.load_precomputed.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = os.environ.get('RINKUJI_GRAPH_CACHE') or os.path.join(here, '..', 'backend', 'graph_cache.json.gz')
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable graph cache {path}: {e}")
+        return {}
+    if data.get('version') != GRAPH_CACHE_VERSION:
+        return {}
+    now = time.time()
+    return MappingProxyType({
+        (data.get('dataset_version'), tuple(int(i) for i in ids.split(','))): (entry['graph'], entry.get('expires'))
+        for ids, entry in data.get('graphs', {}).items()
+        if entry.get('expires') is None or entry['expires'] > now
+    })
+
+_precomputed_graphs = _load_precomputed_graphs()
+
+def _jisho_expires_in(kanji: str):
+    """Seconds until the cached search_by_kanji result expires; inf for snapshot results, None if not fresh."""
+    key = ('search_by_kanji', kanji)
+    remaining = _jisho_results.expires_in(key)
+    if remaining is None and key in _jisho_snapshot:
+        return math.inf
+    return remaining
+
+def generate_graph(target_words, related: int = 0):
+    """
+    Graph for target_words, cached by dataset version and word ids until the earliest
+    Jisho result it was built from expires. Graphs built on a failed lookup are not cached.
+    With `related`, each component kanji also links to that many co-occurring kanji.
+    """
+    load_words()
+    key = (_dataset_version, tuple(word.id for word in target_words))
+    if related:
+        key += (('related', related),)
+    graph = _graphs.get(key)
+    if graph is None and _precomputed_graphs:
+        graph, expires = _precomputed_graphs.get(key, (None, None))
+        if graph is not None and expires is not None and expires <= time.time():
+            graph = None
+        _metrics.record_cache_lookup('graph_precomputed', hit=graph is not None)
+    if graph is not None:
+        return graph
+    with _metrics.GRAPH_BUILD_DURATION.time(), _timing.phase('build'):
+        graph = _build_graph(target_words)
+        if related:
+            _add_related(graph, target_words, related)
+    _metrics.GRAPH_NODES.observe(len(graph['nodes']))
+    remaining = [_jisho_expires_in(k.character) for word in target_words for k in word.kanji_components]
+    if all(r is not None for r in remaining):
+        _graphs.set(key, graph, ttl=min(min(remaining, default=math.inf), GRAPH_CACHE_TTL))
+    return graph
+
+def word_node(word):
+    """A dataset word as a graph node."""
+    return {'id': word.id, 'text': word.text, 'type': 'word', 'meaning': word.meaning, 'reading': word.reading}
+
+def kanji_node(text, meanings, is_consolidated=False):
+    """A kanji (or word found through one) as a graph node; /api/path builds the same shape."""
+    return {'id': text, 'text': text, 'type': 'kanji', 'meanings': meanings, 'is_consolidated': is_consolidated}
+
+def _build_graph(target_words):
     nodes = []
     edges = []
     for word in target_words:
-        nodes.append({
-            'id': word.id,
-            'text': word.text,
-            'type': 'word',
-            'meaning': word.meaning,
-            'reading': word.reading,
-        })
+        nodes.append(word_node(word))
         for kanji_char in word.kanji_components:
-            kanji_data, _ = search_by_kanji(kanji_char.character)
+            kanji_data, _ = search_by_kanji(kanji_char.character, priority=EXPANSION)
             for kanji in kanji_data.get("data", []):
                 if isinstance(kanji, dict):
                     slug = kanji.get('slug')
                     if slug and not any(n['id'] == slug for n in nodes):
-                        nodes.append({
-                            'id': slug,
-                            'text': slug,
-                            'type': 'kanji',
-                            'meanings': kanji.get('meanings', []),
-                            'is_consolidated': kanji.get('is_consolidated', False),
-                        })
+                        nodes.append(kanji_node(slug, kanji.get('meanings', []), kanji.get('is_consolidated', False)))
                     if slug:
                         edges.append({'source': word.id, 'target': slug, 'type': 'contains'})
     return {'nodes': nodes, 'edges': edges}
 
+def _add_related(graph, target_words, count):
+    """Links each word to the kanji most associated with its component kanji (other than its own)."""
+    nodes, edges = graph['nodes'], graph['edges']
+    for word in target_words:
+        own = {kanji.character for kanji in word.kanji_components}
+        for component in word.kanji_components:
+            neighbours = _related.related(_words_cache, _dataset_version, component.character, count + len(own)) or []
+            for entry in [n for n in neighbours if n['kanji'] not in own][:count]:
+                if not any(n['id'] == entry['kanji'] for n in nodes):
+                    nodes.append(kanji_node(entry['kanji'], [entry['meaning']] if entry['meaning'] else []))
+                edges.append({'source': word.id, 'target': entry['kanji'], 'type': 'related',
+                              'via': component.character, 'score': entry['score']})
+
+
+# Per-node columns emitted by to_columnar; missing values are padded with None.
+NODE_COLUMNS = ('id', 'text', 'meaning', 'reading', 'meanings', 'is_consolidated')
+GRAPH_FORMATS = ('nodes', 'columnar')
+# Extra data /api/graph embeds when named in 'include'.
+INCLUDE_OPTIONS = ('kanji_details',)
+
+def parse_include(value):
+    """The comma-separated 'include' query parameter; raises ValueError for an unknown option."""
+    options = frozenset(option.strip() for option in (value or '').split(',') if option.strip())
+    unknown = options.difference(INCLUDE_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown include '{sorted(unknown)[0]}'. Supported: {', '.join(INCLUDE_OPTIONS)}.")
+    return options
+
+def kanji_details_for(graph, index):
+    """Details of every dataset kanji appearing in the graph's nodes, keyed by character."""
+    characters = dict.fromkeys(ch for node in graph['nodes'] for ch in str(node.get('text', ''))
+                               if _normalization.is_kanji(ch))
+    return {ch: index[ch].to_dict() for ch in characters if ch in index}
+
+def with_includes(body, graph, include, index):
+    """The response body with the extras named in include added, as a copy when anything is added."""
+    if 'kanji_details' in include:
+        body = dict(body, kanji_details=kanji_details_for(graph, index))
+    return body
+
+
+def to_columnar(graph):
+    """
+    Converts a node/edge graph into parallel arrays. Node and edge types are
+    dictionary-encoded, and edges become integer index pairs into the node
+    columns, so keys are not repeated for every element.
+    """
+    index = {}
+    node_types, edge_types = [], []
+    nodes = {column: [] for column in NODE_COLUMNS}
+    nodes['type'] = []
+    for node in graph['nodes']:
+        index[node['id']] = len(index)
+        for column in NODE_COLUMNS:
+            nodes[column].append(node.get(column))
+        if node['type'] not in node_types:
+            node_types.append(node['type'])
+        nodes['type'].append(node_types.index(node['type']))
+
+    edges = {'source': [], 'target': [], 'type': []}
+    for edge in graph['edges']:
+        if edge['type'] not in edge_types:
+            edge_types.append(edge['type'])
+        edges['source'].append(index[edge['source']])
+        edges['target'].append(index[edge['target']])
+        edges['type'].append(edge_types.index(edge['type']))
+
+    return {
+        'format': 'columnar',
+        'node_types': node_types,
+        'edge_types': edge_types,
+        'nodes': nodes,
+        'edges': edges,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Changelog
 # ---------------------------------------------------------------------------
 
+CHANGELOG_URL = "https://raw.githubusercontent.com/MashXP/Rinkuji/main/CHANGELOG.md"
+GITHUB_TIMEOUT = (3.05, 5)
+CHANGELOG_TTL = 600
+CHANGELOG_RETRY_INTERVAL = 60
+
 def get_changelog_from_github():
-    url = "https://raw.githubusercontent.com/MashXP/Rinkuji/main/CHANGELOG.md"
     try:
-        resp = _requests.get(url, timeout=10)
-        resp.raise_for_status()
+        with _timing.phase('github'):
+            resp = _requests.get(CHANGELOG_URL, timeout=GITHUB_TIMEOUT)
+            resp.raise_for_status()
         return resp.text
     except _requests.exceptions.RequestException as e:
         print(f"Changelog fetch error: {e}")
         return None
 
+def _load_bundled_changelog():
+    """CHANGELOG.md at the project root, served until a GitHub fetch succeeds."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        with open(os.path.join(here, '..', 'CHANGELOG.md'), 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError as e:
+        print(f"Bundled changelog read error: {e}")
+        return None
+
+_changelog = None
+_changelog_next_refresh = 0.0
+_changelog_refreshing = False
+_changelog_lock = threading.Lock()
+
+def _refresh_changelog():
+    global _changelog, _changelog_next_refresh, _changelog_refreshing
+    markdown = None
+    try:
+        markdown = get_changelog_from_github()
+    finally:
+        with _changelog_lock:
+            if markdown:
+                _changelog = markdown
+                _changelog_next_refresh = time.monotonic() + CHANGELOG_TTL
+            else:
+                _changelog_next_refresh = time.monotonic() + CHANGELOG_RETRY_INTERVAL
+            _changelog_refreshing = False
+
+def get_changelog():
+    """
+    Returns the cached changelog immediately (stale-while-revalidate). An expired
+    copy starts one background refresh; the bundled file covers cold starts and
+    GitHub outages. Mirrors backend/src/services/github_service.py.
+    """
+    global _changelog, _changelog_refreshing
+    with _changelog_lock:
+        if _changelog is None:
+            _changelog = _load_bundled_changelog()
+        current = _changelog
+        stale = time.monotonic() >= _changelog_next_refresh
+        start_refresh = stale and not _changelog_refreshing
+        if start_refresh:
+            _changelog_refreshing = True
+    _metrics.record_cache_lookup('changelog', hit=not stale)
+    if start_refresh:
+        threading.Thread(target=_refresh_changelog, name='changelog-refresh', daemon=True).start()
+    return current
+
 
 # ---------------------------------------------------------------------------
 # CORS helper
@@ -223,3 +749,206 @@ def add_cors_headers(headers: dict) -> dict:
     headers['Access-Control-Allow-Origin'] = '*'
     headers['Content-Type'] = 'application/json'
     return headers
+
+
+# ---------------------------------------------------------------------------
+# HTTP caching (mirrors backend/src/api/http_cache.py)
+# ---------------------------------------------------------------------------
+
+# max-age applies to browsers, s-maxage to the Vercel edge cache, and
+# stale-while-revalidate lets the edge answer immediately while it refetches.
+UPSTREAM_POLICY = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=604800'
+LOCAL_DATA_POLICY = 'public, max-age=86400, s-maxage=604800, stale-while-revalidate=604800'
+SHORT_LIVED_POLICY = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=86400'
+NO_STORE = 'no-store'
+
+CACHE_POLICIES = {
+    '/search_words': UPSTREAM_POLICY,
+    '/search_by_kanji': UPSTREAM_POLICY,
+    '/api/graph': UPSTREAM_POLICY,
+    '/kanji_details': LOCAL_DATA_POLICY,
+    '/api/path': LOCAL_DATA_POLICY,
+    '/api/related_kanji': LOCAL_DATA_POLICY,
+    '/api/reading': LOCAL_DATA_POLICY,
+    '/api/suggestions': LOCAL_DATA_POLICY,
+    '/api/changelog': SHORT_LIVED_POLICY,
+}
+
+def content_etag(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+# Encoded bodies of hot responses, stored with the object they were encoded from.
+_encoded_responses = LRUCache('response_bytes', maxsize=512)
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+# Largest POST body read; an 'exclude' list at its slug limit fits well within it.
+MAX_BODY_BYTES = 256 * 1024
+
+def parse_content_length(value) -> int:
+    """The request's Content-Length (0 when absent); raises ValueError for a malformed or oversized one."""
+    if value is None or not value.strip():
+        return 0
+    if not (value.strip().isascii() and value.strip().isdigit()):
+        raise ValueError("The Content-Length header must be a non-negative integer.")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise ValueError(f"The request body is limited to {MAX_BODY_BYTES} bytes.")
+    return length
+
+
+# ---------------------------------------------------------------------------
+# Base handler
+# ---------------------------------------------------------------------------
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Base class for the JSON functions in api/.
+
+    Subclasses set ``route`` and implement ``handle_get(params)``, and
+    ``handle_post(params, body)`` if they accept POST; every request is timed into the metrics registry. Vercel runs each function in its own
+    process, so a function's metrics can be dumped by requesting it with
+    RINKUJI_METRICS_TOKEN in the X-Rinkuji-Metrics header, a bearer token or the
+    _metrics parameter (the registry is only visible from within the same instance).
+    Requests carrying RINKUJI_PROFILE_TOKEN in the X-Rinkuji-Profile header or
+    the _profile parameter run under cProfile.
+    """
+    route = ''
+    # Whether the Accept header may select a MessagePack/CBOR encoding.
+    binary_encodings = False
+
+    def do_GET(self):
+        self._dispatch(self.handle_get)
+
+    def do_POST(self):
+        try:
+            length = parse_content_length(self.headers.get('Content-Length'))
+        except ValueError as e:
+            error = {"error": str(e)}
+            self.close_connection = True # the unread body would otherwise be taken for the next request
+            self._dispatch(lambda params: self._respond(400, error))
+            return
+        body = self.rfile.read(length) if length else b''
+        self._dispatch(lambda params: self.handle_post(params, body))
+
+    def _dispatch(self, handle):
+        started = time.perf_counter()
+        self._status = 500
+        _timing.start_request()
+        params = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+        self._profiler = self._start_profiler(params)
+        try:
+            supplied = (self.headers.get(_metrics.METRICS_HEADER) or _metrics.bearer_token(self.headers.get('Authorization'))
+                        or params.get(_metrics.METRICS_PARAM, [None])[0])
+            if _metrics.is_authorized(supplied):
+                self._respond_text(200, _metrics.REGISTRY.render(), _metrics.CONTENT_TYPE)
+            else:
+                handle(params)
+        finally:
+            _metrics.observe_request(self.route, self.command, self._status, time.perf_counter() - started)
+            _timing.end_request()
+            if self._profiler is not None:
+                self._profiler.discard()
+
+    def handle_get(self, params: dict):
+        raise NotImplementedError
+
+    def handle_post(self, params: dict, body: bytes):
+        self._respond(405, {"error": "Method not allowed"})
+
+    def _start_profiler(self, params: dict):
+        supplied = self.headers.get(_profiling.PROFILE_HEADER) or params.get(_profiling.PROFILE_PARAM, [None])[0]
+        self._profile_requested = _profiling.is_authorized(supplied)
+        if not self._profile_requested:
+            return None
+        profiler = _profiling.RequestProfiler(self.route)
+        return profiler if profiler.start() else None
+
+    def _respond(self, status: int, body, cache_key=None):
+        """
+        Sends body with content negotiation, validators and compression. With a
+        cache_key, the encoded bytes and ETag are reused while the cached body object
+        they came from is still the one being served.
+        """
+        media_type = _media_types.JSON
+        if self.binary_encodings:
+            media_type = _media_types.negotiate(self.headers.get('Accept'))
+        payload = etag = None
+        if cache_key is not None and status == 200:
+            # id() is stable here: the entry holds a reference to body, so it cannot be reused.
+            key = (cache_key, media_type, id(body))
+            entry = _encoded_responses.get(key)
+            if entry is not None and entry[0] is body:
+                _, payload, etag = entry
+            else:
+                payload = _media_types.encode(body, media_type)
+                etag = content_etag(payload)
+                _encoded_responses.set(key, (body, payload, etag))
+        if payload is None:
+            payload = _media_types.encode(body, media_type)
+        headers = add_cors_headers({})
+        headers['Content-Type'] = media_type
+        headers['Vary'] = 'Accept, Accept-Encoding' if self.binary_encodings else 'Accept-Encoding'
+        # Only GET responses are cacheable; a POST answer depends on its body.
+        policy = CACHE_POLICIES.get(self.route) if self.command == 'GET' else None
+        if policy is not None:
+            # Failed responses are never cached so a Jisho outage does not stick at the edge,
+            # nor are profiled ones, whose X-Profile-* headers are for the requester alone.
+            cacheable = status == 200 and not self._profile_requested
+            headers['Cache-Control'] = policy if cacheable else NO_STORE
+            if cacheable:
+                headers['ETag'] = etag or content_etag(payload)
+                if etag_matches(self.headers.get('If-None-Match'), headers['ETag']):
+                    status, payload = 304, b''
+                    del headers['Content-Type']
+        if status == 200:
+            payload = self._compress(payload, headers)
+        self._status = status
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self._send_timing_headers()
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _compress(self, payload: bytes, headers: dict) -> bytes:
+        """Compresses the payload with the client's preferred encoding, keyed by its ETag."""
+        encoding = _content_encoding.negotiate(self.headers.get('Accept-Encoding'))
+        if encoding is None or len(payload) < _content_encoding.MIN_COMPRESS_SIZE:
+            return payload
+        etag = headers.get('ETag')
+        payload = _content_encoding.compress(payload, encoding, cache_key=etag)
+        headers['Content-Encoding'] = encoding
+        if etag:
+            # One weak validator covers every encoding of the same content.
+            headers['ETag'] = f'W/{etag}'
+        return payload
+
+    def _send_timing_headers(self):
+        # The profile has to end here: once headers are sent there is nowhere to report it.
+        if self._profiler is not None:
+            path, summary = self._profiler.stop()
+            self._profiler = None
+            _timing.describe('profile', 'written')
+            self.send_header('X-Profile-File', path)
+            self.send_header('X-Profile-Top', summary)
+            self.send_header('Access-Control-Expose-Headers', 'Server-Timing, X-Profile-File, X-Profile-Top')
+        else:
+            self.send_header('Access-Control-Expose-Headers', 'Server-Timing')
+        timing = _timing.current()
+        if timing is not None:
+            self.send_header('Server-Timing', timing.header())
+            self.send_header('Timing-Allow-Origin', '*')
+
+    def _respond_text(self, status: int, text: str, content_type: str):
+        self._status = status
+        self.send_response(status)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Type', content_type)
+        self._send_timing_headers()
+        self.end_headers()
+        self.wfile.write(text.encode())
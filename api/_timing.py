@@ -0,0 +1,84 @@
+"""
+Per-request Server-Timing collection for the Rinkuji Vercel serverless functions.
+Mirrors backend/src/services/timing_service.py.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+class ServerTiming:
+    """
+    Collects named phases for a single request and renders them as a Server-Timing header.
+    Repeated phases (e.g. several Jisho calls during one graph build) are summed.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._durations: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._descriptions: Dict[str, str] = {}
+
+    def add(self, name: str, duration: float):
+        self._durations[name] = self._durations.get(name, 0.0) + duration
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def describe(self, name: str, description: str):
+        self._descriptions[name] = description
+
+    def record_cache(self, cache: str, hit: bool):
+        name = f'cache-{cache}'
+        result = 'hit' if hit else 'miss'
+        previous = self._descriptions.get(name)
+        self._descriptions[name] = result if previous in (None, result) else 'partial'
+
+    def header(self, include_total: bool = True) -> str:
+        entries = []
+        for name, duration in self._durations.items():
+            entry = f'{name};dur={duration * 1000:.1f}'
+            if self._counts[name] > 1:
+                entry += f';desc="{self._counts[name]} calls"'
+            entries.append(entry)
+        for name, description in self._descriptions.items():
+            if name in self._durations:
+                continue
+            entries.append(f'{name};desc="{description}"')
+        if include_total:
+            entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.1f}')
+        return ', '.join(entries)
+
+
+_current: contextvars.ContextVar[Optional[ServerTiming]] = contextvars.ContextVar('server_timing', default=None)
+
+def start_request() -> ServerTiming:
+    timing = ServerTiming()
+    _current.set(timing)
+    return timing
+
+def end_request() -> Optional[ServerTiming]:
+    timing = _current.get()
+    _current.set(None)
+    return timing
+
+def current() -> Optional[ServerTiming]:
+    return _current.get()
+
+@contextmanager
+def phase(name: str):
+    """Times the enclosed block into the current request's Server-Timing, if there is one."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing = _current.get()
+        if timing is not None:
+            timing.add(name, time.perf_counter() - start)
+
+def describe(name: str, description: str):
+    timing = _current.get()
+    if timing is not None:
+        timing.describe(name, description)
+
+def record_cache(cache: str, hit: bool):
+    timing = _current.get()
+    if timing is not None:
+        timing.record_cache(cache, hit)
@@ -1,25 +1,38 @@
 """
 Vercel Serverless Function: /api/graph and /graph
-Returns graph node/edge data for a given word from data.json.
+Returns graph node/edge data for a given word from data.json;
+'related=N' adds the kanji that most often co-occur with the word's kanji,
+a kana query falls back to the words read that way, and 'include=kanji_details'
+embeds the dataset details of the graph's kanji.
 """
-from http.server import BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import json
 import sys, os
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _shared import load_words, generate_graph, add_cors_headers
+from _reading import words_for_reading
+from _related import parse_related
+from _shared import (load_words, generate_graph, kanji_by_character, parse_include, to_columnar, with_includes,
+                     GRAPH_FORMATS, JSONHandler)
 
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
+class handler(JSONHandler):
+    route = '/api/graph'
+    binary_encodings = True
 
+    def handle_get(self, params):
         word_text = params.get('word', [None])[0]
         if not word_text:
             self._respond(400, {"error": "Missing 'word' parameter"})
             return
+        graph_format = params.get('format', ['nodes'])[0]
+        if graph_format not in GRAPH_FORMATS:
+            self._respond(400, {"error": f"Unknown format '{graph_format}'. Supported formats: {', '.join(GRAPH_FORMATS)}."})
+            return
+        try:
+            related = parse_related(params.get('related', [None])[0])
+            include = parse_include(params.get('include', [None])[0])
+        except ValueError as e:
+            self._respond(400, {"error": str(e)})
+            return
 
         try:
             words = load_words()
@@ -28,17 +41,15 @@ class handler(BaseHTTPRequestHandler):
             return
 
         words_map = {w.text: w for w in words}
-        target_word = words_map.get(word_text)
-        if not target_word:
+        target_words = [words_map[word_text]] if word_text in words_map else words_for_reading(words, word_text)
+        if not target_words:
             self._respond(404, {"error": f"Word '{word_text}' not found."})
             return
 
-        graph = generate_graph([target_word])
-        self._respond(200, graph)
-
-    def _respond(self, status: int, body):
-        self.send_response(status)
-        for k, v in add_cors_headers({}).items():
-            self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+        graph = generate_graph(target_words, related=related)
+        body = to_columnar(graph) if graph_format == 'columnar' else graph
+        body = with_includes(body, graph, include, kanji_by_character())
+        if body is not graph:
+            self._respond(200, body)
+        else:
+            self._respond(200, graph, cache_key=('graph', word_text, related))
@@ -1,56 +1,49 @@
 """
 Vercel Serverless Function: /kanji_details
-Returns details for a single kanji character from local data.json.
+Returns details for a kanji character ('character'), or for several at once
+('characters'), from local data.json.
 """
-from http.server import BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import json
 import sys, os
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _shared import load_words, add_cors_headers
+from _shared import kanji_by_character, JSONHandler
 
+# Most kanji one batch request may ask for.
+MAX_BATCH_CHARACTERS = 200
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
 
+class handler(JSONHandler):
+    route = '/kanji_details'
+
+    def handle_get(self, params):
+        characters = params.get('characters', [None])[0]
         character = params.get('character', [None])[0]
-        if not character:
+        if characters is None and not character:
             self._respond(400, {"error": "Missing 'character' parameter"})
             return
 
         try:
-            words = load_words()
+            index = kanji_by_character()
         except Exception as e:
             self._respond(500, {"error": f"Failed to load data: {e}"})
             return
 
-        target_kanji = None
-        for word in words:
-            for kanji in word.kanji_components:
-                if kanji.character == character:
-                    target_kanji = kanji
-                    break
-            if target_kanji:
-                break
-
-        if target_kanji:
+        if characters is not None:
+            requested = list(dict.fromkeys(ch for ch in characters if not ch.isspace() and ch != ','))
+            if not requested:
+                self._respond(400, {"error": "'characters' must name at least one kanji."})
+                return
+            if len(requested) > MAX_BATCH_CHARACTERS:
+                self._respond(400, {"error": f"At most {MAX_BATCH_CHARACTERS} characters can be requested at once."})
+                return
             self._respond(200, {
-                'id': target_kanji.id,
-                'character': target_kanji.character,
-                'meaning': target_kanji.meaning,
-                'on_reading': target_kanji.on_reading,
-                'kun_reading': target_kanji.kun_reading,
-                'components': target_kanji.components,
+                'kanji': {ch: index[ch].to_dict() for ch in requested if ch in index},
+                'missing': [ch for ch in requested if ch not in index],
             })
+            return
+
+        target_kanji = index.get(character)
+        if target_kanji:
+            self._respond(200, target_kanji.to_dict())
         else:
             self._respond(404, {"error": "Kanji not found"})
-
-    def _respond(self, status: int, body):
-        self.send_response(status)
-        for k, v in add_cors_headers({}).items():
-            self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
@@ -0,0 +1,42 @@
+"""
+Vercel Serverless Function: /api/path
+Returns a shortest chain of shared kanji between two words of data.json as graph node/edge data.
+"""
+import sys, os
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _path import find_path, word_index
+from _shared import load_words, to_columnar, GRAPH_FORMATS, JSONHandler
+
+
+class handler(JSONHandler):
+    route = '/api/path'
+    binary_encodings = True
+
+    def handle_get(self, params):
+        source = params.get('from', [None])[0]
+        target = params.get('to', [None])[0]
+        if not source or not target:
+            self._respond(400, {"error": "Both 'from' and 'to' parameters are required."})
+            return
+        graph_format = params.get('format', ['nodes'])[0]
+        if graph_format not in GRAPH_FORMATS:
+            self._respond(400, {"error": f"Unknown format '{graph_format}'. Supported formats: {', '.join(GRAPH_FORMATS)}."})
+            return
+
+        try:
+            words = load_words()
+        except Exception as e:
+            self._respond(500, {"error": f"Failed to load data: {e}"})
+            return
+
+        index = word_index(words)
+        for word_text in (source, target):
+            if index.word_node(word_text) is None:
+                self._respond(404, {"error": f"Word '{word_text}' not found."})
+                return
+        graph = find_path(words, source, target)
+        if graph is None:
+            self._respond(404, {"error": f"No path between '{source}' and '{target}'."})
+            return
+        self._respond(200, to_columnar(graph) if graph_format == 'columnar' else graph)
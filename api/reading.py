@@ -0,0 +1,30 @@
+"""
+Vercel Serverless Function: /api/reading
+Returns the kanji and words of data.json with a given kana reading.
+"""
+import sys, os
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _reading import is_kana, lookup
+from _shared import load_words, JSONHandler
+
+
+class handler(JSONHandler):
+    route = '/api/reading'
+
+    def handle_get(self, params):
+        query = params.get('q', [None])[0]
+        if not query:
+            self._respond(400, {"error": "A 'q' parameter is required."})
+            return
+        if not is_kana(query):
+            self._respond(400, {"error": "'q' must be written in hiragana or katakana."})
+            return
+
+        try:
+            words = load_words()
+        except Exception as e:
+            self._respond(500, {"error": f"Failed to load data: {e}"})
+            return
+
+        self._respond(200, lookup(words, query))
@@ -0,0 +1,36 @@
+"""
+Vercel Serverless Function: /api/related_kanji
+Returns the kanji that most often share a word of data.json with the given kanji.
+"""
+import sys, os
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _related import parse_limit, related
+from _shared import dataset_version, load_words, JSONHandler
+
+
+class handler(JSONHandler):
+    route = '/api/related_kanji'
+
+    def handle_get(self, params):
+        kanji = params.get('kanji', [None])[0]
+        if not kanji:
+            self._respond(400, {"error": "A 'kanji' parameter is required."})
+            return
+        try:
+            limit = parse_limit(params.get('limit', [None])[0])
+        except ValueError as e:
+            self._respond(400, {"error": str(e)})
+            return
+
+        try:
+            words = load_words()
+        except Exception as e:
+            self._respond(500, {"error": f"Failed to load data: {e}"})
+            return
+
+        neighbours = related(words, dataset_version(), kanji, limit)
+        if neighbours is None:
+            self._respond(404, {"error": f"Kanji '{kanji}' not found."})
+            return
+        self._respond(200, {'kanji': kanji, 'related': neighbours})
@@ -1,28 +1,49 @@
 """
 Vercel Serverless Function: /search_by_kanji
 Proxies single-kanji search to the Jisho.org API with slug consolidation.
+'max_pages' reads and consolidates that many result pages,
+'limit', 'offset' and 'seed' select a window or seeded sample of the results,
+and a POST body naming the slugs the client already has leaves them out.
 """
-from http.server import BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import json
 import sys, os
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _shared import search_by_kanji, add_cors_headers
+from _exclusion import parse_exclusion_body
+from _normalization import normalize
+from _projection import parse_projection
+from _sampling import parse_max_pages, parse_page
+from _shared import search_by_kanji, JSONHandler
 
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
+def _first(params, name):
+    return params.get(name, [None])[0]
 
-        kanji = params.get('kanji', [''])[0]
-        body, status = search_by_kanji(kanji)
-        self._respond(status, body)
 
-    def _respond(self, status: int, body):
-        self.send_response(status)
-        for k, v in add_cors_headers({}).items():
-            self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+class handler(JSONHandler):
+    route = '/search_by_kanji'
+
+    def handle_get(self, params):
+        kanji = normalize(params.get('kanji', [''])[0])
+        try:
+            projection = parse_projection(_first(params, 'fields'), _first(params, 'view'))
+            page = parse_page(_first(params, 'limit'), _first(params, 'offset'), _first(params, 'seed'))
+            max_pages = parse_max_pages(_first(params, 'max_pages'))
+        except ValueError as e:
+            self._respond(400, {"error": str(e)})
+            return
+        body, status = search_by_kanji(kanji, projection, page=page, max_pages=max_pages)
+        self._respond(status, body, cache_key=('search_by_kanji', kanji, projection, page, max_pages))
+
+    def handle_post(self, params, body):
+        kanji = normalize(params.get('kanji', [''])[0])
+        try:
+            projection = parse_projection(_first(params, 'fields'), _first(params, 'view'))
+            page = parse_page(_first(params, 'limit'), _first(params, 'offset'), _first(params, 'seed'))
+            max_pages = parse_max_pages(_first(params, 'max_pages'))
+            # Parsed whatever the content type: clients send text/plain to avoid a CORS preflight.
+            known = parse_exclusion_body(body)
+        except ValueError as e:
+            self._respond(400, {"error": str(e)})
+            return
+        result, status = search_by_kanji(kanji, projection, page=page, exclude=known, max_pages=max_pages)
+        self._respond(status, result)
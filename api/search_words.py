@@ -1,28 +1,28 @@
 """
 Vercel Serverless Function: /search_words
-Proxies search requests to the Jisho.org API (word search).
+Proxies search requests to the Jisho.org API (word search); 'max_pages'
+reads that many result pages.
 """
-from http.server import BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import json
 import sys, os
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _shared import search_words, add_cors_headers
+from _normalization import normalize
+from _projection import parse_projection
+from _sampling import parse_max_pages
+from _shared import search_words, JSONHandler
 
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
+class handler(JSONHandler):
+    route = '/search_words'
 
-        query = params.get('query', [''])[0]
-        body, status = search_words(query)
-        self._respond(status, body)
-
-    def _respond(self, status: int, body):
-        self.send_response(status)
-        for k, v in add_cors_headers({}).items():
-            self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+    def handle_get(self, params):
+        # Normalized here too, so equivalent spellings share one encoded-response entry.
+        query = normalize(params.get('query', [''])[0])
+        try:
+            projection = parse_projection(params.get('fields', [None])[0], params.get('view', [None])[0])
+            max_pages = parse_max_pages(params.get('max_pages', [None])[0])
+        except ValueError as e:
+            self._respond(400, {"error": str(e)})
+            return
+        body, status = search_words(query, projection, max_pages=max_pages)
+        self._respond(status, body, cache_key=('search_words', query, projection, max_pages))
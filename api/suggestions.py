@@ -2,25 +2,24 @@
 Vercel Serverless Function: /api/suggestions
 Returns word/reading/meaning suggestions from local data.json.
 """
-from http.server import BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import json
 import sys, os
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _shared import load_raw_data, add_cors_headers
+import _metrics
+import _timing
+from _normalization import match_key
+from _shared import load_raw_data, JSONHandler
 
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
+class handler(JSONHandler):
+    route = '/api/suggestions'
 
+    def handle_get(self, params):
         if 'q' not in params:
             self._respond(400, {'error': 'Query parameter "q" is required.'})
             return
 
-        query = params['q'][0].lower()
+        query = match_key(params['q'][0])
         if not query:
             self._respond(200, [])
             return
@@ -31,25 +30,30 @@ class handler(BaseHTTPRequestHandler):
             self._respond(500, {'error': f'Failed to load data: {e}'})
             return
 
-        suggestions = set()
-        for entry in data:
-            if 'text' in entry and isinstance(entry['text'], str) and query in entry['text'].lower():
-                suggestions.add(entry['text'])
-            if 'reading' in entry and isinstance(entry['reading'], str) and query in entry['reading'].lower():
-                suggestions.add(entry['reading'])
-            if 'meaning' in entry:
-                if isinstance(entry['meaning'], str) and query in entry['meaning'].lower():
-                    suggestions.add(entry['meaning'])
-                elif isinstance(entry['meaning'], list):
-                    for m in entry['meaning']:
-                        if isinstance(m, str) and query in m.lower():
-                            suggestions.add(m)
+        _metrics.set_dataset_size('suggestions', len(data))
+        with _metrics.SUGGESTIONS_DURATION.time(), _timing.phase('match'):
+            suggestions = _match_suggestions(data, query)
 
         self._respond(200, list(suggestions)[:10])
 
-    def _respond(self, status: int, body):
-        self.send_response(status)
-        for k, v in add_cors_headers({}).items():
-            self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+
+# (data, [(match key, value), ...]): every text, reading and meaning, normalized once per data list.
+_entries = (None, [])
+
+
+def _match_entries(data):
+    global _entries
+    if _entries[0] is not data:
+        entries = []
+        for entry in data:
+            values = [entry.get('text'), entry.get('reading')]
+            meaning = entry.get('meaning')
+            values.extend(meaning if isinstance(meaning, list) else [meaning])
+            entries.extend((match_key(value), value) for value in values if isinstance(value, str))
+        _entries = (data, entries)
+    return _entries[1]
+
+
+def _match_suggestions(data, query):
+    # Queries and entries are compared normalized and kana-folded: ﾊﾞﾅﾅ, バナナ and ばなな match.
+    return {value for folded, value in _match_entries(data) if query in folded}
@@ -9,25 +9,53 @@ from flask import Flask, jsonify, render_template, request # pyright: ignore[rep
 from backend.src.services.data_loader_service import DataLoaderService
 from backend.src.services.graph_service import GraphService
 from backend.src.services.jisho_service import JishoService
+from backend.src.services.path_service import PathService
+from backend.src.services.reading_service import ReadingService, is_kana
+from backend.src.services.related_kanji_service import RelatedKanjiService
+from backend.src.services.prefetch_service import Prefetcher
 from backend.src.api.graph import graph_bp # Import the blueprint
 from backend.src.api.suggestions import suggestions_bp # Import the suggestions blueprint
 from backend.src.api.changelog import changelog_bp # Import the changelog blueprint
-from backend.src.services import github_service
+from backend.src.api.metrics import metrics_bp # Import the metrics blueprint
+from backend.src.api.profiling import profiling_bp # Import the opt-in request profiler
+from backend.src.api.compression import compression_bp # Import response compression
+from backend.src.api.http_cache import http_cache_bp # Import ETag/Cache-Control handling
+from backend.src.api.json_provider import TimedJSONProvider
+from backend.src.api.responses import encoded_response
+from backend.src.commands import register_commands
+from backend.src.services import (exclusion_service, github_service, graph_cache_service, normalization_service,
+                                  related_kanji_service, snapshot_service, timing_service)
+from backend.src.services.projection_service import parse_projection
+from backend.src.services.sampling_service import parse_max_pages, parse_page
+from backend.src.services.graph_service import GRAPH_FORMATS, parse_include, to_columnar, with_includes
 
 def create_app():
     app = Flask(__name__, static_folder='../frontend/src', template_folder='templates')
+    app.json = TimedJSONProvider(app) # Reports JSON encoding time in the Server-Timing header
 
     # Initialize services
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_file_path = os.path.join(current_dir, 'data.json')
     app.data_loader = DataLoaderService(data_file_path=data_file_path)
-    app.jisho_service = JishoService()
-    app.graph_service = GraphService(app.jisho_service)
+    app.jisho_service = JishoService(snapshot=snapshot_service.load_snapshot())
+    # Kanji co-occurrence index, read from `flask build-related-kanji` output when it matches data.json
+    app.related_kanji = RelatedKanjiService(app.data_loader, precomputed=related_kanji_service.load_related())
+    app.graph_service = GraphService(app.jisho_service, precomputed=graph_cache_service.load_precomputed(),
+                                     related_kanji=app.related_kanji)
+    app.prefetcher = Prefetcher(app.jisho_service) # warms the kanji a user is likely to expand next
+    app.path_service = PathService(app.data_loader) # word-kanji adjacency index for /api/path
+    app.reading_service = ReadingService(app.data_loader) # kana reading index for /api/reading
 
     # Register blueprints
     app.register_blueprint(graph_bp) # Register the graph blueprint here
     app.register_blueprint(suggestions_bp) # Register the suggestions blueprint here
     app.register_blueprint(changelog_bp) # Register the changelog blueprint here
+    app.register_blueprint(metrics_bp) # Register the metrics blueprint (also times every request)
+    app.register_blueprint(profiling_bp) # Profiles requests carrying the RINKUJI_PROFILE_TOKEN
+    # after_request hooks run in reverse order: compression must see the ETag set by http_cache
+    app.register_blueprint(compression_bp) # Compresses large JSON responses (gzip, brotli when installed)
+    app.register_blueprint(http_cache_bp) # Adds ETags and Cache-Control, answers conditional requests with 304
+    register_commands(app) # flask warm-cache, precompute-graphs, prerender-static, build-related-kanji
 
     @app.route('/')
     def index(): # The main page is now the Rinku visualization
@@ -36,71 +64,157 @@ def create_app():
         Takes an optional 'word' query parameter for the search.
         """
         word = request.args.get('word', '')
-        
-        # Fetch changelog and extract latest version
-        changelog_md = github_service.get_changelog_from_github()
-        latest_version_display = "null"
-        if changelog_md:
-            lines = changelog_md.split('\n')
-            for line in lines:
-                if line.startswith('## '):
-                    # Example: "## Version 1.0.0 - 2025-09-22"
-                    version_info = line.replace('## ', '').strip()
-                    # Split by " - " to separate version and date
-                    parts = version_info.split(' - ', 1)
-                    if len(parts) == 2:
-                        version_num = parts[0].strip().replace('[', '').replace(']', '') # Removed square brackets
-                        print(f"DEBUG: version_num before formatting: {parts[0].strip()}")
-                        print(f"DEBUG: version_num after stripping brackets: {version_num}")
-                        # version_date = parts[1].strip() # No need for date
-                        latest_version_display = f"ver.{version_num}" # Changed to ver.1.0.3 format
-                        print(f"DEBUG: latest_version_display: {latest_version_display}")
-                    else:
-                        latest_version_display = f"ver.{version_info}" # Fallback if format is unexpected
-                    break
-        
-        return render_template('rinku.html', word=word, latest_version=latest_version_display)
+
+        # Served from the background-refreshed cache; never waits on GitHub
+        latest_version_display = github_service.get_changelog().latest_version
+
+        with timing_service.phase('render'):
+            return render_template('rinku.html', word=word, latest_version=latest_version_display)
 
     @app.route('/search_words')
     def search_words():
 
         """
         An API endpoint that proxies search requests to the Jisho.org API.
-        It takes a 'query' parameter from the request URL.
+        It takes a 'query' parameter from the request URL, and optionally
+        'fields' (comma-separated) or 'view=slim' to trim each result, and
+        'max_pages' to read that many Jisho pages (fetched concurrently).
         """
-        query = request.args.get('query', '')
-        response_data, status_code = app.jisho_service.search_words(query)
-        return jsonify(response_data), status_code
-
-    @app.route('/search_by_kanji')
+        # Normalized here too, so equivalent spellings share one encoded-response entry.
+        query = normalization_service.normalize(request.args.get('query', ''))
+        try:
+            projection = parse_projection(request.args.get('fields'), request.args.get('view'))
+            max_pages = parse_max_pages(request.args.get('max_pages'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        response_data, status_code = app.jisho_service.search_words(query, projection, max_pages=max_pages)
+        return encoded_response(response_data, status_code, cache_key=('search_words', query, projection, max_pages))
+
+    @app.route('/search_by_kanji', methods=['GET', 'POST'])
     def search_by_kanji():
         """
         An API endpoint that finds words containing a specific kanji.
-        It takes a 'kanji' parameter from the request URL.
+        It takes a 'kanji' parameter from the request URL, and optionally
+        'fields' (comma-separated) or 'view=slim' to trim each result, and
+        'max_pages' to read and consolidate that many Jisho pages.
+        'limit' and 'offset' return a window of the results, reading further
+        Jisho pages only when the window needs them, and 'seed' makes that
+        window a deterministic random sample. A POST body listing the slugs the client already has ('exclude', or a
+        'bloom' filter of them) leaves those items out of the response.
         """
-        kanji = request.args.get('kanji', '')
-        response_data, status_code = app.jisho_service.search_by_kanji(kanji)
-        return jsonify(response_data), status_code
+        kanji = normalization_service.normalize(request.args.get('kanji', ''))
+        app.prefetcher.record_lookup(kanji)
+        try:
+            projection = parse_projection(request.args.get('fields'), request.args.get('view'))
+            page = parse_page(request.args.get('limit'), request.args.get('offset'), request.args.get('seed'))
+            max_pages = parse_max_pages(request.args.get('max_pages'))
+            known = None
+            if request.method == 'POST':
+                # Parsed whatever the content type: clients send text/plain to avoid a CORS preflight.
+                known = exclusion_service.parse_exclusion_body(request.get_data())
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        response_data, status_code = app.jisho_service.search_by_kanji(kanji, projection, page=page, exclude=known,
+                                                                       max_pages=max_pages)
+        if known is not None:
+            return encoded_response(response_data, status_code)
+        return encoded_response(response_data, status_code,
+                                cache_key=('search_by_kanji', kanji, projection, page, max_pages))
 
     @app.route('/api/graph')
     def get_graph_data():
         """
         API endpoint to generate and return graph data for a given word.
+        'format=columnar' returns parallel arrays instead of node/edge objects, and
+        an Accept header preferring application/msgpack or application/cbor selects
+        a binary encoding when the corresponding library is installed.
+        'related=N' (up to 5) also links the word to the N kanji that most often
+        share a word with each of its kanji, from the co-occurrence index.
+        'include=kanji_details' embeds the dataset details of the graph's kanji.
         """
         word_text = request.args.get('word', '')
         if not word_text:
             return jsonify({"error": "A 'word' parameter is required."}), 400
+        graph_format = request.args.get('format', 'nodes')
+        if graph_format not in GRAPH_FORMATS:
+            return jsonify({"error": f"Unknown format '{graph_format}'. Supported formats: {', '.join(GRAPH_FORMATS)}."}), 400
+        try:
+            related = related_kanji_service.parse_related(request.args.get('related'))
+            include = parse_include(request.args.get('include'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         all_words = app.data_loader.load_data()
 
-        # Filter for the requested word
-        target_words = [w for w in all_words if w.text == word_text]
+        # Filter for the requested word, or the words read that way for a kana query
+        target_words = [w for w in all_words if w.text == word_text] or app.reading_service.words_for_reading(word_text)
         if not target_words:
             return jsonify({"error": f"Word '{word_text}' not found in data."}), 404
 
-        graph_data = app.graph_service.generate_graph(target_words)
-
-        return jsonify(graph_data)
+        graph_data = app.graph_service.generate_graph(target_words, related=related)
+        app.prefetcher.prefetch_graph(graph_data)
+        body = to_columnar(graph_data) if graph_format == 'columnar' else graph_data
+        body = with_includes(body, graph_data, include, app.data_loader.get_kanji_by_character())
+        if body is not graph_data:
+            return encoded_response(body)
+        # Cached graphs are the same object across requests, so their encoded bytes are reused too
+        return encoded_response(graph_data, cache_key=('graph', word_text, related))
+
+    @app.route('/api/reading')
+    def get_reading():
+        """
+        API endpoint answering a kana query ('q') from the dataset's readings: the kanji
+        with that on or kun reading and the words read that way. Katakana and hiragana
+        match each other, and readings match with or without their okurigana.
+        """
+        query = request.args.get('q', '')
+        if not query:
+            return jsonify({"error": "A 'q' parameter is required."}), 400
+        if not is_kana(query):
+            return jsonify({"error": "'q' must be written in hiragana or katakana."}), 400
+        return encoded_response(app.reading_service.lookup(query))
+
+    @app.route('/api/related_kanji')
+    def get_related_kanji():
+        """
+        API endpoint listing the kanji that most often share a dataset word with
+        'kanji', best first by normalized PMI, with 'limit' (1-20) of them returned.
+        """
+        kanji = request.args.get('kanji', '')
+        if not kanji:
+            return jsonify({"error": "A 'kanji' parameter is required."}), 400
+        try:
+            limit = related_kanji_service.parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        related = app.related_kanji.related(kanji, limit)
+        if related is None:
+            return jsonify({"error": f"Kanji '{kanji}' not found in data."}), 404
+        return encoded_response({'kanji': kanji, 'related': related})
+
+    @app.route('/api/path')
+    def get_path():
+        """
+        API endpoint returning a shortest chain of shared kanji between two words
+        ('from' and 'to'), as a graph of the words and kanji along it. Answered
+        from the local dataset only; 'format=columnar' works as for /api/graph.
+        """
+        source, target = request.args.get('from', ''), request.args.get('to', '')
+        if not source or not target:
+            return jsonify({"error": "Both 'from' and 'to' parameters are required."}), 400
+        graph_format = request.args.get('format', 'nodes')
+        if graph_format not in GRAPH_FORMATS:
+            return jsonify({"error": f"Unknown format '{graph_format}'. Supported formats: {', '.join(GRAPH_FORMATS)}."}), 400
+
+        for word_text in (source, target):
+            if not app.path_service.has_word(word_text):
+                return jsonify({"error": f"Word '{word_text}' not found in data."}), 404
+        path_graph = app.path_service.find_path(source, target)
+        if path_graph is None:
+            return jsonify({"error": f"No path between '{source}' and '{target}'."}), 404
+        if graph_format == 'columnar':
+            return encoded_response(to_columnar(path_graph))
+        return encoded_response(path_graph)
 
     @app.route('/about')
     def about():
@@ -0,0 +1,15 @@
+import os
+import sys
+
+# Add the project root to sys.path to enable absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.app import app as flask_app
+from backend.src.api.asgi import AsyncApp
+
+# Serves the Flask app's routes from one event loop; the Jisho-bound ones never block it.
+app = AsyncApp(flask_app)
+
+if __name__ == '__main__':
+    import uvicorn # pyright: ignore[reportMissingImports]
+    uvicorn.run(app, host=os.environ.get('HOST', '127.0.0.1'), port=int(os.environ.get('PORT', 5000)))
@@ -0,0 +1,298 @@
+import asyncio
+import io
+import sys
+import time
+from urllib.parse import parse_qsl
+from backend.src.api.compression import COMPRESSIBLE_TYPES
+from backend.src.api.http_cache import CACHE_POLICIES, NO_STORE, content_etag
+from backend.src.api.responses import encode_body
+from backend.src.api.suggestions import suggestions_for
+from backend.src.services import (compression_service, encoding_service, exclusion_service, metrics_service,
+                                  normalization_service, profiling_service, related_kanji_service, timing_service)
+from backend.src.services.async_graph_service import AsyncGraphService
+from backend.src.services.async_jisho_service import AsyncJishoService
+from backend.src.services.graph_service import GRAPH_FORMATS, parse_include, to_columnar, with_includes
+from backend.src.services.profiling_service import PROFILE_HEADER, PROFILE_PARAM
+from backend.src.services.projection_service import parse_projection
+from backend.src.services.sampling_service import parse_max_pages, parse_page
+
+
+class Request:
+    """The parts of an ASGI HTTP request the handlers read; query parameters keep their first value."""
+    def __init__(self, scope, body: bytes):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.body = body
+        self.args = {}
+        for name, value in parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True):
+            self.args.setdefault(name, value)
+        self.headers = {}
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').lower()
+            value = value.decode('latin-1')
+            self.headers[name] = f"{self.headers[name]}, {value}" if name in self.headers else value
+
+
+# cache_key of bodies the Flask views send with jsonify, which are always JSON.
+JSONIFY = object()
+
+
+def _error(message: str, status: int = 400):
+    return {"error": message}, status, JSONIFY
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as for If-None-Match: W/"x" matches "x"."""
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/').strip('"') == etag:
+            return True
+    return False
+
+
+class AsyncApp:
+    """
+    ASGI application serving the Flask app's routes. The routes that wait on Jisho
+    (/search_words, /search_by_kanji, /api/graph and /graph) and /api/suggestions run
+    on the event loop through AsyncJishoService, with the same parameters, bodies,
+    ETags, Cache-Control, compression, Server-Timing and metrics as the Flask views.
+    Every other route is handed to the Flask app on a worker thread; those answer
+    from local data and never call upstream. So is any request carrying the profiling
+    token, which the Flask app's profiling hook then honours as it would under WSGI.
+    """
+    def __init__(self, flask_app, jisho: AsyncJishoService = None):
+        self.flask_app = flask_app
+        self.jisho = jisho or AsyncJishoService(flask_app.jisho_service)
+        self.graphs = AsyncGraphService(flask_app.graph_service, self.jisho)
+        # path -> (handler, methods); HEAD is answered wherever GET is.
+        self.routes = {
+            '/search_words': (self.search_words, ('GET',)),
+            '/search_by_kanji': (self.search_by_kanji, ('GET', 'POST')),
+            '/api/graph': (self.api_graph, ('GET',)),
+            '/graph': (self.graph, ('GET',)),
+            '/api/suggestions': (self.suggestions, ('GET',)),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type '{scope['type']}'")
+        body = await self._read_body(receive)
+        route = self.routes.get(scope['path'])
+        method = 'GET' if scope['method'] == 'HEAD' else scope['method']
+        request = Request(scope, body)
+        if route is None or method not in route[1] or self._profiled(request):
+            await self._call_flask(scope, body, send)
+            return
+        started = time.perf_counter()
+        timing_service.start_request()
+        try:
+            response_body, status, cache_key = await route[0](request)
+        finally:
+            timing = timing_service.end_request()
+        status, headers, data = self._finish(request, response_body, status, cache_key)
+        if timing is not None:
+            headers += [('server-timing', timing.header()), ('timing-allow-origin', '*'),
+                        ('access-control-expose-headers', 'Server-Timing')]
+        metrics_service.observe_request(request.path, request.method, status, time.perf_counter() - started)
+        await self._send(send, status, headers, b'' if request.method == 'HEAD' else data)
+
+    # Native routes: each returns (body, status, cache_key), as the Flask views pass to encoded_response.
+
+    async def search_words(self, request: Request):
+        # Normalized here too, so equivalent spellings share one encoded-response entry.
+        query = normalization_service.normalize(request.args.get('query', ''))
+        try:
+            projection = parse_projection(request.args.get('fields'), request.args.get('view'))
+            max_pages = parse_max_pages(request.args.get('max_pages'))
+        except ValueError as e:
+            return _error(str(e))
+        body, status = await self.jisho.search_words(query, projection, max_pages=max_pages)
+        return body, status, ('search_words', query, projection, max_pages)
+
+    async def search_by_kanji(self, request: Request):
+        kanji = normalization_service.normalize(request.args.get('kanji', ''))
+        self.flask_app.prefetcher.record_lookup(kanji)
+        try:
+            projection = parse_projection(request.args.get('fields'), request.args.get('view'))
+            page = parse_page(request.args.get('limit'), request.args.get('offset'), request.args.get('seed'))
+            max_pages = parse_max_pages(request.args.get('max_pages'))
+            known = None
+            if request.method == 'POST':
+                # Parsed whatever the content type: clients send text/plain to avoid a CORS preflight.
+                known = exclusion_service.parse_exclusion_body(request.body)
+        except ValueError as e:
+            return _error(str(e))
+        body, status = await self.jisho.search_by_kanji(kanji, projection, page=page, exclude=known,
+                                                        max_pages=max_pages)
+        if known is not None:
+            return body, status, None
+        return body, status, ('search_by_kanji', kanji, projection, page, max_pages)
+
+    async def api_graph(self, request: Request):
+        word_text = request.args.get('word', '')
+        if not word_text:
+            return _error("A 'word' parameter is required.")
+        all_words = self.flask_app.data_loader.load_data()
+        return await self._graph(request, word_text, [w for w in all_words if w.text == word_text],
+                                 f"Word '{word_text}' not found in data.")
+
+    async def graph(self, request: Request):
+        word_text = request.args.get('word')
+        if not word_text:
+            return _error("Missing 'word' parameter")
+        words_map = {word.text: word for word in self.flask_app.data_loader.load_data()}
+        return await self._graph(request, word_text, [words_map[word_text]] if word_text in words_map else [],
+                                 f"Word '{word_text}' not found.")
+
+    async def _graph(self, request: Request, word_text, target_words, not_found: str):
+        """The shared body of /api/graph and /graph once the word's dataset entries are known."""
+        graph_format = request.args.get('format', 'nodes')
+        if graph_format not in GRAPH_FORMATS:
+            return _error(f"Unknown format '{graph_format}'. Supported formats: {', '.join(GRAPH_FORMATS)}.")
+        try:
+            related = related_kanji_service.parse_related(request.args.get('related'))
+            include = parse_include(request.args.get('include'))
+        except ValueError as e:
+            return _error(str(e))
+
+        # A kana query falls back to the words read that way.
+        target_words = target_words or self.flask_app.reading_service.words_for_reading(word_text)
+        if not target_words:
+            return _error(not_found, 404)
+
+        graph = await self.graphs.generate_graph(target_words, related=related)
+        self.flask_app.prefetcher.prefetch_graph(graph)
+        body = to_columnar(graph) if graph_format == 'columnar' else graph
+        body = with_includes(body, graph, include, self.flask_app.data_loader.get_kanji_by_character())
+        if body is not graph:
+            return body, 200, None
+        return graph, 200, ('graph', word_text, related)
+
+    async def suggestions(self, request: Request):
+        if 'q' not in request.args:
+            return _error('Query parameter "q" is required.')
+        # Matched against the in-memory dataset: no I/O, so there is nothing to hand off.
+        return suggestions_for(request.args['q']), 200, JSONIFY
+
+    @staticmethod
+    def _profiled(request: Request) -> bool:
+        supplied = request.headers.get(PROFILE_HEADER.lower()) or request.args.get(PROFILE_PARAM)
+        return bool(supplied) and profiling_service.is_authorized(supplied)
+
+    def _finish(self, request: Request, body, status: int, cache_key):
+        """
+        Encodes the body and applies what the Flask app's after_request hooks do:
+        the route's Cache-Control and ETag, 304s for conditional requests, and compression.
+        """
+        if cache_key is JSONIFY:
+            media_type, cache_key = encoding_service.JSON, None
+        else:
+            media_type = encoding_service.negotiate(request.headers.get('accept'))
+        data, etag = encode_body(body, media_type, status, cache_key)
+        headers = [('content-type', media_type)]
+        vary = ['Accept', 'Accept-Encoding']
+
+        policy = CACHE_POLICIES.get(request.path)
+        if request.method in ('GET', 'HEAD') and policy is not None:
+            if status != 200 or policy == NO_STORE:
+                headers.append(('cache-control', NO_STORE))
+            else:
+                etag = etag or content_etag(data)
+                headers.append(('cache-control', policy))
+                if _etag_matches(request.headers.get('if-none-match', ''), etag):
+                    headers += [('etag', f'"{etag}"'), ('vary', ', '.join(vary))]
+                    return 304, headers, b''
+
+        encoding = compression_service.negotiate(request.headers.get('accept-encoding'))
+        if (status == 200 and encoding is not None and media_type.startswith(COMPRESSIBLE_TYPES)
+                and len(data) >= compression_service.MIN_COMPRESS_SIZE):
+            data = compression_service.compress(data, encoding, cache_key=etag)
+            headers.append(('content-encoding', encoding))
+            if etag:
+                headers.append(('etag', f'W/"{etag}"'))
+        elif etag:
+            headers.append(('etag', f'"{etag}"'))
+        headers += [('vary', ', '.join(vary)), ('content-length', str(len(data)))]
+        return status, headers, data
+
+    async def _call_flask(self, scope, body: bytes, send):
+        """Runs the Flask app for this request on a worker thread and relays its response."""
+        status, headers, data = await asyncio.to_thread(self._run_wsgi, self._environ(scope, body))
+        await self._send(send, status, headers, data)
+
+    def _run_wsgi(self, environ):
+        started = {}
+        chunks = []
+        def start_response(status, headers, exc_info=None):
+            started['status'], started['headers'] = status, headers
+            return chunks.append
+        result = self.flask_app.wsgi_app(environ, start_response)
+        try:
+            chunks.extend(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        headers = [(name.lower(), value) for name, value in started['headers']]
+        return int(started['status'].split(' ', 1)[0]), headers, b''.join(chunks)
+
+    @staticmethod
+    def _environ(scope, body: bytes):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            if name == 'CONTENT_LENGTH':
+                continue
+            key = name if name == 'CONTENT_TYPE' else f'HTTP_{name}'
+            value = value.decode('latin-1')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    async def _send(send, status: int, headers, data: bytes):
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers]})
+        await send({'type': 'http.response.body', 'body': data})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.jisho.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
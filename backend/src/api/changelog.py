@@ -6,10 +6,11 @@ changelog_bp = Blueprint('changelog', __name__)
 @changelog_bp.route('/api/changelog', methods=['GET'])
 def get_changelog():
     """
-    API endpoint to get the changelog.
+    API endpoint to get the changelog. Serves the cached copy (refreshed from
+    GitHub in the background, or the bundled CHANGELOG.md) without blocking.
     """
-    changelog_md = github_service.get_changelog_from_github()
-    if changelog_md:
-        return jsonify({'changelog': changelog_md})
+    changelog = github_service.get_changelog()
+    if changelog.markdown:
+        return jsonify({'changelog': changelog.markdown})
     else:
         return jsonify({'error': 'Failed to fetch changelog'}), 500
@@ -0,0 +1,32 @@
+from flask import Blueprint, request # pyright: ignore[reportMissingImports]
+from backend.src.services import compression_service
+
+compression_bp = Blueprint('compression', __name__)
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/msgpack', 'application/cbor', 'text/')
+
+@compression_bp.after_app_request
+def compress_response(response):
+    """
+    Compresses successful JSON and text responses with the best encoding the client
+    accepts. Runs after the ETag is computed, so the content hash keys the cache of
+    compressed bodies and the ETag is weakened to cover every encoding of the content.
+    """
+    if not response.mimetype or not response.mimetype.startswith(COMPRESSIBLE_TYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    encoding = compression_service.negotiate(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < compression_service.MIN_COMPRESS_SIZE:
+        return response
+    etag, _ = response.get_etag()
+    response.set_data(compression_service.compress(data, encoding, cache_key=etag))
+    response.headers['Content-Encoding'] = encoding
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
@@ -1,4 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app # pyright: ignore[reportMissingImports]
+from backend.src.api.responses import encoded_response
+from backend.src.services.graph_service import GRAPH_FORMATS, parse_include, to_columnar, with_includes
+from backend.src.services.related_kanji_service import parse_related
 
 graph_bp = Blueprint('graph', __name__)
 
@@ -7,43 +10,60 @@ def get_graph():
     word_text = request.args.get('word')
     if not word_text:
         return jsonify({"error": "Missing 'word' parameter"}), 400
+    graph_format = request.args.get('format', 'nodes')
+    if graph_format not in GRAPH_FORMATS:
+        return jsonify({"error": f"Unknown format '{graph_format}'. Supported formats: {', '.join(GRAPH_FORMATS)}."}), 400
+    try:
+        related = parse_related(request.args.get('related'))
+        include = parse_include(request.args.get('include'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     words = current_app.data_loader.load_data()
     words_map = {word.text: word for word in words}
 
-    target_word = words_map.get(word_text)
-    if not target_word:
+    # A kana query falls back to the words read that way.
+    target_words = [words_map[word_text]] if word_text in words_map else \
+        current_app.reading_service.words_for_reading(word_text)
+    if not target_words:
         return jsonify({"error": f"Word '{word_text}' not found."}), 404
 
-    graph = current_app.graph_service.generate_graph([target_word])
-    return jsonify(graph)
+    graph = current_app.graph_service.generate_graph(target_words, related=related)
+    current_app.prefetcher.prefetch_graph(graph)
+    body = to_columnar(graph) if graph_format == 'columnar' else graph
+    body = with_includes(body, graph, include, current_app.data_loader.get_kanji_by_character())
+    if body is not graph:
+        return encoded_response(body)
+    return encoded_response(graph, cache_key=('graph', word_text, related))
 
 
+# Most kanji one batch /kanji_details request may ask for.
+MAX_BATCH_CHARACTERS = 200
+
 @graph_bp.route('/kanji_details', methods=['GET'])
 def get_kanji_details():
+    """
+    Details of one dataset kanji ('character'), or of several at once ('characters',
+    e.g. 日本語 or 日,本,語), as {"kanji": {character: details}, "missing": [...]}.
+    """
+    kanji_by_character = current_app.data_loader.get_kanji_by_character()
+    characters = request.args.get('characters')
+    if characters is not None:
+        requested = list(dict.fromkeys(ch for ch in characters if not ch.isspace() and ch != ','))
+        if not requested:
+            return jsonify({"error": "'characters' must name at least one kanji."}), 400
+        if len(requested) > MAX_BATCH_CHARACTERS:
+            return jsonify({"error": f"At most {MAX_BATCH_CHARACTERS} characters can be requested at once."}), 400
+        return encoded_response({
+            'kanji': {ch: kanji_by_character[ch].to_dict() for ch in requested if ch in kanji_by_character},
+            'missing': [ch for ch in requested if ch not in kanji_by_character],
+        })
+
     character = request.args.get('character')
     if not character:
         return jsonify({"error": "Missing 'character' parameter"}), 400
 
-    all_kanji = current_app.data_loader.get_all_kanji(current_app.data_loader.load_data())
-
-    # This is inefficient, but for now it will work.
-    # A better approach would be to have a map of kanji characters to kanji objects.
-    target_kanji = None
-    for kanji in all_kanji.values():
-        if kanji.character == character:
-            target_kanji = kanji
-            break
-
+    target_kanji = kanji_by_character.get(character)
     if target_kanji:
-        # The get_kanji_details method doesn't exist on GraphService.
-        # I will assume the intention is to return the kanji details as a dict.
-        return jsonify({
-            'id': target_kanji.id,
-            'character': target_kanji.character,
-            'meaning': target_kanji.meaning,
-            'on_reading': target_kanji.on_reading,
-            'kun_reading': target_kanji.kun_reading,
-            'components': target_kanji.components,
-        })
+        return jsonify(target_kanji.to_dict())
     return jsonify({"error": "Kanji not found"}), 404
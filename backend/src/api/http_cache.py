@@ -0,0 +1,50 @@
+import hashlib
+from flask import Blueprint, g, request # pyright: ignore[reportMissingImports]
+
+http_cache_bp = Blueprint('http_cache', __name__)
+
+# Cache-Control per route. max-age applies to browsers, s-maxage to the Vercel edge
+# cache, and stale-while-revalidate lets the edge answer immediately while it refetches.
+UPSTREAM_POLICY = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=604800'
+LOCAL_DATA_POLICY = 'public, max-age=86400, s-maxage=604800, stale-while-revalidate=604800'
+SHORT_LIVED_POLICY = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=86400'
+NO_STORE = 'no-store'
+
+CACHE_POLICIES = {
+    '/search_words': UPSTREAM_POLICY,
+    '/search_by_kanji': UPSTREAM_POLICY,
+    '/api/graph': UPSTREAM_POLICY,
+    '/graph': UPSTREAM_POLICY,
+    '/kanji_details': LOCAL_DATA_POLICY,
+    '/api/path': LOCAL_DATA_POLICY,
+    '/api/related_kanji': LOCAL_DATA_POLICY,
+    '/api/reading': LOCAL_DATA_POLICY,
+    '/api/suggestions': LOCAL_DATA_POLICY,
+    '/api/changelog': SHORT_LIVED_POLICY,
+    '/metrics': NO_STORE,
+}
+
+def content_etag(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+@http_cache_bp.after_app_request
+def apply_cache_headers(response):
+    """
+    Adds a content-hash ETag and the route's Cache-Control policy to successful
+    responses, and turns them into 304s when the client already has that version.
+    Failed responses are never cached so a Jisho outage does not stick at the edge,
+    nor are profiled ones, whose X-Profile-* headers are for the requester alone.
+    """
+    if request.method not in ('GET', 'HEAD') or request.url_rule is None:
+        return response
+    policy = CACHE_POLICIES.get(request.url_rule.rule)
+    if policy is None:
+        return response
+    profiled = 'profiler' in g or g.get('profile_skipped', False)
+    if response.status_code != 200 or policy == NO_STORE or response.direct_passthrough or profiled:
+        response.headers['Cache-Control'] = NO_STORE
+        return response
+    if response.get_etag()[0] is None:
+        response.set_etag(content_etag(response.get_data()))
+    response.headers['Cache-Control'] = policy
+    return response.make_conditional(request)
@@ -0,0 +1,11 @@
+from flask.json.provider import DefaultJSONProvider # pyright: ignore[reportMissingImports]
+from backend.src.services import timing_service
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """
+    Default Flask JSON provider that reports the time spent encoding
+    responses as the 'serialize' Server-Timing phase.
+    """
+    def response(self, *args, **kwargs):
+        with timing_service.phase('serialize'):
+            return super().response(*args, **kwargs)
@@ -0,0 +1,37 @@
+import time
+from flask import Blueprint, Response, g, jsonify, request # pyright: ignore[reportMissingImports]
+from backend.src.services import metrics_service, timing_service
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    timing_service.start_request()
+
+@metrics_bp.after_app_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics_service.observe_request(route, request.method, response.status_code, time.perf_counter() - started)
+    timing = timing_service.end_request()
+    if timing is not None:
+        response.headers['Server-Timing'] = timing.header()
+        response.headers['Timing-Allow-Origin'] = '*'
+        response.headers.setdefault('Access-Control-Expose-Headers', 'Server-Timing')
+    return response
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Exposes request, upstream and cache metrics in the Prometheus text format to
+    requests carrying RINKUJI_METRICS_TOKEN in the X-Rinkuji-Metrics header, a
+    bearer token or the _metrics parameter, as the Vercel functions do.
+    """
+    supplied = (request.headers.get(metrics_service.METRICS_HEADER)
+                or metrics_service.bearer_token(request.headers.get('Authorization'))
+                or request.args.get(metrics_service.METRICS_PARAM))
+    if not metrics_service.is_authorized(supplied):
+        return jsonify({"error": "A valid metrics token is required."}), 403
+    return Response(metrics_service.REGISTRY.render(), content_type=metrics_service.CONTENT_TYPE)
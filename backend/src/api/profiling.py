@@ -0,0 +1,42 @@
+from flask import Blueprint, g, request # pyright: ignore[reportMissingImports]
+from backend.src.services import profiling_service, timing_service
+from backend.src.services.profiling_service import PROFILE_HEADER, PROFILE_PARAM
+
+profiling_bp = Blueprint('profiling', __name__)
+
+@profiling_bp.before_app_request
+def start_profiling():
+    """
+    Profiles the request when it carries the configured token in the
+    X-Rinkuji-Profile header or the _profile query parameter.
+    """
+    supplied = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_PARAM)
+    if not supplied:
+        return
+    if not profiling_service.is_authorized(supplied):
+        return
+    profiler = profiling_service.RequestProfiler(request.path)
+    if profiler.start():
+        g.profiler = profiler
+    else:
+        g.profile_skipped = True
+
+@profiling_bp.after_app_request
+def finish_profiling(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        path, summary = profiler.stop()
+        response.headers['X-Profile-File'] = path
+        response.headers['X-Profile-Top'] = summary
+        response.headers['Access-Control-Expose-Headers'] = 'Server-Timing, X-Profile-File, X-Profile-Top'
+        timing_service.describe('profile', 'written')
+    elif g.pop('profile_skipped', False):
+        response.headers['X-Profile-File'] = 'skipped: another request is being profiled'
+    return response
+
+@profiling_bp.teardown_app_request
+def discard_profiling(exc):
+    # Only reached with a live profiler when the view raised before after_request ran.
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.discard()
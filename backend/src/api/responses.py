@@ -0,0 +1,38 @@
+from flask import Response, request # pyright: ignore[reportMissingImports]
+from backend.src.api.http_cache import content_etag
+from backend.src.services import encoding_service
+from backend.src.services.cache_service import LRUCache
+
+# Encoded bodies of hot responses, stored with the object they were encoded from.
+_encoded = LRUCache('response_bytes', maxsize=512)
+
+def encoded_response(body, status: int = 200, cache_key=None):
+    """
+    Encodes a response body as JSON, or as MessagePack/CBOR when the client's
+    Accept header prefers one of those and its library is installed.
+
+    With a cache_key, the encoded bytes and their ETag are kept alongside the body
+    they came from. Services hand out the same cached object until it expires, so a
+    repeat request for a hot key becomes a byte copy instead of a serialization.
+    """
+    media_type = encoding_service.negotiate(request.headers.get('Accept'))
+    data, etag = encode_body(body, media_type, status, cache_key)
+    response = Response(data, status=status, mimetype=media_type)
+    if etag is not None:
+        response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+def encode_body(body, media_type: str, status: int = 200, cache_key=None):
+    """The encoded bytes of body and, with a cache_key, their ETag (None otherwise)."""
+    if cache_key is not None and status == 200:
+        # id() is stable here: the entry holds a reference to body, so it cannot be reused.
+        key = (cache_key, media_type, id(body))
+        entry = _encoded.get(key)
+        if entry is not None and entry[0] is body:
+            return entry[1], entry[2]
+        data = encoding_service.encode(body, media_type)
+        etag = content_etag(data)
+        _encoded.set(key, (body, data, etag))
+        return data, etag
+    return encoding_service.encode(body, media_type), None
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify # pyright: ignore[reportMissingImports]
 import json
 import os
+from backend.src.services import metrics_service, timing_service
+from backend.src.services.normalization_service import match_key
 
 suggestions_bp = Blueprint('suggestions', __name__)
 
@@ -16,34 +18,47 @@ def load_data():
         return []
 
 DATA = load_data()
+metrics_service.set_dataset_size('suggestions', len(DATA))
 
 @suggestions_bp.route('/api/suggestions', methods=['GET'])
 def get_suggestions():
     if 'q' not in request.args: # Check if 'q' parameter is missing
         return jsonify({'error': 'Query parameter "q" is required.'}), 400
 
-    query = request.args.get('q', '').lower()
-    if not query: # Handle empty query string
-        return jsonify([]), 200
-
-    suggestions = []
-    for entry in DATA:
-        # Search in 'text' field
-        if 'text' in entry and isinstance(entry['text'], str) and query in entry['text'].lower():
-            suggestions.append(entry['text'])
-
-        # Search in 'reading' field
-        if 'reading' in entry and isinstance(entry['reading'], str) and query in entry['reading'].lower():
-            suggestions.append(entry['reading'])
-
-        # Search in 'meaning' field (can be a string or a list of strings)
-        if 'meaning' in entry:
-            if isinstance(entry['meaning'], str) and query in entry['meaning'].lower():
-                suggestions.append(entry['meaning'])
-            elif isinstance(entry['meaning'], list):
-                for meaning in entry['meaning']:
-                    if isinstance(meaning, str) and query in meaning.lower():
-                        suggestions.append(meaning)
+    return jsonify(suggestions_for(request.args.get('q', ''))), 200
+
+
+def suggestions_for(q):
+    """Up to 10 distinct dataset texts, readings and meanings containing q; the asyncio server calls this too."""
+    query = match_key(q)
+    if not query: # Handle empty query string (or only whitespace)
+        return []
+
+    with metrics_service.SUGGESTIONS_DURATION.time(), timing_service.phase('match'):
+        suggestions = _match_suggestions(query)
 
     # Limit to a reasonable number of unique suggestions
-    return jsonify(list(set(suggestions))[:10]), 200
\ No newline at end of file
+    return list(set(suggestions))[:10]
+
+
+# (DATA, [(match key, value), ...]): every text, reading and meaning, normalized once per DATA list.
+_entries = (None, [])
+
+def _match_entries():
+    global _entries
+    if _entries[0] is not DATA:
+        entries = []
+        for entry in DATA:
+            values = [entry.get('text'), entry.get('reading')]
+            # 'meaning' can be a string or a list of strings
+            meaning = entry.get('meaning')
+            values.extend(meaning if isinstance(meaning, list) else [meaning])
+            entries.extend((match_key(value), value) for value in values if isinstance(value, str))
+        _entries = (DATA, entries)
+    return _entries[1]
+
+
+def _match_suggestions(query):
+    # Queries and entries are compared normalized and kana-folded: ﾊﾞﾅﾅ, バナナ and ばなな match.
+    key = match_key(query)
+    return [value for folded, value in _match_entries() if key in folded]
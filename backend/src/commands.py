@@ -0,0 +1,89 @@
+import click # pyright: ignore[reportMissingImports]
+from backend.src.services import graph_cache_service, prerender_service, related_kanji_service, snapshot_service
+from backend.src.services.jisho_service import JishoService
+
+def register_commands(app):
+    """
+    Adds the maintenance commands below to `flask` (`flask warm-cache`,
+    `flask precompute-graphs`, `flask prerender-static`, `flask build-related-kanji`).
+    """
+
+    @app.cli.command('warm-cache')
+    @click.option('--kanji-file', type=click.File('r', encoding='utf-8'),
+                  help='Text file whose kanji are warmed (e.g. the Jōyō list). Defaults to every kanji in data.json.')
+    @click.option('--output', type=click.Path(dir_okay=False), default=None,
+                  help='Snapshot to write. Defaults to $RINKUJI_JISHO_SNAPSHOT or backend/jisho_snapshot.json.gz.')
+    @click.option('--concurrency', default=2, show_default=True, help='Lookups in flight at once.')
+    @click.option('--resume/--no-resume', default=True, show_default=True,
+                  help='Skip kanji already in the output snapshot.')
+    def warm_cache(kanji_file, output, concurrency, resume):
+        """Precomputes search_by_kanji results into a snapshot loaded at startup."""
+        if kanji_file is not None:
+            kanji = snapshot_service.kanji_in_text(kanji_file.read())
+        else:
+            words = app.data_loader.load_data()
+            kanji = snapshot_service.kanji_in_text(''.join(k.character for w in words for k in w.kanji_components))
+        output = output or snapshot_service.snapshot_path()
+
+        def progress(character, status):
+            if status != 200:
+                click.echo(f"{character}: failed ({status})", err=True)
+
+        # A fresh service, so lookups go upstream instead of to the snapshot being rebuilt.
+        fetched, skipped, failed = snapshot_service.warm_kanji(
+            JishoService(), kanji, output, concurrency=concurrency, resume=resume, progress=progress)
+        click.echo(f"Wrote {output}: {fetched} fetched, {skipped} already present, {failed} failed.")
+
+    @app.cli.command('precompute-graphs')
+    @click.option('--word', 'words', multiple=True, help='Word to precompute (repeatable). Defaults to every word in data.json.')
+    @click.option('--output', type=click.Path(dir_okay=False), default=None,
+                  help='File to write. Defaults to $RINKUJI_GRAPH_CACHE or backend/graph_cache.json.gz.')
+    @click.option('--workers', default=2, show_default=True, help='Worker processes.')
+    def precompute_graphs(words, output, workers):
+        """Builds graphs on a process pool into a cache loaded at startup."""
+        words = list(words) or [w.text for w in app.data_loader.load_data()]
+        output = output or graph_cache_service.precomputed_path()
+
+        def progress(word, complete):
+            if not complete:
+                click.echo(f"{word}: skipped (a kanji is missing from the snapshot or its lookup failed)", err=True)
+
+        written, skipped = graph_cache_service.precompute_graphs(
+            app.data_loader.data_file_path, words, output, workers=workers, progress=progress)
+        click.echo(f"Wrote {output}: {written} graphs, {skipped} skipped.")
+
+    @app.cli.command('prerender-static')
+    @click.option('--top-words', type=click.File('r', encoding='utf-8'),
+                  help='Words one per line, most requested first (e.g. exported from the request logs). '
+                       'Defaults to data.json order.')
+    @click.option('--limit', default=prerender_service.DEFAULT_LIMIT, show_default=True, help='Graphs to prerender.')
+    @click.option('--max-expansions', default=prerender_service.DEFAULT_MAX_EXPANSIONS, show_default=True,
+                  help='search_by_kanji expansions to prerender.')
+    @click.option('--output-dir', type=click.Path(file_okay=False), default=prerender_service.DEFAULT_OUTPUT_DIR,
+                  help='Directory to (re)create. Defaults to prerendered/ at the project root.')
+    @click.option('--vercel-config', type=click.Path(dir_okay=False, exists=True),
+                  default=prerender_service.DEFAULT_VERCEL_CONFIG, help='vercel.json whose rewrites are regenerated.')
+    def prerender_static(top_words, limit, max_expansions, output_dir, vercel_config):
+        """Writes the most requested graphs and expansions as static JSON served by the CDN."""
+        if top_words is not None:
+            words = [line.strip() for line in top_words if line.strip()]
+        else:
+            words = [w.text for w in app.data_loader.load_data()]
+        graphs, expansions = prerender_service.prerender(
+            app.data_loader, app.graph_service, app.jisho_service, words, output_dir=output_dir,
+            vercel_config=vercel_config, limit=limit, max_expansions=max_expansions)
+        click.echo(f"Wrote {output_dir}: {graphs} graphs, {expansions} expansions; updated {vercel_config}.")
+
+    @app.cli.command('build-related-kanji')
+    @click.option('--top-k', default=related_kanji_service.DEFAULT_TOP_K, show_default=True,
+                  help='Neighbours kept per kanji.')
+    @click.option('--min-count', default=1, show_default=True, help='Words a pair must share to count.')
+    @click.option('--output', type=click.Path(dir_okay=False), default=None,
+                  help='File to write. Defaults to $RINKUJI_RELATED_KANJI or backend/related_kanji.json.gz.')
+    def build_related_kanji(top_k, min_count, output):
+        """Counts kanji co-occurrence in data.json into a neighbour index loaded at startup."""
+        related = related_kanji_service.build_related(app.data_loader.load_data(), top_k=top_k, min_count=min_count)
+        output = output or related_kanji_service.related_path()
+        related_kanji_service.write_related(output, app.data_loader.dataset_version(), related)
+        pairs = sum(len(neighbours) for neighbours in related.values())
+        click.echo(f"Wrote {output}: {len(related)} kanji, {pairs} neighbours.")
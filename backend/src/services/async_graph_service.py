@@ -0,0 +1,25 @@
+import asyncio
+from typing import Dict, List
+from backend.src.models.word import Word
+from backend.src.services.async_jisho_service import AsyncJishoService
+from backend.src.services.graph_service import GraphService
+from backend.src.services.scheduler_service import EXPANSION
+
+
+class AsyncGraphService:
+    """
+    Graph generation for the asyncio server. A graph that is not cached has all of its
+    component kanji looked up concurrently on the loop, then is built and cached by the
+    wrapped GraphService from those results, so the build itself never waits on Jisho.
+    """
+    def __init__(self, graph_service: GraphService, jisho: AsyncJishoService):
+        self.graph_service = graph_service
+        self.jisho = jisho
+
+    async def generate_graph(self, target_words: List[Word], related: int = 0) -> Dict:
+        graph = self.graph_service.cached_graph(target_words, related)
+        if graph is not None:
+            return graph
+        characters = list(dict.fromkeys(kanji.character for word in target_words for kanji in word.kanji_components))
+        results = await asyncio.gather(*(self.jisho.search_by_kanji(ch, priority=EXPANSION) for ch in characters))
+        return self.graph_service.generate_graph(target_words, related, lookups=dict(zip(characters, results)))
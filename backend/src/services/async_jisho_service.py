@@ -0,0 +1,282 @@
+import asyncio
+import time
+import requests
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Container, Dict, Optional, Tuple
+from backend.src.services import metrics_service, normalization_service, timing_service
+from backend.src.services.circuit_breaker_service import OPEN, CircuitOpenError
+from backend.src.services.exclusion_service import exclude_known
+from backend.src.services.jisho_service import _UNAVAILABLE, JishoService
+from backend.src.services.projection_service import Projection
+from backend.src.services.sampling_service import Page
+from backend.src.services.scheduler_service import (EXPANSION, INTERACTIVE, MAX_WAIT, PREFETCH, PRIORITIES,
+                                                    QueueRejected, UpstreamScheduler)
+
+try:
+    import aiohttp # pyright: ignore[reportMissingImports]
+except ImportError: # aiohttp is optional; without it upstream calls run on the default thread pool
+    aiohttp = None
+
+# Upstream calls of each class allowed in flight at once. Far above the threaded
+# scheduler's limits: a waiting call costs a coroutine here, not a worker thread.
+CONCURRENCY = {INTERACTIVE: 256, EXPANSION: 128, PREFETCH: 16}
+# Calls allowed to wait per class before new ones are refused.
+QUEUE_SIZES = {INTERACTIVE: 1024, EXPANSION: 1024, PREFETCH: 64}
+# Pooled upstream connections shared by every in-flight call.
+CONNECTION_LIMIT = 100
+
+# async (url, (connect timeout, read timeout)) -> decoded JSON. Raises
+# requests.exceptions.Timeout or another RequestException, like the threaded client.
+Transport = Callable[[str, Tuple[float, float]], Awaitable[dict]]
+
+
+class AiohttpTransport:
+    """GETs JSON over one aiohttp session, so calls share its keep-alive connection pool."""
+    def __init__(self, limit: int = CONNECTION_LIMIT):
+        self.limit = limit
+        self._session = None
+
+    async def __call__(self, url: str, timeout: Tuple[float, float]) -> dict:
+        if self._session is None: # created on first use, inside the running loop
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.limit))
+        client_timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        try:
+            async with self._session.get(url, timeout=client_timeout) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.Timeout(f"Timed out fetching {url}") from e
+        except (aiohttp.ClientError, ValueError) as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class ThreadTransport:
+    """GETs JSON with requests on the loop's default executor; used when aiohttp is not installed."""
+    async def __call__(self, url: str, timeout: Tuple[float, float]) -> dict:
+        response = await asyncio.to_thread(requests.get, url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self):
+        pass
+
+
+def default_transport():
+    return AiohttpTransport() if aiohttp is not None else ThreadTransport()
+
+
+class AsyncJishoService:
+    """
+    The Jisho client for the asyncio server. Results, projections, the snapshot,
+    stale fallbacks, the circuit breaker, latency tracking and metrics are those of
+    the wrapped JishoService, so both servers share one cache; only the upstream call
+    differs. Calls wait on per-class semaphores instead of threads, then take a token
+    from the threaded client's scheduler, so the process as a whole stays within one
+    rate limit; identical lookups in flight at once share one upstream call.
+    Multi-page reads and windows are delegated to the threaded client.
+    """
+    def __init__(self, jisho_service: JishoService, transport: Optional[Transport] = None,
+                 concurrency: Optional[Dict[str, int]] = None, queue_sizes: Optional[Dict[str, int]] = None,
+                 scheduler: Optional[UpstreamScheduler] = None, max_wait: Optional[Dict[str, float]] = None,
+                 name: str = 'jisho_async'):
+        self.jisho = jisho_service
+        self.transport = transport or default_transport()
+        self.name = name
+        self.concurrency = {**CONCURRENCY, **(concurrency or {})}
+        self.queue_sizes = {**QUEUE_SIZES, **(queue_sizes or {})}
+        self.max_wait = {**MAX_WAIT, **(max_wait or {})}
+        self._slots = {priority: asyncio.Semaphore(self.concurrency[priority]) for priority in PRIORITIES}
+        self._waiting = {priority: 0 for priority in PRIORITIES}
+        self.scheduler = scheduler or jisho_service.scheduler # whose rate tokens both clients take
+        self._pacing = asyncio.Lock() # callers take rate tokens one at a time, in arrival order
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+
+    async def close(self):
+        await self.transport.close()
+
+    async def search_words(self, query, projection: Optional[Projection] = None, priority=INTERACTIVE,
+                           max_pages: int = 1):
+        """JishoService.search_words without blocking the loop."""
+        query = normalization_service.normalize(query or '')
+        if not query:
+            return {"error": "A 'query' parameter is required."}, 400
+        if max_pages > 1:
+            return await asyncio.to_thread(self.jisho.search_words, query, projection, priority, max_pages)
+        return await self._cached(('search_words', query), lambda: self._fetch_words(query, priority), projection)
+
+    async def search_by_kanji(self, kanji, projection: Optional[Projection] = None, priority=INTERACTIVE,
+                              page: Optional[Page] = None, exclude: Optional[Container[str]] = None,
+                              max_pages: int = 1):
+        """JishoService.search_by_kanji without blocking the loop."""
+        kanji = normalization_service.normalize(kanji or '')
+        if not kanji or len(kanji) != 1:
+            return {"error": "A single 'kanji' character parameter is required."}, 400
+        if page is not None or max_pages > 1:
+            return await asyncio.to_thread(self.jisho.search_by_kanji, kanji, projection, priority,
+                                           page, exclude, max_pages)
+        result, status = await self._cached(('search_by_kanji', kanji), lambda: self._fetch_kanji(kanji, priority),
+                                            projection)
+        if exclude is not None and status == 200:
+            return exclude_known(result, exclude), status
+        return result, status
+
+    async def _fetch_words(self, query, priority):
+        return self.jisho._japanese_only(await self._get(self.jisho._page_url(query), 'search_words', priority))
+
+    async def _fetch_kanji(self, kanji, priority):
+        return self.jisho._consolidate(await self._get(self.jisho._page_url(kanji), 'search_by_kanji', priority))
+
+    async def _cached(self, key, fetch: Callable[[], Awaitable[dict]], projection: Optional[Projection]):
+        hit = self.jisho._lookup(key, projection)
+        if hit is not None:
+            return hit
+        try:
+            result = await self._shared(key, fetch)
+        except (requests.exceptions.RequestException, *_UNAVAILABLE) as e:
+            return self.jisho._fallback(key, e, projection)
+        return self.jisho._projected(key, result, projection)
+
+    async def _shared(self, key, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Runs fetch() and caches its result, unless the same key is already being fetched,
+        in which case this waits for that call instead. A cancelled waiter leaves the
+        fetch running for the others.
+        """
+        task = self._in_flight.get(key)
+        metrics_service.record_cache_lookup('jisho_in_flight', hit=task is not None)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key, fetch):
+        result = await fetch()
+        self.jisho._store(key, result)
+        return result
+
+    def _finish(self, key, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception() # retrieved here, so a fetch every waiter abandoned is not reported as unhandled
+
+    async def _get(self, api_url, endpoint, priority=INTERACTIVE):
+        """The asyncio counterpart of JishoService._get: admission, breaker, hedging and metrics."""
+        breaker = self.jisho.breaker
+        if breaker.state == OPEN: # fail fast instead of queueing for a call that cannot go out
+            raise CircuitOpenError(f"Circuit '{breaker.name}' is open")
+        async with self._slot(priority):
+            admission = breaker.allow()
+            if not admission:
+                raise CircuitOpenError(f"Circuit '{breaker.name}' is open")
+            timeout = (self.jisho.REQUEST_TIMEOUT[0], self.jisho.latency.timeout())
+            hedge_delay = self.jisho.latency.hedge_delay() if self.jisho.HEDGE_REQUESTS else None
+            start = time.perf_counter()
+            try:
+                with timing_service.phase('jisho'):
+                    data = await self._hedged(api_url, timeout, hedge_delay)
+            except BaseException: # including cancellation, so a half-open probe always gives its slot back
+                breaker.record_failure(admission)
+                metrics_service.observe_jisho_call(endpoint, time.perf_counter() - start, ok=False)
+                raise
+            breaker.record_success(admission)
+            metrics_service.observe_jisho_call(endpoint, time.perf_counter() - start, ok=True)
+            return data
+
+    @asynccontextmanager
+    async def _slot(self, priority: str):
+        """
+        Waits for a concurrency slot of the call's class and a rate token; raises
+        QueueRejected when the class's queue is full or the wait exceeds its limit.
+        """
+        if priority not in self._slots:
+            raise ValueError(f"Unknown priority '{priority}'. Supported priorities: {', '.join(PRIORITIES)}.")
+        if self._waiting[priority] >= self.queue_sizes[priority]:
+            metrics_service.record_scheduler_drop(self.name, priority, 'queue_full')
+            raise QueueRejected(priority, 'queue_full')
+        start = time.monotonic()
+        deadline = start + self.max_wait[priority]
+        slot = self._slots[priority]
+        self._waiting[priority] += 1
+        metrics_service.set_scheduler_queue_depth(self.name, priority, self._waiting[priority])
+        try:
+            with timing_service.phase('queue'):
+                await asyncio.wait_for(slot.acquire(), deadline - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._pace(deadline), deadline - time.monotonic())
+                except BaseException:
+                    slot.release()
+                    raise
+        except asyncio.TimeoutError:
+            metrics_service.record_scheduler_drop(self.name, priority, 'timeout')
+            raise QueueRejected(priority, 'timeout') from None
+        finally:
+            self._waiting[priority] -= 1
+            metrics_service.set_scheduler_queue_depth(self.name, priority, self._waiting[priority])
+        metrics_service.observe_scheduler_wait(self.name, priority, time.monotonic() - start)
+        try:
+            yield
+        finally:
+            slot.release()
+
+    async def _pace(self, deadline: float):
+        async with self._pacing:
+            while True:
+                # Taken under the scheduler's lock without waiting on it, so the loop never blocks.
+                wait_for = self.scheduler.take_token()
+                if not wait_for:
+                    return
+                if time.monotonic() + wait_for > deadline:
+                    raise asyncio.TimeoutError
+                await asyncio.sleep(wait_for)
+
+    async def _hedged(self, api_url, timeout, delay: Optional[float]):
+        """
+        Like latency_service.hedged_call, on the loop: a duplicate request goes out once
+        the first is slower than `delay` and the hedge budget allows, and the loser is cancelled.
+        """
+        budget = self.jisho._hedge_budget
+        budget.on_request()
+        if delay is None:
+            return await self._attempt(api_url, timeout)
+        primary = asyncio.ensure_future(self._attempt(api_url, timeout))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not budget.try_acquire():
+                return await primary
+            if self.scheduler.take_token(): # the hedge is an upstream request too, so it needs a rate token
+                metrics_service.record_hedge('jisho', 'rate_limited')
+                return await primary
+            metrics_service.record_hedge('jisho', 'sent')
+            hedge = asyncio.ensure_future(self._attempt(api_url, timeout))
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            metrics_service.record_hedge('jisho', 'won')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(self, api_url, timeout):
+        """One upstream request; timeouts count as a sample at the timeout, as in JishoService._attempt."""
+        start = time.perf_counter()
+        try:
+            data = await self.transport(api_url, timeout)
+        except requests.exceptions.Timeout:
+            self.jisho.latency.observe(timeout[1])
+            raise
+        self.jisho.latency.observe(time.perf_counter() - start)
+        return data
@@ -0,0 +1,64 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from backend.src.services import metrics_service
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with an optional per-entry time to live.
+    Lookups are reported to the metrics registry under the cache's name.
+    """
+    def __init__(self, name: str, maxsize: int = 256, ttl: Optional[float] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] is not None and entry[1] < time.monotonic():
+                del self._entries[key]
+                entry = _MISSING
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+        metrics_service.record_cache_lookup(self.name, hit=entry is not _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        metrics_service.set_dataset_size(f'cache:{self.name}', len(self._entries))
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Seconds until the entry expires (inf without a TTL), or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return None
+        if entry[1] is None:
+            return math.inf
+        remaining = entry[1] - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            return entry is not _MISSING and (entry[1] is None or entry[1] >= time.monotonic())
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from typing import Optional, Union
+from backend.src.services import metrics_service
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Open once at least half of the calls in the last 30 s failed, counting only windows
+# with enough calls that a couple of unlucky requests do not trip it.
+FAILURE_RATIO = 0.5
+MIN_CALLS = 5
+WINDOW = 30.0
+# How long to fail fast before letting probe requests through.
+OPEN_DURATION = 30.0
+HALF_OPEN_PROBES = 1
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit is open."""
+
+
+class Admission:
+    """What allow() returns for an admitted call: the state generation it was admitted under, and whether it is a probe."""
+    __slots__ = ('generation', 'probe')
+
+    def __init__(self, generation: int, probe: bool):
+        self.generation = generation
+        self.probe = probe
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of upstream calls over a rolling window. Closed, every call
+    goes through; once the failure ratio reaches the threshold the circuit opens and
+    calls are refused for OPEN_DURATION. It then half-opens, letting a limited number
+    of probes through: a successful probe closes it, a failed one opens it again.
+    Outcomes are reported with the Admission allow() returned, and only count in the
+    state they were admitted under, so a slow call from before an outage is not taken
+    for a probe.
+    """
+    def __init__(self, name: str, failure_ratio: float = FAILURE_RATIO, min_calls: int = MIN_CALLS,
+                 window: float = WINDOW, open_duration: float = OPEN_DURATION,
+                 half_open_probes: int = HALF_OPEN_PROBES):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self._outcomes: deque = deque() # (timestamp, ok)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._generation = 0 # bumped on every state change
+        self._lock = threading.Lock()
+        metrics_service.set_circuit_state(name, CLOSED)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def allow(self) -> Union[Admission, bool]:
+        """
+        Returns an Admission when a call may go upstream now, False otherwise; callers
+        must report the call's outcome with it.
+        """
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == CLOSED:
+                return Admission(self._generation, probe=False)
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return Admission(self._generation, probe=True)
+        metrics_service.record_circuit_rejection(self.name)
+        return False
+
+    def record_success(self, admission: Optional[Admission] = None):
+        self._record(True, admission)
+
+    def record_failure(self, admission: Optional[Admission] = None):
+        self._record(False, admission)
+
+    def reset(self):
+        with self._lock:
+            self._outcomes.clear()
+            self._set_state(CLOSED)
+
+    def _record(self, ok: bool, admission: Optional[Admission]):
+        now = time.monotonic()
+        with self._lock:
+            if admission is not None and admission.generation != self._generation:
+                return # admitted under an earlier state; its outcome is already moot
+            if self._state == HALF_OPEN:
+                if admission is None or not admission.probe:
+                    return # only the probes' own outcomes decide a half-open circuit
+                self._probes = max(0, self._probes - 1)
+                if ok:
+                    self._outcomes.clear()
+                    self._set_state(CLOSED)
+                else:
+                    self._open(now)
+                return
+            if self._state == OPEN:
+                return # a call admitted before the circuit opened; its outcome is already moot
+            self._outcomes.append((now, ok))
+            self._trim(now)
+            failures = sum(1 for _, call_ok in self._outcomes if not call_ok)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_ratio:
+                self._open(now)
+
+    def _advance(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= self.open_duration:
+            self._probes = 0
+            self._set_state(HALF_OPEN)
+
+    def _open(self, now: float):
+        self._opened_at = now
+        self._outcomes.clear()
+        self._set_state(OPEN)
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _set_state(self, state: str):
+        if state != self._state:
+            print(f"Circuit '{self.name}' {self._state} -> {state}")
+            self._generation += 1
+        self._state = state
+        metrics_service.set_circuit_state(self.name, state)
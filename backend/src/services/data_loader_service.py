@@ -1,18 +1,25 @@
+import hashlib
 import json
 from typing import List, Dict
 from backend.src.models.word import Word
 from backend.src.models.kanji import Kanji
+from backend.src.services import metrics_service, timing_service
 
 class DataLoaderService:
     def __init__(self, data_file_path: str):
         self.data_file_path = data_file_path
         self._words_cache = None
+        self.version = None
+        # (word list, character index) for the list load_data() last returned
+        self._kanji_by_character = (None, {})
 
     def load_data(self) -> List[Word]:
         if self._words_cache:
+            metrics_service.record_cache_lookup('words', hit=True)
             return self._words_cache
+        metrics_service.record_cache_lookup('words', hit=False)
 
-        with open(self.data_file_path, 'r', encoding='utf-8') as f:
+        with timing_service.phase('load'), open(self.data_file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
         words = []
@@ -39,8 +46,18 @@ class DataLoaderService:
             words.append(word)
         
         self._words_cache = words
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        self.version = hashlib.blake2b(canonical, digest_size=8).hexdigest()
+        metrics_service.set_dataset_size('words', len(words))
+        metrics_service.set_dataset_size('kanji', len(self.get_all_kanji(words)))
         return words
 
+    def dataset_version(self) -> str:
+        """Content hash of the loaded dataset; keys caches derived from it."""
+        if self.version is None:
+            self.load_data()
+        return self.version
+
     def get_suggestions(self, query: str) -> List[str]:
         words = self.load_data()
         suggestions = []
@@ -55,4 +72,15 @@ class DataLoaderService:
         for word in words:
             for kanji in word.kanji_components:
                 all_kanji[kanji.id] = kanji
-        return all_kanji
\ No newline at end of file
+        return all_kanji
+
+    def get_kanji_by_character(self) -> Dict[str, Kanji]:
+        """Dataset kanji keyed by character (the first entry wins when one appears in several words)."""
+        words = self.load_data()
+        if self._kanji_by_character[0] is not words:
+            index = {}
+            for word in words:
+                for kanji in word.kanji_components:
+                    index.setdefault(kanji.character, kanji)
+            self._kanji_by_character = (words, index)
+        return self._kanji_by_character[1]
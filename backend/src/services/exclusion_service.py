@@ -0,0 +1,120 @@
+import base64
+import binascii
+import json
+from typing import Any, Container, Dict, Iterable, Optional
+
+# Bounds on what a client may send; beyond these a request is rejected with a 400.
+MAX_EXCLUDED = 2000
+MAX_BLOOM_BYTES = 8192
+MAX_BLOOM_HASHES = 16
+
+# FNV-1a (32-bit), with MurmurHash3's finalizer to spread it into the two double-hashing seeds.
+_FNV_PRIME = 0x01000193
+_FNV_BASIS = 0x811c9dc5
+_SEED_2 = 0x5bd1e995
+
+
+def _fnv1a(data: bytes) -> int:
+    h = _FNV_BASIS
+    for byte in data:
+        h = ((h ^ byte) * _FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+def _fmix32(h: int) -> int:
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+
+class BloomFilter:
+    """
+    A Bloom filter over slugs, in the layout the frontend builds (frontend/src/js/utils/BloomFilter.js):
+    bit i is `bits[i >> 3] & (1 << (i & 7))`, and the k-th probe of a slug is
+    (h1 + k * h2) mod 2^32 mod m, with h1 = fmix32(h) and h2 = fmix32(h ^ 0x5bd1e995)
+    for h the FNV-1a hash of its UTF-8 bytes. Membership may be a false positive, never a false negative.
+    """
+    def __init__(self, bits: bytes, hashes: int):
+        self.bits = bytearray(bits)
+        self.hashes = hashes
+        self.size = len(self.bits) * 8
+
+    @classmethod
+    def for_capacity(cls, capacity: int, bits_per_item: int = 10, hashes: int = 7) -> 'BloomFilter':
+        """An empty filter sized for ~1% false positives at `capacity` items."""
+        return cls(bytes(max(1, (capacity * bits_per_item + 7) // 8)), hashes)
+
+    def _probes(self, slug: str):
+        h = _fnv1a(slug.encode('utf-8'))
+        h1, h2 = _fmix32(h), _fmix32(h ^ _SEED_2)
+        for k in range(self.hashes):
+            yield ((h1 + k * h2) & 0xFFFFFFFF) % self.size
+
+    def add(self, slug: str):
+        for i in self._probes(slug):
+            self.bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, slug) -> bool:
+        return isinstance(slug, str) and all(self.bits[i >> 3] & (1 << (i & 7)) for i in self._probes(slug))
+
+    def to_base64(self) -> str:
+        return base64.b64encode(bytes(self.bits)).decode('ascii')
+
+
+def parse_exclusion(payload: Any) -> Optional[Container[str]]:
+    """
+    Reads the slugs a client already has from a request body, either
+    {"exclude": ["日曜", ...]} or {"bloom": {"bits": "<base64>", "hashes": 7}}.
+    Returns None when neither is given; raises ValueError for a malformed or oversized one.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("The request body must be a JSON object.")
+    exclude, bloom = payload.get('exclude'), payload.get('bloom')
+    if exclude is not None:
+        if not isinstance(exclude, list) or not all(isinstance(slug, str) for slug in exclude):
+            raise ValueError("'exclude' must be a list of slugs.")
+        if len(exclude) > MAX_EXCLUDED:
+            raise ValueError(f"'exclude' is limited to {MAX_EXCLUDED} slugs; send a 'bloom' filter instead.")
+        return frozenset(exclude)
+    if bloom is not None:
+        if not isinstance(bloom, dict) or not isinstance(bloom.get('bits'), str):
+            raise ValueError("'bloom' must be an object with base64 'bits' and 'hashes'.")
+        hashes = bloom.get('hashes')
+        if not isinstance(hashes, int) or isinstance(hashes, bool) or not 1 <= hashes <= MAX_BLOOM_HASHES:
+            raise ValueError(f"'bloom.hashes' must be an integer from 1 to {MAX_BLOOM_HASHES}.")
+        try:
+            bits = base64.b64decode(bloom['bits'], validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("'bloom.bits' is not valid base64.")
+        if not bits or len(bits) > MAX_BLOOM_BYTES:
+            raise ValueError(f"'bloom.bits' must decode to 1 to {MAX_BLOOM_BYTES} bytes.")
+        return BloomFilter(bits, hashes)
+    return None
+
+
+def parse_exclusion_body(body: bytes) -> Optional[Container[str]]:
+    """parse_exclusion for a raw request body; an empty body excludes nothing."""
+    if not body.strip():
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("The request body is not valid JSON.")
+    return parse_exclusion(payload)
+
+
+def exclude_known(result: Dict[str, Any], known: Container[str]) -> Dict[str, Any]:
+    """Copies a search result without the items whose slug the client already has."""
+    filtered = dict(result)
+    filtered['data'] = [item for item in result.get('data', []) if item.get('slug') not in known]
+    return filtered
+
+
+def build_bloom(slugs: Iterable[str]) -> BloomFilter:
+    """A filter holding `slugs`, sized for them (used by tests and Python clients)."""
+    slugs = list(slugs)
+    bloom = BloomFilter.for_capacity(len(slugs))
+    for slug in slugs:
+        bloom.add(slug)
+    return bloom
@@ -1,14 +1,129 @@
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
 import requests
+from backend.src.services import metrics_service, timing_service
+
+CHANGELOG_URL = "https://raw.githubusercontent.com/MashXP/Rinkuji/main/CHANGELOG.md"
+# (connect, read) seconds; the fetch runs in the background, but a hung socket would
+# still hold the refresh slot and keep the cache stale.
+GITHUB_TIMEOUT = (3.05, 5)
+# How long a fetched changelog is served without revalidating.
+CHANGELOG_TTL = 600
+# After a failed fetch, wait this long before trying GitHub again.
+CHANGELOG_RETRY_INTERVAL = 60
+# Copy shipped with the repository, served until (or whenever) GitHub cannot be reached.
+BUNDLED_CHANGELOG_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'CHANGELOG.md'))
 
 def get_changelog_from_github():
     """
     Fetches the content of the CHANGELOG.md file from the GitHub repository.
     """
-    url = "https://raw.githubusercontent.com/MashXP/Rinkuji/main/CHANGELOG.md"
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
+        with timing_service.phase('github'):
+            response = requests.get(CHANGELOG_URL, timeout=GITHUB_TIMEOUT)
+            response.raise_for_status()  # Raise an exception for bad status codes
         return response.text
     except requests.exceptions.RequestException as e:
         print(f"Error fetching changelog from GitHub: {e}")
         return None
+
+def load_bundled_changelog() -> Optional[str]:
+    try:
+        with open(BUNDLED_CHANGELOG_PATH, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError as e:
+        print(f"Error reading bundled changelog: {e}")
+        return None
+
+def parse_latest_version(changelog_md: Optional[str]) -> str:
+    """
+    Formats the first '## ' heading of the changelog for display, e.g.
+    '## [1.0.3] - 2025-09-22' becomes 'ver.1.0.3'. Returns "null" when there is none.
+    """
+    if not changelog_md:
+        return "null"
+    for line in changelog_md.split('\n'):
+        if line.startswith('## '):
+            version_info = line.replace('## ', '').strip()
+            # Split by " - " to separate version and date
+            parts = version_info.split(' - ', 1)
+            if len(parts) == 2:
+                return f"ver.{parts[0].strip().replace('[', '').replace(']', '')}"
+            return f"ver.{version_info}" # Fallback if format is unexpected
+    return "null"
+
+
+class Changelog(NamedTuple):
+    markdown: Optional[str]
+    latest_version: str
+    source: str # 'github', 'bundled' or 'none'
+
+
+class ChangelogCache:
+    """
+    Holds the changelog and its parsed latest version with stale-while-revalidate
+    semantics: readers always get the current copy immediately, and an expired copy
+    triggers a single background refresh from GitHub. Until the first fetch succeeds
+    the bundled CHANGELOG.md is served.
+    """
+    def __init__(self, fetch=None, ttl: float = CHANGELOG_TTL,
+                 retry_interval: float = CHANGELOG_RETRY_INTERVAL):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._current: Optional[Changelog] = None
+        self._next_refresh = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get(self) -> Changelog:
+        with self._lock:
+            if self._current is None:
+                bundled = load_bundled_changelog()
+                source = 'bundled' if bundled else 'none'
+                self._current = Changelog(bundled, parse_latest_version(bundled), source)
+            current = self._current
+            stale = time.monotonic() >= self._next_refresh
+            start_refresh = stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+        metrics_service.record_cache_lookup('changelog', hit=not stale)
+        timing_service.describe('changelog', current.source)
+        if start_refresh:
+            threading.Thread(target=self._refresh, name='changelog-refresh', daemon=True).start()
+        return current
+
+    def refresh(self):
+        """Fetches the changelog synchronously, keeping the current copy if GitHub fails."""
+        with self._lock:
+            self._refreshing = True
+        self._refresh()
+
+    def _refresh(self):
+        fetch = self._fetch or get_changelog_from_github
+        markdown = None
+        try:
+            markdown = fetch()
+        finally:
+            with self._lock:
+                if markdown:
+                    self._current = Changelog(markdown, parse_latest_version(markdown), 'github')
+                    self._next_refresh = time.monotonic() + self.ttl
+                else:
+                    self._next_refresh = time.monotonic() + self.retry_interval
+                self._refreshing = False
+
+    def clear(self):
+        with self._lock:
+            self._current = None
+            self._next_refresh = 0.0
+
+
+changelog_cache = ChangelogCache()
+
+def get_changelog() -> Changelog:
+    """Returns the cached changelog without waiting on GitHub."""
+    return changelog_cache.get()
@@ -0,0 +1,122 @@
+import gzip
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+PRECOMPUTED_VERSION = 1
+DEFAULT_PRECOMPUTED_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'graph_cache.json.gz'))
+PRECOMPUTED_PATH_ENV = 'RINKUJI_GRAPH_CACHE'
+
+# (dataset version, word ids) -> (graph, wall-clock expiry or None)
+GraphKey = Tuple[str, Tuple[int, ...]]
+
+
+def precomputed_path() -> str:
+    return os.environ.get(PRECOMPUTED_PATH_ENV) or DEFAULT_PRECOMPUTED_PATH
+
+
+def load_precomputed(path: Optional[str] = None) -> Mapping[GraphKey, Tuple[dict, Optional[float]]]:
+    """
+    Loads graphs written by `flask precompute-graphs`. Entries stay keyed by the
+    dataset version they were built from, so a changed data.json simply never
+    matches them. Returns a read-only mapping, empty when there is no usable file.
+    """
+    path = path or precomputed_path()
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return MappingProxyType({})
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable graph cache {path}: {e}")
+        return MappingProxyType({})
+    if data.get('version') != PRECOMPUTED_VERSION:
+        return MappingProxyType({})
+    dataset_version = data.get('dataset_version')
+    now = time.time()
+    return MappingProxyType({
+        (dataset_version, tuple(int(i) for i in ids.split(','))): (entry['graph'], entry.get('expires'))
+        for ids, entry in data.get('graphs', {}).items()
+        if entry.get('expires') is None or entry['expires'] > now
+    })
+
+
+def write_precomputed(path: str, dataset_version: str, graphs: Dict[Tuple[int, ...], Tuple[dict, Optional[float]]]):
+    """Writes graphs as compact gzipped JSON, replacing the file atomically."""
+    payload = {
+        'version': PRECOMPUTED_VERSION,
+        'dataset_version': dataset_version,
+        'graphs': {
+            ','.join(str(i) for i in ids): {'expires': expires, 'graph': graph}
+            for ids, (graph, expires) in sorted(graphs.items())
+        },
+    }
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=9) as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+# Per-process state for the precompute pool, set up once by _init_worker.
+_worker_graph_service = None
+
+def _init_worker(data_file_path: str, workers: int):
+    global _worker_graph_service
+    from backend.src.services import snapshot_service
+    from backend.src.services.graph_service import GraphService
+    from backend.src.services.jisho_service import JishoService
+    from backend.src.services.scheduler_service import BURST, RATE, UpstreamScheduler
+    # The workers split one rate limit between them rather than each taking the whole of it.
+    scheduler = UpstreamScheduler('jisho', rate=RATE / workers, burst=max(1.0, BURST / workers))
+    jisho_service = JishoService(scheduler=scheduler, snapshot=snapshot_service.load_snapshot())
+    _worker_graph_service = GraphService(jisho_service, data_file_path=data_file_path)
+
+def _build(text: str):
+    service = _worker_graph_service
+    targets = [w for w in service.data_loader.load_data() if w.text == text]
+    graph, ttl = service.build_cacheable(targets)
+    expires = None if ttl is None or math.isinf(ttl) else time.time() + ttl
+    return tuple(w.id for w in targets), graph, ttl is not None, expires
+
+
+def precompute_graphs(data_file_path: str, words: List[str], path: str, workers: int = 2,
+                      progress: Optional[Callable[[str, bool], None]] = None) -> Tuple[int, int]:
+    """
+    Builds the graph for each word on a pool of `workers` processes, each with its
+    own Jisho client seeded from the bundled snapshot, and writes the complete ones
+    to `path`. Only words whose kanji are all in the snapshot are built, so every
+    graph written is valid for as long as the snapshot it came from; the others
+    are skipped, as are graphs with a failed lookup. Returns (written, skipped).
+    """
+    from backend.src.services import snapshot_service
+    from backend.src.services.data_loader_service import DataLoaderService
+    loader = DataLoaderService(data_file_path)
+    dataset_version = loader.dataset_version()
+    snapshot = snapshot_service.load_snapshot()
+    uncovered = {w.text for w in loader.load_data()
+                 if any(('search_by_kanji', k.character) not in snapshot for k in w.kanji_components)}
+    graphs = {}
+    skipped = 0
+    for text in dict.fromkeys(w for w in words if w in uncovered):
+        skipped += 1
+        if progress is not None:
+            progress(text, False)
+    workers = max(1, workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(data_file_path, workers)) as executor:
+        futures = {executor.submit(_build, text): text for text in dict.fromkeys(words) if text not in uncovered}
+        for future in as_completed(futures):
+            ids, graph, complete, expires = future.result()
+            if complete and ids:
+                graphs[ids] = (graph, expires)
+            else:
+                skipped += 1
+            if progress is not None:
+                progress(futures[future], complete)
+    write_precomputed(path, dataset_version, graphs)
+    return len(graphs), skipped
@@ -1,45 +1,176 @@
+import math
 import os
-from typing import List, Dict
+import time
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
 from backend.src.models.word import Word
 from backend.src.models.kanji import Kanji
 from backend.src.services.data_loader_service import DataLoaderService
 from backend.src.services.jisho_service import JishoService
+from backend.src.services import metrics_service, timing_service
+from backend.src.services.normalization_service import is_kanji
+from backend.src.services.cache_service import LRUCache
+from backend.src.services.related_kanji_service import RelatedKanjiService
+from backend.src.services.scheduler_service import EXPANSION
+
+# Per-node columns emitted by to_columnar; missing values are padded with None.
+NODE_COLUMNS = ('id', 'text', 'meaning', 'reading', 'meanings', 'is_consolidated')
+GRAPH_FORMATS = ('nodes', 'columnar')
+# Extra data /api/graph embeds when named in 'include'.
+INCLUDE_OPTIONS = ('kanji_details',)
+GRAPH_CACHE_SIZE = 256
+# Upper bound on a cached graph's life; it also expires with the first Jisho result it used.
+GRAPH_CACHE_TTL = 86400
+
+
+def to_columnar(graph: Dict) -> Dict:
+    """
+    Converts a node/edge graph into parallel arrays. Node and edge types are
+    dictionary-encoded, and edges become integer index pairs into the node
+    columns, so keys are not repeated for every element.
+    """
+    index = {}
+    node_types, edge_types = [], []
+    nodes = {column: [] for column in NODE_COLUMNS}
+    nodes['type'] = []
+    for node in graph['nodes']:
+        index[node['id']] = len(index)
+        for column in NODE_COLUMNS:
+            nodes[column].append(node.get(column))
+        if node['type'] not in node_types:
+            node_types.append(node['type'])
+        nodes['type'].append(node_types.index(node['type']))
+
+    edges = {'source': [], 'target': [], 'type': []}
+    for edge in graph['edges']:
+        if edge['type'] not in edge_types:
+            edge_types.append(edge['type'])
+        edges['source'].append(index[edge['source']])
+        edges['target'].append(index[edge['target']])
+        edges['type'].append(edge_types.index(edge['type']))
+
+    return {
+        'format': 'columnar',
+        'node_types': node_types,
+        'edge_types': edge_types,
+        'nodes': nodes,
+        'edges': edges,
+    }
+
+
+def word_node(word: Word) -> Dict:
+    """A dataset word as a graph node."""
+    return {'id': word.id, 'text': word.text, 'type': 'word', 'meaning': word.meaning, 'reading': word.reading}
+
+
+def kanji_node(text: str, meanings: List[str], is_consolidated: bool = False) -> Dict:
+    """A kanji (or word found through one) as a graph node; /api/path builds the same shape."""
+    return {'id': text, 'text': text, 'type': 'kanji', 'meanings': meanings, 'is_consolidated': is_consolidated}
+
+
+def parse_include(value: Optional[str]) -> FrozenSet[str]:
+    """The comma-separated 'include' query parameter; raises ValueError for an unknown option."""
+    options = frozenset(option.strip() for option in (value or '').split(',') if option.strip())
+    unknown = options.difference(INCLUDE_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown include '{sorted(unknown)[0]}'. Supported: {', '.join(INCLUDE_OPTIONS)}.")
+    return options
+
+
+def kanji_details_for(graph: Dict, kanji_by_character: Mapping[str, Kanji]) -> Dict[str, Dict]:
+    """Details of every dataset kanji appearing in the graph's nodes, keyed by character."""
+    characters = dict.fromkeys(ch for node in graph['nodes'] for ch in str(node.get('text', '')) if is_kanji(ch))
+    return {ch: kanji_by_character[ch].to_dict() for ch in characters if ch in kanji_by_character}
+
+
+def with_includes(body: Dict, graph: Dict, include: FrozenSet[str], kanji_by_character: Mapping[str, Kanji]) -> Dict:
+    """
+    The response body (graph, in whichever format) with the extras named in `include`
+    added. Returns a copy when anything is added, so a cached graph stays as built.
+    """
+    if 'kanji_details' in include:
+        body = dict(body, kanji_details=kanji_details_for(graph, kanji_by_character))
+    return body
+
 
 class GraphService:
-    def __init__(self, jisho_service: JishoService):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        data_file_path = os.path.join(current_dir, '..', '..', 'data.json')
+    def __init__(self, jisho_service: JishoService, data_file_path: Optional[str] = None,
+                 precomputed: Optional[Mapping] = None, related_kanji: Optional[RelatedKanjiService] = None):
+        if data_file_path is None:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            data_file_path = os.path.join(current_dir, '..', '..', 'data.json')
         self.data_loader = DataLoaderService(data_file_path=data_file_path)
         self.jisho_service = jisho_service
+        self._graphs = LRUCache('graph', maxsize=GRAPH_CACHE_SIZE)
+        # Read-only graphs built by `flask precompute-graphs`: key -> (graph, wall-clock expiry).
+        self._precomputed = precomputed or {}
+        self.related_kanji = related_kanji or RelatedKanjiService(self.data_loader)
+
+    def generate_graph(self, target_words: List[Word], related: int = 0,
+                       lookups: Optional[Mapping[str, Tuple[Dict, int]]] = None) -> Dict:
+        """
+        Returns the graph for target_words, from the cache when possible. Entries are
+        keyed by the dataset version and word ids, and expire with the earliest Jisho
+        result they were built from. Graphs built on a failed lookup are not cached.
+        With `related`, each component kanji also links to that many of the kanji it
+        most often appears with; those graphs are cached under their own key.
+        `lookups` holds search_by_kanji results already fetched, by kanji.
+        """
+        graph = self.cached_graph(target_words, related)
+        if graph is not None:
+            return graph
+        graph, ttl = self.build_cacheable(target_words, related, lookups)
+        if ttl is not None:
+            self._graphs.set(self._graph_key(target_words, related), graph, ttl=min(ttl, GRAPH_CACHE_TTL))
+        return graph
+
+    def _graph_key(self, target_words: List[Word], related: int) -> Tuple:
+        key = (self.data_loader.dataset_version(), tuple(word.id for word in target_words))
+        if related:
+            key += (('related', related),)
+        return key
 
-    def generate_graph(self, target_words: List[Word]) -> Dict:
+    def cached_graph(self, target_words: List[Word], related: int = 0) -> Optional[Dict]:
+        """The cached or precomputed graph for target_words, or None when it has to be built."""
+        key = self._graph_key(target_words, related)
+        graph = self._graphs.get(key)
+        if graph is None and self._precomputed:
+            graph, expires = self._precomputed.get(key, (None, None))
+            if graph is not None and expires is not None and expires <= time.time():
+                graph = None
+            metrics_service.record_cache_lookup('graph_precomputed', hit=graph is not None)
+        return graph
+
+    def build_cacheable(self, target_words: List[Word], related: int = 0,
+                        lookups: Optional[Mapping[str, Tuple[Dict, int]]] = None) -> Tuple[Dict, Optional[float]]:
+        """Builds a graph and returns it with how long it stays valid (None: do not cache)."""
+        with metrics_service.GRAPH_BUILD_DURATION.time(), timing_service.phase('build'):
+            graph = self._build_graph(target_words, lookups or {})
+            if related:
+                self._add_related(graph, target_words, related)
+        metrics_service.GRAPH_NODES.observe(len(graph['nodes']))
+        remaining = [self.jisho_service.expires_in(kanji.character)
+                     for word in target_words for kanji in word.kanji_components]
+        if any(r is None for r in remaining):
+            return graph, None
+        return graph, min(remaining, default=math.inf)
+
+    def _build_graph(self, target_words: List[Word], lookups: Mapping[str, Tuple[Dict, int]]) -> Dict:
         nodes = []
         edges = []
         
         # Add target words as nodes
         for word in target_words:
-            nodes.append({
-                'id': word.id,
-                'text': word.text,
-                'type': 'word',
-                'meaning': word.meaning,
-                'reading': word.reading
-            })
+            nodes.append(word_node(word))
 
             # Add kanji components as nodes and edges
             for kanji_char in word.kanji_components:
-                kanji_data, _ = self.jisho_service.search_by_kanji(kanji_char.character)
+                kanji_data, _ = lookups.get(kanji_char.character) or \
+                    self.jisho_service.search_by_kanji(kanji_char.character, priority=EXPANSION)
                 for kanji in kanji_data.get("data", []):
                     if isinstance(kanji, dict):
                         slug = kanji.get('slug')
                         if slug and not any(n['id'] == slug for n in nodes):
-                            nodes.append({
-                                'id': slug,
-                                'text': slug,
-                                'type': 'kanji',
-                                'meanings': kanji.get('meanings', []),
-                                'is_consolidated': kanji.get('is_consolidated', False)
-                            })
+                            nodes.append(kanji_node(slug, kanji.get('meanings', []), kanji.get('is_consolidated', False)))
                         if slug:
                             # Add edge from word to kanji
                             edges.append({
@@ -48,4 +179,25 @@ class GraphService:
                                 'type': 'contains'
                             })
 
-        return {'nodes': nodes, 'edges': edges}
\ No newline at end of file
+        return {'nodes': nodes, 'edges': edges}
+
+    def _add_related(self, graph: Dict, target_words: List[Word], count: int):
+        """
+        Links each word to the `count` kanji most associated with each of its component
+        kanji (other than its own), read from the co-occurrence index without Jisho calls.
+        """
+        nodes, edges = graph['nodes'], graph['edges']
+        for word in target_words:
+            own = {kanji.character for kanji in word.kanji_components}
+            for component in word.kanji_components:
+                neighbours = self.related_kanji.related(component.character, count + len(own)) or []
+                for entry in [n for n in neighbours if n['kanji'] not in own][:count]:
+                    if not any(n['id'] == entry['kanji'] for n in nodes):
+                        nodes.append(kanji_node(entry['kanji'], [entry['meaning']] if entry['meaning'] else []))
+                    edges.append({
+                        'source': word.id,
+                        'target': entry['kanji'],
+                        'type': 'related',
+                        'via': component.character,
+                        'score': entry['score']
+                    })
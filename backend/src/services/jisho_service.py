@@ -1,49 +1,340 @@
+import contextvars
+import math
 import requests
-import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Container, Dict, List, Mapping, Optional
+from backend.src.services import metrics_service, normalization_service, timing_service
+from backend.src.services.cache_service import LRUCache
+from backend.src.services.circuit_breaker_service import OPEN, CircuitBreaker, CircuitOpenError
+from backend.src.services.latency_service import HedgeBudget, LatencyTracker, hedged_call
+from backend.src.services.exclusion_service import exclude_known
+from backend.src.services.projection_service import Projection, project_results
+from backend.src.services.sampling_service import Page, select
+from backend.src.services.scheduler_service import INTERACTIVE, QueueRejected, UpstreamScheduler
+
+# Upstream calls that were not attempted; answered from stale data or with a 503.
+_UNAVAILABLE = (CircuitOpenError, QueueRejected)
 
 class JishoService:
     JISHO_API_URL = "https://jisho.org/api/v1/search/words"
+    # Jisho entries change rarely; an hour keeps hot lookups local without serving stale data for long.
+    CACHE_TTL = 3600
+    CACHE_SIZE = 1024
+    # Empty result sets expire quickly so words Jisho adds later are not hidden for an hour.
+    NEGATIVE_CACHE_TTL = 300
+    # Last good results are kept this long to answer while Jisho is failing.
+    STALE_TTL = 86400
+    # (connect, read) seconds. The read timeout adapts to observed latency, up to this maximum.
+    REQUEST_TIMEOUT = (3.05, 10)
+    # Send a duplicate request once a call is slower than the recent p95 (within a 10% budget).
+    HEDGE_REQUESTS = True
+    # Jisho returns at most this many words per page; a shorter page is the last one.
+    PAGE_SIZE = 20
+    # Most pages one request may read, and how many of them are requested from Jisho at once.
+    MAX_PAGES = 5
+    PAGE_CONCURRENCY = 3
+
+    def __init__(self, breaker: Optional[CircuitBreaker] = None, scheduler: Optional[UpstreamScheduler] = None,
+                 snapshot: Optional[Mapping] = None):
+        self._results = LRUCache('jisho', maxsize=self.CACHE_SIZE, ttl=self.CACHE_TTL)
+        self._projections = LRUCache('jisho_projection', maxsize=self.CACHE_SIZE, ttl=self.CACHE_TTL)
+        self._stale = LRUCache('jisho_stale', maxsize=self.CACHE_SIZE, ttl=self.STALE_TTL)
+        self.breaker = breaker or CircuitBreaker('jisho')
+        self.latency = LatencyTracker('jisho', max_timeout=self.REQUEST_TIMEOUT[1])
+        self._hedge_budget = HedgeBudget()
+        self.scheduler = scheduler or UpstreamScheduler('jisho')
+        # Read-only results precomputed by `flask warm-cache`, consulted before calling upstream.
+        self._snapshot = snapshot or {}
 
     @staticmethod
     def is_japanese(text: str) -> bool:
-        # This regex checks for Hiragana, Katakana, and Kanji characters.
-        return bool(re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', text))
+        # Any hiragana, katakana or kanji, including the CJK extensions.
+        return normalization_service.is_japanese(text)
+
+    def _get(self, api_url, endpoint, priority=INTERACTIVE):
+        """
+        Calls the Jisho API through the scheduler and circuit breaker, recording the
+        call's latency and outcome. Raises CircuitOpenError without calling out while the
+        circuit is open, and QueueRejected when the scheduler drops the call.
+        """
+        if self.breaker.state == OPEN: # fail fast instead of queueing for a call that cannot go out
+            raise CircuitOpenError(f"Circuit '{self.breaker.name}' is open")
+        with self.scheduler.slot(priority):
+            return self._send(api_url, endpoint)
+
+    def _send(self, api_url, endpoint):
+        admission = self.breaker.allow()
+        if not admission:
+            raise CircuitOpenError(f"Circuit '{self.breaker.name}' is open")
+        timeout = (self.REQUEST_TIMEOUT[0], self.latency.timeout())
+        hedge_delay = self.latency.hedge_delay() if self.HEDGE_REQUESTS else None
+        start = time.perf_counter()
+        try:
+            with timing_service.phase('jisho'):
+                response = hedged_call('jisho', lambda: self._attempt(api_url, timeout),
+                                       hedge_delay, self._hedge_budget, self.scheduler.take_token)
+        except BaseException: # anything but success, so a half-open probe always gives its slot back
+            self.breaker.record_failure(admission)
+            metrics_service.observe_jisho_call(endpoint, time.perf_counter() - start, ok=False)
+            raise
+        self.breaker.record_success(admission)
+        metrics_service.observe_jisho_call(endpoint, time.perf_counter() - start, ok=True)
+        return response
+
+    def _attempt(self, api_url, timeout):
+        """One upstream request; timeouts count as a sample at the timeout so the window tracks slowdowns."""
+        start = time.perf_counter()
+        try:
+            response = requests.get(api_url, timeout=timeout)
+        except requests.exceptions.Timeout:
+            self.latency.observe(timeout[1])
+            raise
+        self.latency.observe(time.perf_counter() - start)
+        response.raise_for_status()
+        return response
+
+    def _cached(self, key, fetch, projection: Optional[Projection]):
+        """
+        Serves a result from the cache, fetching it on a miss. Projected shapes are
+        cached separately so repeated slim requests skip both the upstream call and
+        the projection. Empty results are cached briefly; failed fetches are not
+        cached, and are answered with the last good result when there is one.
+        Results in the bundled snapshot are served without calling upstream.
+        """
+        hit = self._lookup(key, projection)
+        if hit is not None:
+            return hit
+        try:
+            result = fetch()
+        except (requests.exceptions.RequestException, *_UNAVAILABLE) as e:
+            return self._fallback(key, e, projection)
+        self._store(key, result)
+        return self._projected(key, result, projection)
+
+    # The steps of _cached, shared with AsyncJishoService so both clients use the same caches.
+
+    def _lookup(self, key, projection: Optional[Projection]):
+        """The cached or snapshot answer for key in the requested shape, or None on a miss."""
+        if projection is not None:
+            projected = self._projections.get((key, projection))
+            if projected is not None:
+                return projected, 200
+        result = self._results.get(key)
+        if result is None and self._snapshot:
+            result = self._snapshot.get(key)
+            metrics_service.record_cache_lookup('jisho_snapshot', hit=result is not None)
+        if result is None:
+            return None
+        return self._projected(key, result, projection)
+
+    def _store(self, key, result):
+        self._results.set(key, result, ttl=self._ttl(result.get('data')))
+        self._stale.set(key, result)
+
+    def _ttl(self, has_data) -> Optional[float]:
+        """How long a result, or anything derived from it, is cached: briefly when upstream had nothing."""
+        return None if has_data else self.NEGATIVE_CACHE_TTL
+
+    def _fallback(self, key, error: Exception, projection: Optional[Projection]):
+        """Answers a failed fetch with the last good result, or with a 503 (not attempted) or 502."""
+        result = self._stale.get(key)
+        if result is None:
+            if isinstance(error, _UNAVAILABLE):
+                metrics_service.record_jisho_fallback('rejected')
+                return {"error": "The external API is temporarily unavailable."}, 503
+            print(f"Error fetching from Jisho API: {error}")
+            return {"error": "Failed to fetch data from the external API."}, 502
+        metrics_service.record_jisho_fallback('stale')
+        timing_service.describe('jisho', 'stale')
+        return self._projected(key, result, projection, stale=True)
+
+    def _projected(self, key, result, projection: Optional[Projection], stale: bool = False):
+        if projection is None:
+            return result, 200
+        projected = project_results(result, projection)
+        if not stale:
+            self._projections.set((key, projection), projected, ttl=self._ttl(result.get('data')))
+        return projected, 200
+
+    def is_cached(self, kanji) -> bool:
+        """Whether search_by_kanji(kanji) would be answered without calling upstream."""
+        key = ('search_by_kanji', kanji)
+        return key in self._results or key in self._snapshot
 
-    def search_words(self, query):
+    def expires_in(self, kanji) -> Optional[float]:
+        """
+        Seconds until the cached search_by_kanji(kanji) result expires: inf for snapshot
+        results, None when there is no fresh result (never fetched, failed or stale).
+        """
+        key = ('search_by_kanji', kanji)
+        remaining = self._results.expires_in(key)
+        if remaining is None and key in self._snapshot:
+            return math.inf
+        return remaining
+
+    def search_words(self, query, projection: Optional[Projection] = None, priority=INTERACTIVE,
+                     max_pages: int = 1):
+        """
+        Jisho word search. With max_pages > 1, reads up to that many pages, without repeated
+        slugs. The query is normalized first, so width and case variants share cache entries.
+        """
+        query = normalization_service.normalize(query or '')
         if not query:
             return {"error": "A 'query' parameter is required."}, 400
+        if max_pages > 1:
+            return self._multi_page('search_words', query, projection, priority, max_pages)
+        return self._cached(('search_words', query), lambda: self._fetch_words(query, priority), projection)
 
+    def _page_url(self, query, page_number=1):
         api_url = f"{self.JISHO_API_URL}?keyword={query}"
+        if page_number > 1:
+            api_url += f"&page={page_number}"
+        return api_url
 
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Filter out results that are not Japanese
-            if 'data' in data:
-                filtered_data = [
-                    item for item in data['data'] 
-                    if 'slug' in item and self.is_japanese(item['slug'])
-                ]
-                data['data'] = filtered_data
-
-            return data, 200
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching from Jisho API: {e}")
-            return {"error": "Failed to fetch data from the external API."}, 502
+    def _fetch_words(self, query, priority=INTERACTIVE, page_number=1):
+        response = self._get(self._page_url(query, page_number), 'search_words', priority)
+        return self._japanese_only(response.json())
 
-    def search_by_kanji(self, kanji):
+    def _japanese_only(self, data):
+        # Filter out results that are not Japanese
+        if 'data' in data:
+            filtered_data = [
+                item for item in data['data']
+                if 'slug' in item and self.is_japanese(item['slug'])
+            ]
+            data['data'] = filtered_data
+        return data
+
+    def search_by_kanji(self, kanji, projection: Optional[Projection] = None, priority=INTERACTIVE,
+                        page: Optional[Page] = None, exclude: Optional[Container[str]] = None,
+                        max_pages: int = 1):
+        """
+        Words containing a kanji. `priority` is the scheduler class the upstream call
+        waits in: interactive for direct lookups, expansion for graph fan-out and
+        prefetch for speculative work. With max_pages > 1, reads up to that many pages
+        and consolidates across them. With a `page`, returns that window (or seeded
+        sample) of the results; slugs in `exclude` are left out before the window is taken.
+        """
+        kanji = normalization_service.normalize(kanji or '')
         if not kanji or len(kanji) != 1:
             return {"error": "A single 'kanji' character parameter is required."}, 400
+        if page is not None:
+            return self._paged_by_kanji(kanji, page, projection, priority, exclude)
+        if max_pages > 1:
+            result, status = self._multi_page('search_by_kanji', kanji, projection, priority, max_pages)
+        else:
+            result, status = self._cached(('search_by_kanji', kanji), lambda: self._fetch_kanji(kanji, priority), projection)
+        if exclude is not None and status == 200:
+            return exclude_known(result, exclude), status
+        return result, status
 
-        api_url = f"{self.JISHO_API_URL}?keyword={kanji}"
+    def _fetch_kanji(self, kanji, priority=INTERACTIVE, page_number=1):
+        response = self._get(self._page_url(kanji, page_number), 'search_by_kanji', priority)
+        data = response.json()
+        return self._consolidate(data)
 
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            data = response.json()
+    def _page(self, endpoint, query, page_number, priority):
+        """One upstream page, cached on its own; page 1 is the unpaginated result."""
+        key = (endpoint, query) if page_number == 1 else (endpoint, query, page_number)
+        fetch = self._fetch_kanji if endpoint == 'search_by_kanji' else self._fetch_words
+        return key, self._cached(key, lambda: fetch(query, priority, page_number), None)
+
+    def _is_full(self, result) -> bool:
+        """
+        Whether a page held a full page of upstream words, i.e. more may follow.
+        Consolidated entries count once per member; entries dropped as non-Japanese
+        are not counted, so such a page reads as the last one.
+        """
+        count = sum(len(item['consolidated_members']) if item.get('is_consolidated') else 1
+                    for item in result.get('data', []))
+        return count >= self.PAGE_SIZE
+
+    def _read_pages(self, endpoint, query, priority, max_pages, wanted=math.inf):
+        """
+        Reads pages until they hold `wanted` items, a short page ends the results or
+        max_pages is reached. Page 1 comes first (usually cached); later pages are
+        requested PAGE_CONCURRENCY at a time, no more than the shortfall needs, and
+        merged as they arrive in page order. Pages past a short one are discarded.
+        Returns (merger, [key, ...], last page was full) or (error, status, None).
+        """
+        key, (first, status) = self._page(endpoint, query, 1, priority)
+        if status != 200:
+            return first, status, None
+        merger = PageMerger(consolidate=endpoint == 'search_by_kanji')
+        merger.add(first)
+        keys = [key]
+        last_full = self._is_full(first)
+        while last_full and len(keys) < max_pages and len(merger) < wanted:
+            start = len(keys) + 1
+            count = min(self.PAGE_CONCURRENCY, max_pages - len(keys))
+            if wanted != math.inf:
+                count = min(count, math.ceil((wanted - len(merger)) / self.PAGE_SIZE))
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, self._page, endpoint, query, n, priority)
+                           for n in range(start, start + count)]
+                for future in futures:
+                    key, (result, status) = future.result()
+                    if status != 200:
+                        return result, status, None
+                    merger.add(result)
+                    keys.append(key)
+                    last_full = self._is_full(result)
+                    if not last_full:
+                        break
+        return merger, keys, last_full
+
+    def _fresh(self, keys) -> bool:
+        """Whether every page was served fresh (from the cache, snapshot or upstream, not stale)."""
+        return all(key in self._results or key in self._snapshot for key in keys)
+
+    def _multi_page(self, endpoint, query, projection: Optional[Projection], priority, max_pages):
+        max_pages = min(max_pages, self.MAX_PAGES)
+        cache_key = ((endpoint, query), projection, ('pages', max_pages))
+        cached = self._projections.get(cache_key)
+        if cached is not None:
+            return cached, 200
+        merger, keys, more_upstream = self._read_pages(endpoint, query, priority, max_pages)
+        if more_upstream is None: # merger and keys hold the error body and status
+            return merger, keys
+        body = {'data': merger.items(), 'pages': len(keys), 'has_more': more_upstream}
+        if projection is not None:
+            body = project_results(body, projection)
+        if self._fresh(keys):
+            self._projections.set(cache_key, body, ttl=self._ttl(len(merger)))
+        return body, 200
 
+    def _paged_by_kanji(self, kanji, page: Page, projection: Optional[Projection], priority, exclude):
+        cache_key = (('search_by_kanji', kanji), projection, page)
+        if exclude is None:
+            cached = self._projections.get(cache_key)
+            if cached is not None:
+                return cached, 200
+        # A seeded sample is drawn from the first page, the set an unpaginated expansion
+        # chooses from; a plain window reads as many pages as its end needs.
+        wanted = self.PAGE_SIZE if page.seed is not None else page.offset + page.limit
+        merger, keys, more_upstream = self._read_pages('search_by_kanji', kanji, priority,
+                                                       1 if page.seed is not None else self.MAX_PAGES, wanted)
+        if more_upstream is None: # merger and keys hold the error body and status
+            return merger, keys
+        items = merger.items()
+        if exclude is not None:
+            items = [item for item in items if item.get('slug') not in exclude]
+        end = page.offset + page.limit
+        body = {'data': select(items, page, kanji), 'offset': page.offset, 'limit': page.limit,
+                'has_more': len(items) > end or (page.seed is None and more_upstream and len(keys) < self.MAX_PAGES)}
+        if page.seed is not None:
+            body['seed'] = page.seed
+        if projection is not None:
+            body = project_results(body, projection)
+        # Windows of stale pages are not kept, like stale projections.
+        if exclude is None and self._fresh(keys):
+            self._projections.set(cache_key, body, ttl=self._ttl(len(merger)))
+        return body, 200
+
+    def _consolidate(self, data):
+        """Groups Jisho results by base slug, merging duplicates into consolidated entries."""
+        with timing_service.phase('consolidate'):
             processed_results = {}
             for result in data.get("data", []):
                 slug = result.get("slug")
@@ -54,23 +345,52 @@ class JishoService:
                         processed_results[base_slug] = []
                     processed_results[base_slug].append(result)
 
-            final_results = []
-            for base_slug, results in processed_results.items():
-                if len(results) > 1:
-                    # This is a consolidated kanji
-                    final_results.append({
-                        "slug": base_slug,
-                        # The frontend will now extract meanings and readings from consolidated_members
-                        "meanings": [res.get("senses", [{}])[0].get("english_definitions", [])[0] or "" for res in results],
-                        "readings": [jp.get("reading") for res in results for jp in res.get("japanese", []) if jp.get("reading")],
-                        "is_consolidated": True,
-                        "consolidated_members": results # Store the original results here
-                    })
+            return {"data": [consolidated_entry(base_slug, results) for base_slug, results in processed_results.items()]}
+
+
+def consolidated_entry(base_slug, results):
+    """The entry for one base slug: the word itself, or a consolidated entry for several."""
+    if len(results) > 1:
+        # This is a consolidated kanji
+        return {
+            "slug": base_slug,
+            # The frontend will now extract meanings and readings from consolidated_members
+            "meanings": [res.get("senses", [{}])[0].get("english_definitions", [])[0] or "" for res in results],
+            "readings": [jp.get("reading") for res in results for jp in res.get("japanese", []) if jp.get("reading")],
+            "is_consolidated": True,
+            "consolidated_members": results # Store the original results here
+        }
+    # This is a normal word
+    return results[0]
+
+
+class PageMerger:
+    """
+    Accumulates result pages in order. Kanji results are regrouped by base slug as
+    each page arrives, so a group split across pages becomes one consolidated entry;
+    word results are deduplicated by slug.
+    """
+    def __init__(self, consolidate: bool):
+        self.consolidate = consolidate
+        self._groups: Dict[str, List[dict]] = {}
+        self._pages: List[dict] = []
+
+    def add(self, result):
+        self._pages.append(result)
+        with timing_service.phase('consolidate'):
+            for item in result.get('data', []):
+                if self.consolidate:
+                    members = item['consolidated_members'] if item.get('is_consolidated') else [item]
+                    self._groups.setdefault(item['slug'].split('-')[0], []).extend(members)
                 else:
-                    # This is a normal word
-                    final_results.append(results[0])
+                    self._groups.setdefault(item.get('slug'), [item])
 
-            return {"data": final_results}, 200
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching from Jisho API: {e}")
-            return {"error": "Failed to fetch data from the external API."}, 502
+    def __len__(self):
+        return len(self._groups)
+
+    def items(self) -> List[dict]:
+        if len(self._pages) == 1:
+            return self._pages[0].get('data', []) # already in final form
+        if not self.consolidate:
+            return [group[0] for group in self._groups.values()]
+        return [consolidated_entry(base_slug, members) for base_slug, members in self._groups.items()]
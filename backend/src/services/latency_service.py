@@ -0,0 +1,122 @@
+import math
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TypeVar
+from backend.src.services import metrics_service
+from backend.src.services.scheduler_service import CONCURRENCY
+
+T = TypeVar('T')
+
+# Recent upstream latencies kept per tracker; enough for a stable p99 without lagging
+# far behind a change in upstream behaviour.
+WINDOW_SIZE = 200
+# Until this many samples exist the configured maximum timeout is used and no hedging happens.
+MIN_SAMPLES = 20
+TIMEOUT_QUANTILE = 0.99
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT = 1.0
+MAX_TIMEOUT = 10.0
+HEDGE_QUANTILE = 0.95
+# Hedges may add at most this share of extra upstream requests, with a small burst allowance.
+HEDGE_RATIO = 0.1
+HEDGE_BURST = 5.0
+# Room for every call the scheduler admits at once plus its hedge, so neither waits for a worker:
+# time queued here would count against neither the adaptive timeout nor the scheduler's max wait.
+HEDGE_WORKERS = 2 * sum(CONCURRENCY.values())
+
+
+class LatencyTracker:
+    """
+    Rolling window of upstream call latencies. The read timeout is derived from the
+    p99 (times a safety multiplier, clamped), and p95 is where a hedged request fires.
+    """
+    def __init__(self, name: str, window_size: int = WINDOW_SIZE, min_samples: int = MIN_SAMPLES,
+                 min_timeout: float = MIN_TIMEOUT, max_timeout: float = MAX_TIMEOUT):
+        self.name = name
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._samples: deque = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Records a call's latency. Timed-out calls should report the timeout they hit."""
+        with self._lock:
+            self._samples.append(seconds)
+        metrics_service.set_upstream_timeout(self.name, self.timeout())
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+    def timeout(self) -> float:
+        p99 = self.quantile(TIMEOUT_QUANTILE)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self) -> Optional[float]:
+        return self.quantile(HEDGE_QUANTILE)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class HedgeBudget:
+    """Token bucket that earns `ratio` tokens per primary request; each hedge spends one."""
+    def __init__(self, ratio: float = HEDGE_RATIO, burst: float = HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def on_request(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='hedge')
+
+def hedged_call(name: str, call: Callable[[], T], delay: Optional[float], budget: HedgeBudget,
+                take_token: Optional[Callable[[], float]] = None) -> T:
+    """
+    Runs call(); if it has not finished after `delay` seconds and the budget allows,
+    starts a duplicate and returns whichever succeeds first. The slower call is left
+    to finish on its own, bounded by its timeout. Without a delay, call() runs inline.
+    take_token (UpstreamScheduler.take_token) charges the duplicate to the upstream
+    rate limit: when it has no token to give right away, no hedge is sent.
+    """
+    budget.on_request()
+    if delay is None:
+        return call()
+    primary = _executor.submit(call)
+    done, _ = wait([primary], timeout=delay)
+    if done or not budget.try_acquire():
+        return primary.result()
+    if take_token is not None and take_token():
+        metrics_service.record_hedge(name, 'rate_limited')
+        return primary.result()
+    metrics_service.record_hedge(name, 'sent')
+    hedge = _executor.submit(call)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    metrics_service.record_hedge(name, 'won')
+                return future.result()
+            error = future.exception()
+    raise error
@@ -0,0 +1,296 @@
+import hmac
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+from backend.src.services import timing_service
+
+# Latency buckets in seconds, tuned for a proxy whose upstream normally answers in 100-500ms.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_HEADER = 'X-Rinkuji-Metrics'
+METRICS_PARAM = '_metrics'
+
+
+def is_authorized(supplied: Optional[str]) -> bool:
+    """
+    Metrics are not served unless RINKUJI_METRICS_TOKEN is set, and then only to
+    requests presenting that exact token.
+    """
+    token = os.environ.get('RINKUJI_METRICS_TOKEN')
+    if not token or not supplied:
+        return False
+    return hmac.compare_digest(token.encode(), supplied.encode())
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """The token of an 'Authorization: Bearer <token>' header, as Prometheus scrapers send it."""
+    scheme, _, token = (authorization or '').partition(' ')
+    return (token.strip() or None) if scheme.lower() == 'bearer' else None
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f'{self.name}{_format_labels(list(zip(self.label_names, key)))} {_format_value(value)}'
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, dict(state, counts=list(state['counts']))) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            pairs = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(pairs + [("le", _format_value(bound))])} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(pairs)} {_format_value(state["sum"])}')
+            lines.append(f'{self.name}_count{_format_labels(pairs)} {state["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, label_names)
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, label_names, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'rinkuji_http_requests_total', 'HTTP requests handled, by route and status.', ('route', 'method', 'status'))
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'rinkuji_http_request_duration_seconds', 'HTTP request latency by route.', ('route', 'method'))
+JISHO_REQUESTS = REGISTRY.counter(
+    'rinkuji_jisho_requests_total', 'Calls made to the Jisho API, by endpoint and outcome.', ('endpoint', 'outcome'))
+JISHO_REQUEST_DURATION = REGISTRY.histogram(
+    'rinkuji_jisho_request_duration_seconds', 'Latency of calls made to the Jisho API.', ('endpoint',))
+JISHO_ERROR_RATIO = REGISTRY.gauge(
+    'rinkuji_jisho_error_ratio', 'Share of Jisho API calls that failed since startup.', ('endpoint',))
+CACHE_LOOKUPS = REGISTRY.counter(
+    'rinkuji_cache_lookups_total', 'Cache lookups, by cache and result.', ('cache', 'result'))
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    'rinkuji_cache_hit_ratio', 'Share of cache lookups that were hits since startup.', ('cache',))
+GRAPH_BUILD_DURATION = REGISTRY.histogram(
+    'rinkuji_graph_build_duration_seconds', 'Time spent generating graph data.')
+GRAPH_NODES = REGISTRY.histogram(
+    'rinkuji_graph_nodes', 'Number of nodes in generated graphs.', buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000))
+SUGGESTIONS_DURATION = REGISTRY.histogram(
+    'rinkuji_suggestions_duration_seconds', 'Time spent matching local suggestions.')
+DATASET_ENTRIES = REGISTRY.gauge(
+    'rinkuji_dataset_entries', 'Number of entries loaded into local datasets and indexes.', ('dataset',))
+CIRCUIT_STATE = REGISTRY.gauge(
+    'rinkuji_circuit_state', 'Upstream circuit breaker state: 0 closed, 1 half-open, 2 open.', ('circuit',))
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    'rinkuji_circuit_rejections_total', 'Upstream calls refused because the circuit was open.', ('circuit',))
+JISHO_FALLBACKS = REGISTRY.counter(
+    'rinkuji_jisho_fallbacks_total', 'Jisho lookups answered without a fresh upstream result, by kind.', ('kind',))
+UPSTREAM_TIMEOUT = REGISTRY.gauge(
+    'rinkuji_upstream_timeout_seconds', 'Current adaptive read timeout for upstream calls.', ('upstream',))
+UPSTREAM_HEDGES = REGISTRY.counter(
+    'rinkuji_upstream_hedged_requests_total', 'Hedged duplicate upstream requests sent, won, or skipped for lack of a rate token.', ('upstream', 'result'))
+SCHEDULER_QUEUE_DEPTH = REGISTRY.gauge(
+    'rinkuji_scheduler_queue_depth', 'Upstream calls waiting for their turn, by priority class.', ('scheduler', 'priority'))
+SCHEDULER_WAIT = REGISTRY.histogram(
+    'rinkuji_scheduler_wait_seconds', 'Time upstream calls waited before being sent, by priority class.', ('scheduler', 'priority'))
+SCHEDULER_DROPS = REGISTRY.counter(
+    'rinkuji_scheduler_dropped_total', 'Upstream calls refused or shed by the scheduler, by priority class and reason.',
+    ('scheduler', 'priority', 'reason'))
+PREFETCHES = REGISTRY.counter(
+    'rinkuji_prefetch_total', 'Speculative Jisho prefetches, by result (issued, used, skipped, failed).', ('result',))
+PREFETCH_HIT_RATIO = REGISTRY.gauge(
+    'rinkuji_prefetch_hit_ratio', 'Share of issued prefetches that a later lookup used.')
+
+
+def observe_request(route: str, method: str, status: int, duration: float):
+    HTTP_REQUESTS.inc(route=route, method=method, status=status)
+    HTTP_REQUEST_DURATION.observe(duration, route=route, method=method)
+
+
+def observe_jisho_call(endpoint: str, duration: float, ok: bool):
+    JISHO_REQUESTS.inc(endpoint=endpoint, outcome='ok' if ok else 'error')
+    JISHO_REQUEST_DURATION.observe(duration, endpoint=endpoint)
+    errors = JISHO_REQUESTS.value(endpoint=endpoint, outcome='error')
+    total = errors + JISHO_REQUESTS.value(endpoint=endpoint, outcome='ok')
+    JISHO_ERROR_RATIO.set(errors / total, endpoint=endpoint)
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result='hit' if hit else 'miss')
+    hits = CACHE_LOOKUPS.value(cache=cache, result='hit')
+    total = hits + CACHE_LOOKUPS.value(cache=cache, result='miss')
+    CACHE_HIT_RATIO.set(hits / total, cache=cache)
+    timing_service.record_cache(cache, hit)
+
+
+def set_dataset_size(dataset: str, size: int):
+    DATASET_ENTRIES.set(size, dataset=dataset)
+
+
+_CIRCUIT_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+def set_circuit_state(circuit: str, state: str):
+    CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES[state], circuit=circuit)
+
+
+def record_circuit_rejection(circuit: str):
+    CIRCUIT_REJECTIONS.inc(circuit=circuit)
+
+
+def record_jisho_fallback(kind: str):
+    JISHO_FALLBACKS.inc(kind=kind)
+
+
+def set_upstream_timeout(upstream: str, seconds: float):
+    UPSTREAM_TIMEOUT.set(seconds, upstream=upstream)
+
+
+def record_hedge(upstream: str, result: str):
+    UPSTREAM_HEDGES.inc(upstream=upstream, result=result)
+
+
+def set_scheduler_queue_depth(scheduler: str, priority: str, depth: int):
+    SCHEDULER_QUEUE_DEPTH.set(depth, scheduler=scheduler, priority=priority)
+
+
+def observe_scheduler_wait(scheduler: str, priority: str, seconds: float):
+    SCHEDULER_WAIT.observe(seconds, scheduler=scheduler, priority=priority)
+
+
+def record_scheduler_drop(scheduler: str, priority: str, reason: str):
+    SCHEDULER_DROPS.inc(scheduler=scheduler, priority=priority, reason=reason)
+
+
+def record_prefetch(result: str):
+    PREFETCHES.inc(result=result)
+    issued = PREFETCHES.value(result='issued')
+    if issued:
+        PREFETCH_HIT_RATIO.set(PREFETCHES.value(result='used') / issued)
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from backend.src.services import metrics_service
+from backend.src.services.normalization_service import is_kanji
+from backend.src.services.projection_service import SLIM_VIEW, parse_projection
+from backend.src.services.scheduler_service import PREFETCH, TokenBucket
+
+# Kanji prefetched per graph response; the most frequent across the returned nodes go first.
+PREFETCH_PER_GRAPH = 8
+# Sustained prefetches per second across all graphs, with a burst for the first few graphs.
+PREFETCH_RATE = 1.0
+PREFETCH_BURST = 32.0
+# Prefetches waiting or running at once; beyond this new candidates are skipped.
+MAX_PENDING = 32
+WORKERS = 2
+# A prefetched kanji counts as used if it is looked up within this window (the Jisho cache TTL).
+HIT_WINDOW = 3600
+
+
+def kanji_in_graph(graph: Dict) -> List[str]:
+    """Kanji appearing in the graph's expandable nodes, most frequent first."""
+    counts = Counter(
+        ch for node in graph.get('nodes', [])
+        if node.get('type') == 'kanji'
+        for ch in str(node.get('text', '')) if is_kanji(ch)
+    )
+    return [ch for ch, _ in counts.most_common()]
+
+
+class Prefetcher:
+    """
+    Warms the Jisho cache for the kanji a user is likely to click next, in the
+    background and at prefetch priority, so the scheduler sheds it before any
+    interactive call. A per-graph cap and a token bucket bound the extra upstream
+    load; the share of prefetched kanji that are later looked up is reported as the
+    prefetch hit ratio to tune those bounds.
+    """
+    def __init__(self, jisho_service, per_graph: int = PREFETCH_PER_GRAPH, rate: float = PREFETCH_RATE,
+                 burst: float = PREFETCH_BURST, max_pending: int = MAX_PENDING, workers: int = WORKERS,
+                 hit_window: float = HIT_WINDOW):
+        self.jisho_service = jisho_service
+        self.per_graph = per_graph
+        self.max_pending = max_pending
+        self.hit_window = hit_window
+        self._budget = TokenBucket(rate, burst)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._slim = parse_projection(None, SLIM_VIEW) # the shape the frontend asks for on expansion
+        self._pending: Dict[str, object] = {}
+        self._issued: Dict[str, float] = {} # kanji -> when its prefetch finished
+        self._lock = threading.Lock()
+
+    def prefetch_graph(self, graph: Dict) -> List[str]:
+        """Schedules prefetches for the graph's kanji; returns the kanji scheduled."""
+        scheduled = []
+        for kanji in kanji_in_graph(graph):
+            if len(scheduled) >= self.per_graph:
+                break
+            if self.jisho_service.is_cached(kanji):
+                continue
+            with self._lock:
+                if kanji in self._pending:
+                    continue
+                if len(self._pending) >= self.max_pending or not self._budget.try_take(time.monotonic()):
+                    metrics_service.record_prefetch('skipped')
+                    break
+                self._pending[kanji] = self._executor.submit(self._prefetch, kanji)
+            scheduled.append(kanji)
+        return scheduled
+
+    def record_lookup(self, kanji: str):
+        """Called for interactive lookups; counts a hit if the kanji was prefetched."""
+        with self._lock:
+            issued_at = self._issued.pop(kanji, None)
+        if issued_at is not None and time.monotonic() - issued_at <= self.hit_window:
+            metrics_service.record_prefetch('used')
+
+    def join(self, timeout: Optional[float] = None):
+        """Waits for the prefetches currently scheduled (for tests and shutdown)."""
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures, timeout=timeout)
+
+    def _prefetch(self, kanji: str):
+        try:
+            _, status = self.jisho_service.search_by_kanji(kanji, self._slim, priority=PREFETCH)
+            if status != 200:
+                metrics_service.record_prefetch('failed')
+                return
+            now = time.monotonic()
+            with self._lock:
+                self._issued[kanji] = now
+                # Entries past the hit window can no longer count as hits.
+                for expired in [k for k, issued_at in self._issued.items() if now - issued_at > self.hit_window]:
+                    del self._issued[expired]
+            metrics_service.record_prefetch('issued')
+        finally:
+            with self._lock:
+                self._pending.pop(kanji, None)
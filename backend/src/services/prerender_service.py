@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Dict, List, Optional, Tuple
+from backend.src.api.http_cache import UPSTREAM_POLICY
+from backend.src.services import encoding_service
+from backend.src.services.prefetch_service import kanji_in_graph
+from backend.src.services.projection_service import SLIM_VIEW, parse_projection
+from backend.src.services.scheduler_service import PREFETCH
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+# Served as static files; the URL prefix is the directory name relative to the project root.
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'prerendered')
+DEFAULT_VERCEL_CONFIG = os.path.join(PROJECT_ROOT, 'vercel.json')
+URL_PREFIX = '/prerendered/'
+# Vercel caps the number of routes per deployment; stay well below it.
+DEFAULT_LIMIT = 50
+DEFAULT_MAX_EXPANSIONS = 200
+# Static copies get the lifetime the functions give the same routes.
+STATIC_CACHE_CONTROL = UPSTREAM_POLICY
+
+
+def _file_name(value: str, suffix: str = '') -> str:
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=8).hexdigest() + suffix + '.json'
+
+
+def _exact(value: str) -> str:
+    return f'^{re.escape(value)}$'
+
+
+# Parameters that change a graph response; requests carrying any of them go to the function.
+GRAPH_VARIANT_PARAMS = ('format', 'related', 'include')
+
+
+def graph_rules(word: str, destination: str) -> List[Dict]:
+    """Rewrites for the default (nodes, JSON, nothing extra) graph of a word on both graph routes."""
+    return [{
+        'source': source,
+        'has': [{'type': 'query', 'key': 'word', 'value': _exact(word)}],
+        'missing': [{'type': 'query', 'key': key} for key in GRAPH_VARIANT_PARAMS],
+        'destination': destination,
+    } for source in ('/api/graph', '/graph')]
+
+
+# Parameters that change a search_by_kanji response; requests carrying any of them go to the function.
+# 'delta' marks the frontend's exclusion POST: rewrites cannot match on method, so the URL must.
+EXPANSION_VARIANT_PARAMS = ('fields', 'limit', 'offset', 'seed', 'max_pages', 'delta')
+# A request with a body (any POST the browser sends carries a Content-Type) also goes to the function.
+EXPANSION_VARIANT_HEADERS = ('content-type',)
+
+
+def expansion_rules(kanji: str, destination: str) -> List[Dict]:
+    """Rewrite for the slim search_by_kanji response the frontend requests on expansion."""
+    return [{
+        'source': '/search_by_kanji',
+        'has': [
+            {'type': 'query', 'key': 'kanji', 'value': _exact(kanji)},
+            {'type': 'query', 'key': 'view', 'value': _exact(SLIM_VIEW)},
+        ],
+        'missing': [{'type': 'query', 'key': key} for key in EXPANSION_VARIANT_PARAMS] +
+                   [{'type': 'header', 'key': key} for key in EXPANSION_VARIANT_HEADERS],
+        'destination': destination,
+    }]
+
+
+def update_vercel_config(path: str, rules: List[Dict]):
+    """
+    Replaces the generated rewrites in vercel.json with `rules`, ahead of the function
+    rewrites so matching requests never reach Python, and adds the headers the
+    static copies need (CORS and the API's cache lifetime).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    rewrites = [r for r in config.get('rewrites', []) if not r.get('destination', '').startswith(URL_PREFIX)]
+    config['rewrites'] = rules + rewrites
+    headers = [h for h in config.get('headers', []) if not h.get('source', '').startswith(URL_PREFIX)]
+    headers.append({
+        'source': URL_PREFIX + '(.*)',
+        'headers': [
+            {'key': 'Access-Control-Allow-Origin', 'value': '*'},
+            {'key': 'Cache-Control', 'value': STATIC_CACHE_CONTROL},
+        ],
+    })
+    config['headers'] = headers
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def prerender(data_loader, graph_service, jisho_service, words: List[str], output_dir: str = DEFAULT_OUTPUT_DIR,
+              vercel_config: Optional[str] = DEFAULT_VERCEL_CONFIG, limit: int = DEFAULT_LIMIT,
+              max_expansions: int = DEFAULT_MAX_EXPANSIONS) -> Tuple[int, int]:
+    """
+    Renders the graph of the first `limit` words (most requested first) and the slim
+    search_by_kanji response for up to `max_expansions` kanji in those graphs, the
+    ones shared by most graphs first. Only complete results are written, so anything
+    that failed upstream stays with the functions. Returns (graphs, expansions) written.
+    """
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(os.path.join(output_dir, 'graph'))
+    os.makedirs(os.path.join(output_dir, 'search_by_kanji'))
+    # Resolved the way the graph routes resolve ?word=.
+    words_map = {word.text: word for word in data_loader.load_data()}
+
+    rules: List[Dict] = []
+    kanji_counts: Dict[str, int] = {}
+    graphs = 0
+    for text in list(dict.fromkeys(words))[:limit]:
+        if text not in words_map:
+            continue
+        graph, ttl = graph_service.build_cacheable([words_map[text]])
+        if ttl is None:
+            continue
+        name = _file_name(text)
+        with open(os.path.join(output_dir, 'graph', name), 'wb') as f:
+            f.write(encoding_service.encode_json(graph))
+        rules.extend(graph_rules(text, f'{URL_PREFIX}graph/{name}'))
+        graphs += 1
+        for kanji in kanji_in_graph(graph):
+            kanji_counts[kanji] = kanji_counts.get(kanji, 0) + 1
+
+    slim = parse_projection(None, SLIM_VIEW)
+    expansions = 0
+    for kanji in sorted(kanji_counts, key=kanji_counts.get, reverse=True)[:max_expansions]:
+        body, status = jisho_service.search_by_kanji(kanji, slim, priority=PREFETCH)
+        if status != 200:
+            continue
+        name = _file_name(kanji, '.slim')
+        with open(os.path.join(output_dir, 'search_by_kanji', name), 'wb') as f:
+            f.write(encoding_service.encode_json(body))
+        rules.extend(expansion_rules(kanji, f'{URL_PREFIX}search_by_kanji/{name}'))
+        expansions += 1
+
+    if vercel_config is not None:
+        update_vercel_config(vercel_config, rules)
+    return graphs, expansions
@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, List, Optional, Sequence
+from backend.src.models.kanji import Kanji
+from backend.src.models.word import Word
+from backend.src.services.normalization_service import HIRAGANA, KATAKANA, fold_kana, normalize, script_of
+
+# Dictionary notation inside readings: okurigana dots (かた.る) and affix dashes (-び).
+READING_MARKS = str.maketrans('', '', '.-')
+
+
+def fold_reading(reading: str) -> str:
+    """A reading in the form the index uses: normalized hiragana, without okurigana dots or affix dashes."""
+    return fold_kana(normalize(reading).translate(READING_MARKS))
+
+
+def is_kana(text: str) -> bool:
+    """Whether text is a (possibly marked-up) reading: hiragana, katakana and the long vowel mark only."""
+    folded = fold_reading(text)
+    return bool(folded) and all(script_of(ch) in (HIRAGANA, KATAKANA) for ch in folded)
+
+
+class ReadingIndex:
+    """
+    Maps folded readings to the dataset kanji and words read that way. A kun reading
+    with okurigana is indexed both whole (かたる) and by its stem (かた), since either
+    is what someone typing the kanji's reading would enter.
+    """
+    def __init__(self, words: Sequence[Word]):
+        self._kanji: Dict[str, Dict[str, Kanji]] = {}
+        self._words: Dict[str, List[Word]] = {}
+        for word in words:
+            if word.reading and is_kana(word.reading):
+                self._words.setdefault(fold_reading(word.reading), []).append(word)
+            for kanji in word.kanji_components:
+                for reading in list(kanji.on_reading) + list(kanji.kun_reading):
+                    forms = {fold_reading(reading)}
+                    if '.' in reading:
+                        forms.add(fold_reading(reading.split('.', 1)[0]))
+                    for form in forms:
+                        if form:
+                            self._kanji.setdefault(form, {}).setdefault(kanji.character, kanji)
+
+    def kanji(self, reading: str) -> List[Kanji]:
+        return list(self._kanji.get(fold_reading(reading), {}).values())
+
+    def words(self, reading: str) -> List[Word]:
+        return list(self._words.get(fold_reading(reading), []))
+
+
+class ReadingService:
+    """Answers kana lookups from the dataset's readings; rebuilt when the dataset version changes."""
+    def __init__(self, data_loader):
+        self.data_loader = data_loader
+        self._index: Optional[ReadingIndex] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def index(self) -> ReadingIndex:
+        version = self.data_loader.dataset_version()
+        with self._lock:
+            if self._index is None or self._version != version:
+                self._index = ReadingIndex(self.data_loader.load_data())
+                self._version = version
+            return self._index
+
+    def words_for_reading(self, reading: str) -> List[Word]:
+        """Dataset words read as `reading`; empty for anything that is not kana."""
+        if not is_kana(reading):
+            return []
+        return self.index().words(reading)
+
+    def lookup(self, reading: str) -> Dict:
+        """The kanji having `reading` as an on or kun reading, and the words read that way."""
+        index = self.index()
+        return {
+            'reading': fold_reading(reading),
+            'kanji': [kanji.to_dict() for kanji in index.kanji(reading)],
+            'words': [{'id': w.id, 'text': w.text, 'reading': w.reading, 'meaning': w.meaning}
+                      for w in index.words(reading)],
+        }
@@ -0,0 +1,170 @@
+import gzip
+import json
+import math
+import os
+import threading
+from collections import Counter
+from itertools import combinations
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from backend.src.models.word import Word
+from backend.src.services import metrics_service, timing_service
+
+RELATED_VERSION = 1
+DEFAULT_RELATED_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'related_kanji.json.gz'))
+RELATED_PATH_ENV = 'RINKUJI_RELATED_KANJI'
+# Neighbours kept per kanji, and the most /api/related_kanji returns.
+DEFAULT_TOP_K = 20
+# Most related kanji /api/graph adds per component kanji with 'related'.
+MAX_GRAPH_RELATED = 5
+
+# kanji -> [(neighbour, score, words containing both)], best first
+Neighbours = Mapping[str, List[Tuple[str, float, int]]]
+
+
+class RelatedIndex(NamedTuple):
+    """Top neighbours per kanji, with the dataset version they were computed from."""
+    dataset_version: Optional[str]
+    neighbours: Neighbours
+
+
+def related_path() -> str:
+    return os.environ.get(RELATED_PATH_ENV) or DEFAULT_RELATED_PATH
+
+
+def _npmi(pair: int, a: int, b: int, total: int) -> float:
+    """Normalized PMI of two kanji over `total` words: 1 when they always appear together, 0 when independent."""
+    if pair == total:
+        return 1.0
+    return math.log(pair * total / (a * b)) / -math.log(pair / total)
+
+
+def build_related(words: Sequence[Word], top_k: int = DEFAULT_TOP_K, min_count: int = 1) -> Dict[str, List[Tuple[str, float, int]]]:
+    """
+    Counts, for every pair of kanji, the words containing both, and keeps each kanji's
+    top_k neighbours by normalized PMI. Pairs seen in fewer than min_count words or
+    not positively associated are dropped. Every dataset kanji gets an entry.
+    """
+    codes: Dict[str, int] = {}
+    per_word = []
+    for word in words:
+        kanji = sorted({codes.setdefault(k.character, len(codes)) for k in word.kanji_components})
+        if kanji:
+            per_word.append(kanji)
+    characters = list(codes)
+    size = len(characters)
+    # Pairs are packed into one int, so the counting stays inside Counter's C loop.
+    singles = Counter(code for kanji in per_word for code in kanji)
+    pairs = Counter(a * size + b for kanji in per_word for a, b in combinations(kanji, 2))
+
+    candidates: Dict[int, List[Tuple[float, int, int]]] = {code: [] for code in range(size)}
+    total = len(per_word)
+    for packed, count in pairs.items():
+        if count < min_count:
+            continue
+        a, b = divmod(packed, size)
+        score = _npmi(count, singles[a], singles[b], total)
+        if score <= 0:
+            continue
+        candidates[a].append((score, count, b))
+        candidates[b].append((score, count, a))
+
+    related = {}
+    for code, neighbours in candidates.items():
+        neighbours.sort(key=lambda n: (-n[0], -n[1], characters[n[2]]))
+        related[characters[code]] = [(characters[b], round(score, 4), count) for score, count, b in neighbours[:top_k]]
+    return related
+
+
+def load_related(path: Optional[str] = None) -> Optional[RelatedIndex]:
+    """Loads neighbours written by `flask build-related-kanji`; None when there is no usable file."""
+    path = path or related_path()
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable related kanji file {path}: {e}")
+        return None
+    if data.get('version') != RELATED_VERSION:
+        return None
+    return RelatedIndex(data.get('dataset_version'), MappingProxyType({
+        kanji: [tuple(n) for n in neighbours] for kanji, neighbours in data.get('related', {}).items()
+    }))
+
+
+def write_related(path: str, dataset_version: str, related: Neighbours):
+    """Writes the neighbours as compact gzipped JSON, replacing the file atomically."""
+    payload = {'version': RELATED_VERSION, 'dataset_version': dataset_version, 'related': dict(sorted(related.items()))}
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=9) as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def parse_limit(value: Optional[str]) -> int:
+    """The 'limit' query parameter of /api/related_kanji: neighbours returned, all that are kept when absent."""
+    if value is None:
+        return DEFAULT_TOP_K
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= DEFAULT_TOP_K:
+        raise ValueError(f"'limit' must be between 1 and {DEFAULT_TOP_K}.")
+    return limit
+
+
+def parse_related(value: Optional[str]) -> int:
+    """The 'related' query parameter of /api/graph: related kanji added per component kanji, 0 when absent."""
+    if value is None:
+        return 0
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if not 0 <= count <= MAX_GRAPH_RELATED:
+        raise ValueError(f"'related' must be between 0 and {MAX_GRAPH_RELATED}.")
+    return count
+
+
+class RelatedKanjiService:
+    """
+    Answers "which kanji appear in words with this one" from the co-occurrence index.
+    The file written by `flask build-related-kanji` is used while its dataset version
+    matches; otherwise the index is built from data.json once and kept in memory.
+    """
+    def __init__(self, data_loader, precomputed: Optional[RelatedIndex] = None, top_k: int = DEFAULT_TOP_K):
+        self.data_loader = data_loader
+        self.precomputed = precomputed
+        self.top_k = top_k
+        self._neighbours: Optional[Neighbours] = None
+        self._meanings: Dict[str, str] = {}
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def index(self) -> Neighbours:
+        version = self.data_loader.dataset_version()
+        with self._lock:
+            if self._neighbours is None or self._version != version:
+                words = self.data_loader.load_data()
+                hit = self.precomputed is not None and self.precomputed.dataset_version == version
+                if hit:
+                    self._neighbours = self.precomputed.neighbours
+                else:
+                    with timing_service.phase('related'):
+                        self._neighbours = build_related(words, self.top_k)
+                metrics_service.record_cache_lookup('related_precomputed', hit=hit)
+                self._meanings = {k.character: k.meaning for w in words for k in w.kanji_components}
+                self._version = version
+            return self._neighbours
+
+    def related(self, kanji: str, limit: int = DEFAULT_TOP_K) -> Optional[List[Dict]]:
+        """The kanji most associated with `kanji`, best first; None when it is not in the dataset."""
+        neighbours = self.index().get(kanji)
+        if neighbours is None:
+            return None
+        return [{'kanji': other, 'meaning': self._meanings.get(other, ''), 'score': score, 'count': count}
+                for other, score, count in neighbours[:limit]]
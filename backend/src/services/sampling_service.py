@@ -0,0 +1,63 @@
+import random
+from typing import List, NamedTuple, Optional, Sequence, TypeVar
+
+# Items returned when 'offset' or 'seed' is given without 'limit', and the most one request may ask for.
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+T = TypeVar('T')
+
+class Page(NamedTuple):
+    """A window of a result list, optionally over a seeded shuffle of it. Hashable, so it can key caches."""
+    limit: int = DEFAULT_LIMIT
+    offset: int = 0
+    seed: Optional[int] = None
+
+
+def _non_negative(name: str, value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be a non-negative integer.")
+    if number < 0:
+        raise ValueError(f"'{name}' must be a non-negative integer.")
+    return number
+
+
+def parse_page(limit: Optional[str], offset: Optional[str], seed: Optional[str]) -> Optional[Page]:
+    """
+    Builds a Page from the 'limit', 'offset' and 'seed' query parameters.
+    Returns None when none is given; raises ValueError for an invalid one.
+    """
+    if limit is None and offset is None and seed is None:
+        return None
+    page = Page(
+        limit=DEFAULT_LIMIT if limit is None else _non_negative('limit', limit),
+        offset=0 if offset is None else _non_negative('offset', offset),
+        seed=None if seed is None else _non_negative('seed', seed),
+    )
+    if not 1 <= page.limit <= MAX_LIMIT:
+        raise ValueError(f"'limit' must be between 1 and {MAX_LIMIT}.")
+    return page
+
+
+def parse_max_pages(value: Optional[str]) -> int:
+    """The 'max_pages' query parameter: upstream pages to read, 1 (the first page only) when absent."""
+    if value is None:
+        return 1
+    pages = _non_negative('max_pages', value)
+    if pages < 1:
+        raise ValueError("'max_pages' must be at least 1.")
+    return pages
+
+
+def select(items: Sequence[T], page: Page, salt: str) -> List[T]:
+    """
+    The page's window of items. With a seed, the window is taken from a shuffle that
+    depends only on the seed and `salt` (e.g. the kanji), so a repeated request, on
+    any instance, gets the same sample and successive offsets never repeat an item.
+    """
+    if page.seed is not None:
+        items = list(items)
+        random.Random(f'{salt}:{page.seed}').shuffle(items)
+    return list(items[page.offset:page.offset + page.limit])
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+from backend.src.services import metrics_service, timing_service
+
+INTERACTIVE = 'interactive' # a user waiting on this exact lookup
+EXPANSION = 'expansion' # fan-out while building a graph
+PREFETCH = 'prefetch' # speculative and warm-up work nobody is waiting for
+# Highest priority first.
+PRIORITIES = (INTERACTIVE, EXPANSION, PREFETCH)
+
+# Sustained upstream requests per second, and how many may go out back to back.
+RATE = 10.0
+BURST = 20.0
+# Calls of each class allowed upstream at once.
+CONCURRENCY = {INTERACTIVE: 8, EXPANSION: 4, PREFETCH: 2}
+# Waiting calls allowed per class, and across all classes before lower classes are shed.
+QUEUE_SIZES = {INTERACTIVE: 32, EXPANSION: 64, PREFETCH: 64}
+MAX_QUEUED = 96
+# Longest a call waits for its turn before giving up.
+MAX_WAIT = {INTERACTIVE: 5.0, EXPANSION: 10.0, PREFETCH: 30.0}
+
+
+class QueueRejected(Exception):
+    """Raised when a call is refused or shed instead of being sent upstream."""
+    def __init__(self, priority: str, reason: str):
+        super().__init__(f"{priority} call dropped ({reason})")
+        self.priority = priority
+        self.reason = reason
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, now: float) -> bool:
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self, now: float) -> float:
+        self._refill(now)
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class _Waiter:
+    __slots__ = ('priority', 'rejected')
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.rejected: Optional[str] = None
+
+
+class UpstreamScheduler:
+    """
+    Admits upstream calls in priority order under a token-bucket rate limit and
+    per-class concurrency limits. Callers wait in bounded per-class queues; when the
+    queues are saturated the newest waiter of the lowest busy class is shed to make
+    room for higher-priority work. Queue depth, wait time and drops are reported to
+    the metrics registry under the scheduler's name.
+    """
+    def __init__(self, name: str, rate: float = RATE, burst: float = BURST,
+                 concurrency: Optional[Dict[str, int]] = None, queue_sizes: Optional[Dict[str, int]] = None,
+                 max_queued: int = MAX_QUEUED, max_wait: Optional[Dict[str, float]] = None):
+        self.name = name
+        self.concurrency = {**CONCURRENCY, **(concurrency or {})}
+        self.queue_sizes = {**QUEUE_SIZES, **(queue_sizes or {})}
+        self.max_queued = max_queued
+        self.max_wait = {**MAX_WAIT, **(max_wait or {})}
+        self._bucket = TokenBucket(rate, burst)
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._in_flight = {priority: 0 for priority in PRIORITIES}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, priority: str = INTERACTIVE):
+        """Blocks until the call may go upstream; raises QueueRejected if it may not."""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def acquire(self, priority: str):
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority '{priority}'. Supported priorities: {', '.join(PRIORITIES)}.")
+        start = time.monotonic()
+        deadline = start + self.max_wait[priority]
+        waiter = _Waiter(priority)
+        with timing_service.phase('queue'), self._cond:
+            self._enqueue(waiter)
+            while True:
+                now = time.monotonic()
+                if waiter.rejected is None and now >= deadline:
+                    self._queues[priority].remove(waiter)
+                    waiter.rejected = 'timeout'
+                if waiter.rejected is not None:
+                    self._report_depth(priority)
+                    metrics_service.record_scheduler_drop(self.name, priority, waiter.rejected)
+                    self._cond.notify_all()
+                    raise QueueRejected(priority, waiter.rejected)
+                wait_for = deadline - now
+                if self._next_waiter() is waiter:
+                    if self._bucket.try_take(now):
+                        self._queues[priority].popleft()
+                        self._in_flight[priority] += 1
+                        self._report_depth(priority)
+                        # Let the next waiter re-evaluate now rather than on its own timer.
+                        self._cond.notify_all()
+                        break
+                    wait_for = min(wait_for, self._bucket.time_until_token(now))
+                self._cond.wait(wait_for)
+        metrics_service.observe_scheduler_wait(self.name, priority, time.monotonic() - start)
+
+    def take_token(self) -> float:
+        """
+        Takes a rate token for a call not admitted through slot() (a hedge, or a call
+        of the asyncio client), so it still counts against this scheduler's limit. Returns 0.0 when one was taken, otherwise the
+        seconds until the next is due; the caller waits and tries again.
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self._bucket.try_take(now):
+                return 0.0
+            return self._bucket.time_until_token(now)
+
+    def release(self, priority: str):
+        with self._cond:
+            self._in_flight[priority] -= 1
+            self._cond.notify_all()
+
+    def depth(self, priority: Optional[str] = None) -> int:
+        with self._cond:
+            if priority is not None:
+                return len(self._queues[priority])
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _enqueue(self, waiter: _Waiter):
+        queue = self._queues[waiter.priority]
+        if len(queue) >= self.queue_sizes[waiter.priority]:
+            waiter.rejected = 'queue_full'
+            return
+        if sum(len(q) for q in self._queues.values()) >= self.max_queued:
+            victim = self._shed_below(waiter.priority)
+            if victim is None:
+                waiter.rejected = 'queue_full'
+                return
+        queue.append(waiter)
+        self._report_depth(waiter.priority)
+
+    def _shed_below(self, priority: str) -> Optional[_Waiter]:
+        """Rejects the newest waiter of the lowest class below `priority` that has any."""
+        for lower in reversed(PRIORITIES[PRIORITIES.index(priority) + 1:]):
+            if self._queues[lower]:
+                victim = self._queues[lower].pop()
+                victim.rejected = 'shed'
+                self._cond.notify_all()
+                return victim
+        return None
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """The head of the highest-priority queue whose class has a free concurrency slot."""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            if queue and self._in_flight[priority] < self.concurrency[priority]:
+                return queue[0]
+        return None
+
+    def _report_depth(self, priority: str):
+        metrics_service.set_scheduler_queue_depth(self.name, priority, len(self._queues[priority]))
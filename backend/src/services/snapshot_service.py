@@ -0,0 +1,99 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from backend.src.services import metrics_service, normalization_service
+from backend.src.services.scheduler_service import PREFETCH
+
+SNAPSHOT_VERSION = 1
+# Bundled next to data.json so the Flask app and the Vercel functions can both load it.
+DEFAULT_SNAPSHOT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'jisho_snapshot.json.gz'))
+SNAPSHOT_PATH_ENV = 'RINKUJI_JISHO_SNAPSHOT'
+# Progress is written to the snapshot file every this many new results.
+CHECKPOINT_EVERY = 50
+
+SnapshotKey = Tuple[str, str]
+
+
+def snapshot_path() -> str:
+    return os.environ.get(SNAPSHOT_PATH_ENV) or DEFAULT_SNAPSHOT_PATH
+
+
+def load_snapshot(path: Optional[str] = None) -> Mapping[SnapshotKey, dict]:
+    """
+    Loads precomputed Jisho results keyed like JishoService's cache, e.g.
+    ('search_by_kanji', '日'). Returns a read-only mapping, empty when there is no
+    usable snapshot.
+    """
+    path = path or snapshot_path()
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return MappingProxyType({})
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable Jisho snapshot {path}: {e}")
+        return MappingProxyType({})
+    if data.get('version') != SNAPSHOT_VERSION:
+        print(f"Ignoring Jisho snapshot {path} with version {data.get('version')}")
+        return MappingProxyType({})
+    entries = {
+        (endpoint, query): result
+        for endpoint, results in data.get('entries', {}).items()
+        for query, result in results.items()
+    }
+    metrics_service.set_dataset_size('jisho_snapshot', len(entries))
+    return MappingProxyType(entries)
+
+
+def write_snapshot(path: str, entries: Mapping[SnapshotKey, dict]):
+    """Writes entries as compact gzipped JSON, replacing the file atomically."""
+    grouped: Dict[str, Dict[str, dict]] = {}
+    for (endpoint, query), result in sorted(entries.items()):
+        grouped.setdefault(endpoint, {})[query] = result
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=9) as f:
+        json.dump({'version': SNAPSHOT_VERSION, 'entries': grouped}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def kanji_in_text(text: str) -> List[str]:
+    """Unique kanji in text, in order of first appearance."""
+    return normalization_service.kanji_in(text)
+
+
+def warm_kanji(jisho_service, kanji: List[str], path: str, concurrency: int = 2, resume: bool = True,
+               checkpoint_every: int = CHECKPOINT_EVERY,
+               progress: Optional[Callable[[str, int], None]] = None) -> Tuple[int, int, int]:
+    """
+    Looks up search_by_kanji for each kanji at prefetch priority, `concurrency` at a
+    time, and writes the results to the snapshot at `path`. With resume, kanji already
+    in an existing snapshot are skipped, and progress is checkpointed so an
+    interrupted run can pick up where it stopped. Failed lookups are left out.
+    Returns (fetched, skipped, failed).
+    """
+    entries = dict(load_snapshot(path)) if resume else {}
+    pending = [k for k in kanji if ('search_by_kanji', k) not in entries]
+    skipped = len(kanji) - len(pending)
+    fetched = failed = 0
+
+    def lookup(character):
+        return character, jisho_service.search_by_kanji(character, priority=PREFETCH)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for future in as_completed([executor.submit(lookup, k) for k in pending]):
+            character, (result, status) = future.result()
+            if status == 200:
+                entries[('search_by_kanji', character)] = result
+                fetched += 1
+                if fetched % checkpoint_every == 0:
+                    write_snapshot(path, entries)
+            else:
+                failed += 1
+            if progress is not None:
+                progress(character, status)
+    write_snapshot(path, entries)
+    return fetched, skipped, failed
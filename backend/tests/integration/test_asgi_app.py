@@ -0,0 +1,129 @@
+import asyncio
+import gzip
+import json
+import pytest # type: ignore
+from backend.src.api.asgi import AsyncApp
+from backend.src.services.async_jisho_service import AsyncJishoService
+from backend.src.services.scheduler_service import UpstreamScheduler
+
+class FakeTransport:
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    async def __call__(self, url, timeout):
+        self.calls.append(url)
+        keyword = url.split('keyword=')[1]
+        return {"data": [{"slug": f"{keyword}{i}", "senses": [{"english_definitions": ["day"]}]} for i in range(40)]}
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
+
+@pytest.fixture
+def asgi_app(app, transport):
+    return AsyncApp(app, jisho=AsyncJishoService(app.jisho_service, transport=transport,
+                                                  scheduler=UpstreamScheduler('jisho_asgi_test', rate=1000.0, burst=1000.0)))
+
+def call(asgi_app, path, query='', method='GET', headers=(), body=b''):
+    """Runs one request through the ASGI app; returns (status, headers, body)."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode('utf-8'),
+             'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]}
+    asyncio.run(asgi_app(scope, receive, send))
+    response_headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in sent[0]['headers']}
+    return sent[0]['status'], response_headers, b''.join(m.get('body', b'') for m in sent[1:])
+
+def test_search_words_is_served_on_the_loop_with_cache_headers(asgi_app, transport):
+    status, headers, body = call(asgi_app, '/search_words', 'query=%E6%97%A5')
+    assert status == 200
+    assert json.loads(body)["data"][0]["slug"] == "日0"
+    assert headers["cache-control"].startswith("public")
+    assert headers["etag"].startswith('"')
+    assert "jisho" in headers["server-timing"]
+    assert len(transport.calls) == 1
+
+def test_conditional_request_gets_304(asgi_app):
+    etag = call(asgi_app, '/search_by_kanji', 'kanji=%E6%97%A5')[1]["etag"]
+    status, _, body = call(asgi_app, '/search_by_kanji', 'kanji=%E6%97%A5', headers=[("If-None-Match", etag)])
+    assert status == 304
+    assert body == b''
+
+def test_large_responses_are_compressed(asgi_app):
+    status, headers, body = call(asgi_app, '/search_words', 'query=%E6%97%A5', headers=[("Accept-Encoding", "gzip")])
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["etag"].startswith('W/"')
+    assert len(json.loads(gzip.decompress(body))["data"]) == 40
+
+def test_errors_are_json_and_not_cached(asgi_app, transport):
+    status, headers, body = call(asgi_app, '/search_by_kanji', 'kanji=')
+    assert status == 400
+    assert headers["cache-control"] == "no-store"
+    assert "error" in json.loads(body)
+    assert transport.calls == []
+
+def test_post_excludes_known_slugs(asgi_app):
+    status, _, body = call(asgi_app, '/search_by_kanji', 'kanji=%E6%97%A5', method='POST',
+                           body=json.dumps({"exclude": ["日0", "日1"]}).encode('utf-8'))
+    assert status == 200
+    slugs = [item["slug"] for item in json.loads(body)["data"]]
+    assert "日0" not in slugs and "日2" in slugs
+
+def test_graph_fans_out_through_the_async_client(asgi_app, transport):
+    status, _, body = call(asgi_app, '/api/graph', 'word=%E6%97%A5%E6%9C%AC%E8%AA%9E')
+    assert status == 200
+    graph = json.loads(body)
+    assert any(node["type"] == "word" and node["text"] == "日本語" for node in graph["nodes"])
+    assert len(transport.calls) == 3
+    assert call(asgi_app, '/graph', 'word=unknown')[0] == 404
+
+def test_suggestions_are_answered_locally(asgi_app, transport):
+    status, _, body = call(asgi_app, '/api/suggestions', 'q=%E6%97%A5')
+    assert status == 200
+    assert "日本語" in json.loads(body)
+    assert call(asgi_app, '/api/suggestions')[0] == 400
+    assert transport.calls == []
+
+def test_other_routes_are_served_by_flask(asgi_app, transport):
+    status, headers, body = call(asgi_app, '/kanji_details', 'character=%E6%97%A5')
+    assert status == 200
+    assert json.loads(body)["character"] == "日"
+    assert headers["cache-control"].startswith("public")
+    assert call(asgi_app, '/kanji_details')[0] == 400
+    assert transport.calls == []
+
+def test_lifespan_shutdown_closes_the_transport(asgi_app, transport):
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message['type'])
+
+    asyncio.run(asgi_app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    assert transport.closed
+
+def test_profiling_token_is_honoured_on_native_routes(asgi_app, monkeypatch, tmp_path):
+    monkeypatch.setenv("RINKUJI_PROFILE_TOKEN", "secret")
+    monkeypatch.setenv("RINKUJI_PROFILE_DIR", str(tmp_path))
+    status, headers, _ = call(asgi_app, '/api/suggestions', 'q=%E6%97%A5&_profile=secret')
+    assert status == 200
+    assert headers["x-profile-file"].startswith(str(tmp_path))
+
+    _, headers, _ = call(asgi_app, '/api/suggestions', 'q=%E6%97%A5&_profile=wrong')
+    assert "x-profile-file" not in headers
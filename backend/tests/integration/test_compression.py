@@ -0,0 +1,32 @@
+import gzip
+import json
+import pytest # type: ignore
+
+LARGE_RESULT = {"data": [{"slug": f"日{i}", "senses": [{"english_definitions": ["day"]}]} for i in range(100)]}
+
+@pytest.fixture
+def large_kanji_result(app):
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: (LARGE_RESULT, 200)
+
+def test_large_json_is_gzipped_when_accepted(client, large_kanji_result):
+    response = client.get("/search_by_kanji?kanji=日", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"].startswith('W/"')
+    assert json.loads(gzip.decompress(response.get_data())) == LARGE_RESULT
+
+def test_identity_when_encoding_not_accepted(client, large_kanji_result):
+    response = client.get("/search_by_kanji?kanji=日")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == LARGE_RESULT
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/kanji_details?character=日", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+def test_weak_etag_from_compressed_response_revalidates(client, large_kanji_result):
+    etag = client.get("/search_by_kanji?kanji=日", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    response = client.get("/search_by_kanji?kanji=日", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
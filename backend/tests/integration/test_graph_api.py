@@ -45,3 +45,149 @@ def test_graph_api_consolidates_similar_kanjis(client):
     kanji_node = [node for node in data["nodes"] if node["id"] == "日"][0]
     assert kanji_node is not None
     assert len(kanji_node["meanings"]) > 1
+
+def test_search_by_kanji_rejects_unknown_view(client):
+    response = client.get("/search_by_kanji?kanji=日&view=full")
+    assert response.status_code == 400
+    assert "Unknown view" in response.get_json()["error"]
+
+def test_graph_api_columnar_format(client, app):
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"data": [{"slug": kanji + "曜"}]}, 200)
+    response = client.get("/api/graph?word=日本語&format=columnar")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["format"] == "columnar"
+    assert data["nodes"]["id"][0] == 1
+    assert data["node_types"] == ["word", "kanji"]
+    assert data["edges"]["source"] == [0, 0, 0]
+    assert data["edges"]["target"] == [1, 2, 3]
+    assert "Accept" in response.headers["Vary"]
+
+def test_graph_api_rejects_unknown_format(client):
+    response = client.get("/graph?word=日本語&format=xml")
+    assert response.status_code == 400
+    assert "Unknown format" in response.get_json()["error"]
+
+def test_graph_response_prefetches_kanji_of_returned_nodes(client, app):
+    looked_up = []
+    def fake_search(kanji, projection=None, priority="interactive"):
+        looked_up.append((kanji, priority))
+        return {"data": [{"slug": "日曜"}]}, 200
+    app.jisho_service.search_by_kanji = fake_search
+    response = client.get("/api/graph?word=日本語")
+    assert response.status_code == 200
+    app.prefetcher.join(2)
+    assert ("曜", "prefetch") in looked_up
+
+def test_search_by_kanji_post_leaves_out_known_slugs(client, app):
+    from backend.src.services.exclusion_service import build_bloom
+    result = {"data": [{"slug": "日曜"}, {"slug": "日本"}, {"slug": "毎日"}]}
+    app.jisho_service._fetch_kanji = lambda kanji, *args: result
+    response = client.post("/search_by_kanji?kanji=日&view=slim", data='{"exclude": ["日本"]}',
+                           content_type="text/plain")
+    assert response.status_code == 200
+    assert [item["slug"] for item in response.get_json()["data"]] == ["日曜", "毎日"]
+    assert "Cache-Control" not in response.headers
+    bloom = {"bits": build_bloom(["日曜", "毎日"]).to_base64(), "hashes": 7}
+    response = client.post("/search_by_kanji?kanji=日", json={"bloom": bloom})
+    assert [item["slug"] for item in response.get_json()["data"]] == ["日本"]
+    assert len(client.get("/search_by_kanji?kanji=日").get_json()["data"]) == 3
+
+def test_search_by_kanji_post_rejects_malformed_exclusion(client):
+    response = client.post("/search_by_kanji?kanji=日", data="not json")
+    assert response.status_code == 400
+    assert "JSON" in response.get_json()["error"]
+
+def _path_words():
+    from backend.src.models.word import Word
+    texts = ["日本", "本気", "気分", "猫"]
+    return [Word.from_dict({"id": n, "text": text, "reading": "", "meaning": text,
+                            "kanji_components": [{"id": ord(ch), "character": ch, "meaning": ch} for ch in text]})
+            for n, text in enumerate(texts, start=1)]
+
+def test_path_api_returns_path_graph(client, app):
+    words = _path_words()
+    app.data_loader.load_data = lambda: words
+    app.data_loader.version = "path-test"
+    response = client.get('/api/path?from=日本&to=気分')
+    assert response.status_code == 200
+    assert [node["text"] for node in response.json["nodes"]] == ["日本", "本", "本気", "気", "気分"]
+    assert len(response.json["edges"]) == 4
+    columnar = client.get('/api/path?from=日本&to=気分&format=columnar')
+    assert columnar.json["nodes"]["text"] == ["日本", "本", "本気", "気", "気分"]
+
+def test_path_api_errors(client, app):
+    words = _path_words()
+    app.data_loader.load_data = lambda: words
+    app.data_loader.version = "path-test"
+    assert client.get('/api/path?from=日本').status_code == 400
+    assert client.get('/api/path?from=日本&to=気分&format=xml').status_code == 400
+    missing = client.get('/api/path?from=日本&to=未知')
+    assert missing.status_code == 404
+    assert "未知" in missing.json["error"]
+    assert client.get('/api/path?from=日本&to=猫').status_code == 404
+
+def test_related_kanji_api(client):
+    response = client.get('/api/related_kanji?kanji=日&limit=1')
+    assert response.status_code == 200
+    assert response.json["kanji"] == "日"
+    assert [n["kanji"] for n in response.json["related"]] == ["本"]
+    assert client.get('/api/related_kanji').status_code == 400
+    assert client.get('/api/related_kanji?kanji=日&limit=0').status_code == 400
+    assert client.get('/api/related_kanji?kanji=猫').status_code == 404
+
+def test_graph_api_related_adds_co_occurring_kanji(client, app):
+    from backend.src.models.word import Word
+    words = [Word.from_dict({"id": n, "text": text, "reading": "", "meaning": text,
+                             "kanji_components": [{"id": ord(ch), "character": ch, "meaning": ch} for ch in text]})
+             for n, text in enumerate(["日曜", "月曜", "日本", "本日"], start=1)]
+    app.data_loader.load_data = lambda: words
+    app.data_loader.version = "related-test"
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"data": []}, 200)
+    plain = client.get('/api/graph?word=日曜').json
+    assert plain["edges"] == []
+    enriched = client.get('/api/graph?word=日曜&related=2').json
+    assert {(e["target"], e["via"]) for e in enriched["edges"]} == {("本", "日"), ("月", "曜")}
+    assert all(e["type"] == "related" for e in enriched["edges"])
+    assert {n["id"] for n in enriched["nodes"]} == {1, "本", "月"}
+    # The enriched graph is cached separately from the plain one.
+    assert client.get('/api/graph?word=日曜').json == plain
+    assert client.get('/api/graph?word=日曜&related=9').status_code == 400
+
+def test_reading_api_answers_kana_queries_locally(client):
+    response = client.get('/api/reading?q=ニチ')
+    assert response.status_code == 200
+    assert response.json["reading"] == "にち"
+    assert [k["character"] for k in response.json["kanji"]] == ["日"]
+    assert [w["text"] for w in client.get('/api/reading?q=にほんご').json["words"]] == ["日本語"]
+    assert client.get('/api/reading').status_code == 400
+    assert client.get('/api/reading?q=日本').status_code == 400
+
+def test_graph_api_falls_back_to_word_reading(client, app):
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"data": []}, 200)
+    for route in ('/api/graph', '/graph'):
+        response = client.get(f'{route}?word=ニホンゴ')
+        assert response.status_code == 200
+        assert response.json["nodes"][0]["text"] == "日本語"
+
+def test_kanji_details_api_batch(client):
+    response = client.get("/kanji_details?characters=日,本猫日")
+    assert response.status_code == 200
+    assert list(response.json["kanji"]) == ["日", "本"]
+    assert response.json["kanji"]["本"]["character"] == "本"
+    assert response.json["missing"] == ["猫"]
+    assert client.get("/kanji_details?characters=,").status_code == 400
+    assert client.get("/kanji_details?characters=" + "".join(chr(0x4E00 + i) for i in range(201))).status_code == 400
+
+def test_graph_api_include_kanji_details(client, app):
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"data": [{"slug": kanji + "曜"}]}, 200)
+    plain = client.get('/api/graph?word=日本語').json
+    response = client.get('/api/graph?word=日本語&include=kanji_details')
+    assert response.status_code == 200
+    assert set(response.json["kanji_details"]) == {"日", "本", "語"}
+    assert response.json["kanji_details"]["語"]["meaning"] == "word, speech, language"
+    # The cached graph is not changed by the embedded details.
+    assert client.get('/api/graph?word=日本語').json == plain
+    columnar = client.get('/graph?word=日本語&format=columnar&include=kanji_details').json
+    assert columnar["format"] == "columnar" and "日" in columnar["kanji_details"]
+    assert client.get('/api/graph?word=日本語&include=everything').status_code == 400
@@ -0,0 +1,86 @@
+import pytest # type: ignore
+from unittest.mock import patch
+
+def test_successful_response_has_etag_and_cache_control(client):
+    response = client.get("/kanji_details?character=日")
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"')
+    assert "s-maxage=" in response.headers["Cache-Control"]
+    assert "stale-while-revalidate=" in response.headers["Cache-Control"]
+
+def test_matching_if_none_match_returns_304(client):
+    etag = client.get("/kanji_details?character=日").headers["ETag"]
+    response = client.get("/kanji_details?character=日", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == etag
+
+def test_stale_if_none_match_returns_full_response(client):
+    response = client.get("/kanji_details?character=日", headers={"If-None-Match": '"outdated"'})
+    assert response.status_code == 200
+    assert response.get_json()["character"] == "日"
+
+def test_etag_changes_with_content(client):
+    first = client.get("/kanji_details?character=日").headers["ETag"]
+    second = client.get("/kanji_details?character=本").headers["ETag"]
+    assert first != second
+
+def test_error_responses_are_not_cached(client):
+    response = client.get("/graph?word=nonexistent")
+    assert response.status_code == 404
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
+
+def test_upstream_failures_are_not_cached(client, app):
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"error": "Failed"}, 502)
+    response = client.get("/search_by_kanji?kanji=日")
+    assert response.status_code == 502
+    assert response.headers["Cache-Control"] == "no-store"
+
+def test_changelog_uses_short_lived_policy(client, monkeypatch):
+    from backend.src.services import github_service
+    monkeypatch.setattr(github_service, "get_changelog_from_github", lambda: "# Changelog")
+    response = client.get("/api/changelog")
+    assert response.headers["Cache-Control"].startswith("public, max-age=300")
+
+def test_metrics_are_never_cached(client):
+    assert client.get("/metrics").headers["Cache-Control"] == "no-store"
+
+def test_cached_body_is_encoded_once(client, app):
+    from backend.src.services import encoding_service
+    cached = {"data": [{"slug": "日本"}]}
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: (cached, 200)
+    with patch.object(encoding_service, "encode", wraps=encoding_service.encode) as encode:
+        first = client.get("/search_by_kanji?kanji=日")
+        second = client.get("/search_by_kanji?kanji=日")
+    assert encode.call_count == 1
+    assert first.get_data() == second.get_data()
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+def test_equivalent_queries_share_one_encoded_body(client, app):
+    from backend.src.services import encoding_service
+    cached = {"data": [{"slug": "abc"}]}
+    app.jisho_service.search_words = lambda query, *args, **kwargs: (cached, 200)
+    with patch.object(encoding_service, "encode", wraps=encoding_service.encode) as encode:
+        for query in ("abc", "ＡＢＣ", "%20abc%20"):
+            assert client.get(f"/search_words?query={query}").status_code == 200
+    assert encode.call_count == 1
+
+def test_new_body_for_same_key_is_reencoded(client, app):
+    bodies = iter([{"data": [{"slug": "日本"}]}, {"data": [{"slug": "日曜日"}]}])
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: (next(bodies), 200)
+    first = client.get("/search_by_kanji?kanji=月")
+    second = client.get("/search_by_kanji?kanji=月")
+    assert first.get_json() != second.get_json()
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+def test_index_renders_version_without_calling_github(client, monkeypatch):
+    from backend.src.services import github_service
+    monkeypatch.setattr(github_service, "changelog_cache",
+                        github_service.ChangelogCache(fetch=lambda: "## [9.9.9] - 2026-01-01"))
+    github_service.changelog_cache.refresh()
+    monkeypatch.setattr(github_service, "get_changelog_from_github",
+                        lambda: pytest.fail("page render fetched from GitHub"))
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "ver.9.9.9" in response.get_data(as_text=True)
@@ -0,0 +1,28 @@
+import pytest # type: ignore
+
+@pytest.fixture(autouse=True)
+def metrics_token(monkeypatch):
+    monkeypatch.setenv("RINKUJI_METRICS_TOKEN", "secret")
+    return "secret"
+
+def test_metrics_endpoint_returns_prometheus_text(client):
+    client.get("/kanji_details?character=日")
+    response = client.get("/metrics", headers={"X-Rinkuji-Metrics": "secret"})
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    text = response.get_data(as_text=True)
+    assert "# TYPE rinkuji_http_request_duration_seconds histogram" in text
+    assert 'rinkuji_http_requests_total{route="/kanji_details",method="GET",status="200"}' in text
+
+def test_metrics_endpoint_reports_dataset_sizes(client):
+    client.get("/graph?word=nonexistent")
+    text = client.get("/metrics", headers={"X-Rinkuji-Metrics": "secret"}).get_data(as_text=True)
+    assert 'rinkuji_dataset_entries{dataset="words"}' in text
+    assert 'rinkuji_cache_hit_ratio{cache="words"}' in text
+
+def test_metrics_require_the_token(client, monkeypatch):
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics?_metrics=wrong").status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
+    monkeypatch.delenv("RINKUJI_METRICS_TOKEN")
+    assert client.get("/metrics?_metrics=").status_code == 403
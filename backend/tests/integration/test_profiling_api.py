@@ -0,0 +1,40 @@
+import os
+import pytest # type: ignore
+
+
+@pytest.fixture
+def profile_token(monkeypatch, tmp_path):
+    monkeypatch.setenv("RINKUJI_PROFILE_TOKEN", "secret")
+    monkeypatch.setenv("RINKUJI_PROFILE_DIR", str(tmp_path))
+    return "secret"
+
+def test_requests_are_not_profiled_by_default(client):
+    response = client.get("/kanji_details?character=日", headers={"X-Rinkuji-Profile": "secret"})
+    assert response.status_code == 200
+    assert "X-Profile-File" not in response.headers
+
+def test_wrong_token_is_ignored(client, profile_token):
+    response = client.get("/kanji_details?character=日&_profile=wrong")
+    assert "X-Profile-File" not in response.headers
+
+def test_authorized_header_writes_profile(client, profile_token, tmp_path):
+    response = client.get("/kanji_details?character=日", headers={"X-Rinkuji-Profile": profile_token})
+    assert response.status_code == 200
+    path = response.headers["X-Profile-File"]
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.exists(path)
+    assert "ms" in response.headers["X-Profile-Top"]
+    assert 'profile;desc="written"' in response.headers["Server-Timing"]
+
+def test_authorized_query_flag_writes_profile(client, profile_token):
+    response = client.get(f"/api/suggestions?q=ja&_profile={profile_token}")
+    assert response.status_code == 200
+    assert os.path.exists(response.headers["X-Profile-File"])
+
+def test_profiled_response_is_not_cacheable(client, profile_token):
+    etag = client.get("/kanji_details?character=日").headers["ETag"]
+    response = client.get("/kanji_details?character=日",
+                          headers={"X-Rinkuji-Profile": profile_token, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "X-Profile-File" in response.headers
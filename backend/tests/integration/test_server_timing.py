@@ -0,0 +1,22 @@
+import pytest # type: ignore
+
+def test_api_responses_include_server_timing(client):
+    response = client.get("/kanji_details?character=日")
+    assert response.status_code == 200
+    header = response.headers["Server-Timing"]
+    assert "serialize;dur=" in header
+    assert "total;dur=" in header
+    assert response.headers["Timing-Allow-Origin"] == "*"
+
+def test_graph_server_timing_breaks_down_phases(client, app):
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"data": []}, 200)
+    response = client.get("/api/graph?word=日本語")
+    assert response.status_code == 200
+    header = response.headers["Server-Timing"]
+    assert "build;dur=" in header
+    assert "cache-words;desc=" in header
+
+def test_error_responses_include_server_timing(client):
+    response = client.get("/graph")
+    assert response.status_code == 400
+    assert "total;dur=" in response.headers["Server-Timing"]
@@ -0,0 +1,81 @@
+import pytest # type: ignore
+from backend.src import commands
+from backend.src.services import snapshot_service
+
+def test_warm_cache_writes_snapshot_for_dataset_kanji(app, tmp_path, monkeypatch):
+    looked_up = []
+
+    class FakeJisho:
+        def search_by_kanji(self, kanji, projection=None, priority="interactive"):
+            looked_up.append(kanji)
+            return {"data": []}, 200
+
+    monkeypatch.setattr(commands, "JishoService", FakeJisho)
+    output = tmp_path / "snapshot.json.gz"
+    result = app.test_cli_runner().invoke(args=["warm-cache", "--output", str(output)])
+    assert result.exit_code == 0, result.output
+    dataset_kanji = {k.character for w in app.data_loader.load_data() for k in w.kanji_components}
+    assert set(looked_up) == dataset_kanji
+    assert len(snapshot_service.load_snapshot(str(output))) == len(dataset_kanji)
+    assert "fetched" in result.output
+
+def test_precompute_graphs_writes_complete_graphs(app, tmp_path, monkeypatch):
+    from backend.src.services import graph_cache_service
+    words = app.data_loader.load_data()
+    snapshot = tmp_path / "snapshot.json.gz"
+    snapshot_service.write_snapshot(str(snapshot), {
+        ("search_by_kanji", k.character): {"data": [{"slug": k.character + "曜"}]}
+        for w in words for k in w.kanji_components
+    })
+    monkeypatch.setenv(snapshot_service.SNAPSHOT_PATH_ENV, str(snapshot)) # inherited by the worker processes
+    output = tmp_path / "graphs.json.gz"
+    result = app.test_cli_runner().invoke(args=["precompute-graphs", "--output", str(output), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    precomputed = graph_cache_service.load_precomputed(str(output))
+    version = app.data_loader.dataset_version()
+    assert set(precomputed) == {(version, (w.id,)) for w in words}
+
+def test_precompute_graphs_skips_words_the_snapshot_does_not_cover(app, tmp_path, monkeypatch):
+    from backend.src.services import graph_cache_service
+    words = app.data_loader.load_data()
+    uncovered = words[0].kanji_components[0].character
+    snapshot = tmp_path / "snapshot.json.gz"
+    snapshot_service.write_snapshot(str(snapshot), {
+        ("search_by_kanji", k.character): {"data": [{"slug": k.character + "曜"}]}
+        for w in words for k in w.kanji_components if k.character != uncovered
+    })
+    monkeypatch.setenv(snapshot_service.SNAPSHOT_PATH_ENV, str(snapshot))
+    output = tmp_path / "graphs.json.gz"
+    result = app.test_cli_runner().invoke(args=["precompute-graphs", "--output", str(output), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    precomputed = graph_cache_service.load_precomputed(str(output))
+    skipped = {w.id for w in words if any(k.character == uncovered for k in w.kanji_components)}
+    assert {ids[0] for _, ids in precomputed} == {w.id for w in words} - skipped
+    assert all(expires is None for _, expires in precomputed.values())
+
+def test_prerender_static_writes_top_words(app, tmp_path):
+    import json
+    words = app.data_loader.load_data()
+    app.jisho_service.search_by_kanji = lambda kanji, *args, **kwargs: ({"data": [{"slug": kanji + "曜"}]}, 200)
+    app.jisho_service.expires_in = lambda kanji: 3600.0
+    top_words = tmp_path / "top_words.txt"
+    top_words.write_text(words[0].text + "\n", encoding="utf-8")
+    config = tmp_path / "vercel.json"
+    config.write_text(json.dumps({"rewrites": []}))
+    output = tmp_path / "prerendered"
+    result = app.test_cli_runner().invoke(args=["prerender-static", "--top-words", str(top_words),
+                                                "--output-dir", str(output), "--vercel-config", str(config)])
+    assert result.exit_code == 0, result.output
+    assert len(list((output / "graph").iterdir())) == 1
+    sources = {r["source"] for r in json.loads(config.read_text())["rewrites"]}
+    assert sources == {"/api/graph", "/graph", "/search_by_kanji"}
+
+def test_build_related_kanji_writes_neighbours(app, tmp_path):
+    from backend.src.services import related_kanji_service
+    output = tmp_path / "related.json.gz"
+    result = app.test_cli_runner().invoke(args=["build-related-kanji", "--output", str(output), "--top-k", "1"])
+    assert result.exit_code == 0, result.output
+    loaded = related_kanji_service.load_related(str(output))
+    assert loaded.dataset_version == app.data_loader.dataset_version()
+    assert all(len(neighbours) <= 1 for neighbours in loaded.neighbours.values())
+    assert "日" in loaded.neighbours
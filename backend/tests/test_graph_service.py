@@ -1,12 +1,13 @@
 import pytest # type: ignore
-from unittest.mock import MagicMock
-from backend.src.services.graph_service import GraphService
+from unittest.mock import MagicMock, patch
+from backend.src.services.graph_service import GraphService, to_columnar
 from backend.src.models.word import Word
 from backend.src.models.kanji import Kanji
 
 def test_generate_graph_for_word():
     jisho_service = MagicMock()
     jisho_service.search_by_kanji.return_value = ({}, 200)
+    jisho_service.expires_in.return_value = None
     service = GraphService(jisho_service)
     words = service.data_loader.load_data()
     target_word = next((word for word in words if word.text == "日本語"), None)
@@ -26,3 +27,68 @@ def test_generate_graph_for_nonexistent_word():
     service = GraphService(jisho_service)
     graph = service.generate_graph([]) # Pass an empty list for nonexistent word
     assert graph == {"nodes": [], "edges": []}
+
+def test_to_columnar_uses_parallel_arrays_and_index_edges():
+    graph = {
+        "nodes": [
+            {"id": 1, "text": "日本語", "type": "word", "meaning": "Japanese language", "reading": "にほんご"},
+            {"id": "日", "text": "日", "type": "kanji", "meanings": ["day", "sun"], "is_consolidated": True},
+            {"id": "休日", "text": "休日", "type": "kanji", "meanings": [], "is_consolidated": False},
+        ],
+        "edges": [
+            {"source": 1, "target": "日", "type": "contains"},
+            {"source": 1, "target": "休日", "type": "contains"},
+        ],
+    }
+    columnar = to_columnar(graph)
+    assert columnar["format"] == "columnar"
+    assert columnar["node_types"] == ["word", "kanji"]
+    assert columnar["nodes"]["id"] == [1, "日", "休日"]
+    assert columnar["nodes"]["type"] == [0, 1, 1]
+    assert columnar["nodes"]["meanings"] == [None, ["day", "sun"], []]
+    assert columnar["edges"] == {"source": [0, 0], "target": [1, 2], "type": [0, 0]}
+    assert columnar["edge_types"] == ["contains"]
+
+class _CachingJisho:
+    def __init__(self, expires_in):
+        self.calls = 0
+        self._expires_in = expires_in
+
+    def search_by_kanji(self, kanji, projection=None, priority="interactive"):
+        self.calls += 1
+        return {"data": [{"slug": kanji + "曜"}]}, 200
+
+    def expires_in(self, kanji):
+        return self._expires_in
+
+def _target(service):
+    return [next(word for word in service.data_loader.load_data() if word.text == "日本語")]
+
+def test_generate_graph_is_cached_until_upstream_results_expire():
+    jisho_service = _CachingJisho(expires_in=120)
+    service = GraphService(jisho_service)
+    with patch.object(service._graphs, "set", wraps=service._graphs.set) as cache_set:
+        graph = service.generate_graph(_target(service))
+        assert service.generate_graph(_target(service)) is graph
+    assert jisho_service.calls == 3
+    assert cache_set.call_args.kwargs["ttl"] == 120
+
+def test_generate_graph_is_not_cached_after_failed_lookup():
+    jisho_service = _CachingJisho(expires_in=None)
+    service = GraphService(jisho_service)
+    service.generate_graph(_target(service))
+    service.generate_graph(_target(service))
+    assert jisho_service.calls == 6
+
+def test_generate_graph_uses_precomputed_graph_for_current_dataset():
+    jisho_service = _CachingJisho(expires_in=None)
+    precomputed_graph = {"nodes": [], "edges": []}
+    probe = GraphService(jisho_service)
+    target = _target(probe)
+    version = probe.data_loader.dataset_version()
+    service = GraphService(jisho_service, precomputed={
+        (version, (target[0].id,)): (precomputed_graph, None),
+        ("old-version", (target[0].id,)): ({"nodes": ["stale"], "edges": []}, None),
+    })
+    assert service.generate_graph(target) is precomputed_graph
+    assert jisho_service.calls == 0
@@ -0,0 +1,199 @@
+import asyncio
+import copy
+import time
+import requests
+from backend.src.models.word import Word
+from backend.src.services.async_graph_service import AsyncGraphService
+from backend.src.services.async_jisho_service import AsyncJishoService
+from backend.src.services.circuit_breaker_service import CircuitBreaker
+from backend.src.services.graph_service import GraphService
+from backend.src.services.jisho_service import JishoService
+from backend.src.services.projection_service import parse_projection
+from backend.src.services.scheduler_service import EXPANSION, INTERACTIVE, UpstreamScheduler
+
+def fast():
+    return {'scheduler': UpstreamScheduler('jisho_async_test', rate=10000.0, burst=10000.0)}
+
+class FakeTransport:
+    """Answers every URL with one entry slugged after its keyword, after `delay` seconds."""
+    def __init__(self, delay=0.0, error=None, delays=None):
+        self.delay = delay
+        self.error = error
+        self.delays = list(delays or [])
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def __call__(self, url, timeout):
+        self.calls.append(url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.pop(0) if self.delays else self.delay)
+            if self.error is not None:
+                raise self.error
+            keyword = url.split('keyword=')[1]
+            return copy.deepcopy({"data": [{"slug": keyword, "senses": [{"english_definitions": ["x"]}]}]})
+        finally:
+            self.in_flight -= 1
+
+    async def close(self):
+        pass
+
+def test_search_words_calls_upstream_once_and_caches():
+    transport = FakeTransport()
+    service = AsyncJishoService(JishoService(), transport=transport, **fast())
+
+    async def run():
+        first = await service.search_words("日本")
+        second = await service.search_words("日本")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == ({"data": [{"slug": "日本", "senses": [{"english_definitions": ["x"]}]}]}, 200)
+    assert transport.calls == [f"{JishoService.JISHO_API_URL}?keyword=日本"]
+
+def test_results_are_shared_with_the_threaded_client():
+    jisho = JishoService()
+    service = AsyncJishoService(jisho, transport=FakeTransport(), **fast())
+    slim = parse_projection(None, 'slim')
+    asyncio.run(service.search_by_kanji("日", slim))
+    assert jisho.is_cached("日")
+    assert jisho.search_by_kanji("日", slim)[1] == 200
+
+def test_concurrent_identical_lookups_share_one_upstream_call():
+    transport = FakeTransport(delay=0.05)
+    service = AsyncJishoService(JishoService(), transport=transport, **fast())
+
+    async def run():
+        return await asyncio.gather(*(service.search_by_kanji("日") for _ in range(50)))
+
+    results = asyncio.run(run())
+    assert len(transport.calls) == 1
+    assert all(status == 200 for _, status in results)
+
+def test_hundreds_of_distinct_lookups_run_concurrently():
+    transport = FakeTransport(delay=0.1)
+    service = AsyncJishoService(JishoService(), transport=transport, **fast())
+    queries = [f"word{i}" for i in range(300)]
+
+    async def run():
+        return await asyncio.gather(*(service.search_words(q) for q in queries))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    assert time.perf_counter() - start < 2.0 # serially this would take 30 seconds
+    assert len(transport.calls) == 300
+    assert transport.max_in_flight == 256 # the interactive class limit
+    assert all(status == 200 for _, status in results)
+
+def test_concurrency_is_bounded_per_class():
+    transport = FakeTransport(delay=0.02)
+    service = AsyncJishoService(JishoService(), transport=transport, concurrency={EXPANSION: 3}, **fast())
+
+    async def run():
+        await asyncio.gather(*(service.search_by_kanji(ch, priority=EXPANSION) for ch in "日本語月火水木金土"))
+
+    asyncio.run(run())
+    assert len(transport.calls) == 9
+    assert transport.max_in_flight == 3
+
+def test_rate_limit_paces_calls():
+    transport = FakeTransport()
+    scheduler = UpstreamScheduler('jisho_async_pacing', rate=20.0, burst=1.0)
+    service = AsyncJishoService(JishoService(), transport=transport, scheduler=scheduler)
+
+    async def run():
+        await asyncio.gather(*(service.search_words(f"q{i}") for i in range(5)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - start >= 0.15 # four calls waited for a token each
+
+def test_rate_limit_is_shared_with_the_threaded_client():
+    jisho = JishoService(scheduler=UpstreamScheduler('jisho_shared_pacing', rate=20.0, burst=1.0))
+    service = AsyncJishoService(jisho, transport=FakeTransport())
+    with jisho.scheduler.slot(INTERACTIVE): # a threaded call spends the only token
+        pass
+
+    start = time.perf_counter()
+    asyncio.run(service.search_words("test"))
+    assert time.perf_counter() - start >= 0.04 # waited for the next token at 20/s
+
+def test_upstream_failure_returns_502():
+    jisho = JishoService()
+    service = AsyncJishoService(jisho, transport=FakeTransport(error=requests.exceptions.ConnectionError("down")), **fast())
+    body, status = asyncio.run(service.search_words("test"))
+    assert status == 502
+    assert body == {"error": "Failed to fetch data from the external API."}
+
+def test_failure_falls_back_to_stale_result():
+    jisho = JishoService()
+    stale = {"data": [{"slug": "日"}]}
+    jisho._stale.set(('search_by_kanji', '日'), stale)
+    service = AsyncJishoService(jisho, transport=FakeTransport(error=requests.exceptions.Timeout("slow")), **fast())
+    assert asyncio.run(service.search_by_kanji("日")) == (stale, 200)
+
+def test_full_queue_is_answered_with_503():
+    service = AsyncJishoService(JishoService(), transport=FakeTransport(), queue_sizes={INTERACTIVE: 0}, **fast())
+    body, status = asyncio.run(service.search_words("test"))
+    assert status == 503
+
+def test_open_circuit_is_not_called():
+    jisho = JishoService()
+    transport = FakeTransport()
+    for _ in range(jisho.breaker.min_calls):
+        jisho.breaker.record_failure()
+    body, status = asyncio.run(AsyncJishoService(jisho, transport=transport, **fast()).search_words("test"))
+    assert status == 503
+    assert transport.calls == []
+
+def test_cancelled_probe_releases_the_half_open_slot():
+    jisho = JishoService(breaker=CircuitBreaker('jisho_async_probe', open_duration=0.0))
+    for _ in range(jisho.breaker.min_calls):
+        jisho.breaker.record_failure()
+    service = AsyncJishoService(jisho, transport=FakeTransport(delay=1.0), **fast())
+
+    async def run():
+        call = asyncio.ensure_future(service.search_words("test"))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+
+    asyncio.run(run())
+    assert jisho.breaker.allow()
+
+def test_hedge_answers_when_primary_is_slow():
+    transport = FakeTransport(delays=[1.0, 0.0])
+    service = AsyncJishoService(JishoService(), transport=transport, **fast())
+
+    async def run():
+        return await service._hedged(f"{JishoService.JISHO_API_URL}?keyword=日", (1, 2), delay=0.01)
+
+    start = time.perf_counter()
+    result = asyncio.run(run())
+    assert time.perf_counter() - start < 0.5
+    assert result["data"][0]["slug"] == "日"
+    assert len(transport.calls) == 2
+
+def test_invalid_kanji_parameter():
+    service = AsyncJishoService(JishoService(), transport=FakeTransport(), **fast())
+    body, status = asyncio.run(service.search_by_kanji("日本"))
+    assert status == 400
+
+def test_async_graph_looks_up_kanji_concurrently_and_caches_the_graph():
+    jisho = JishoService()
+    transport = FakeTransport(delay=0.05)
+    graphs = AsyncGraphService(GraphService(jisho), AsyncJishoService(jisho, transport=transport, **fast()))
+    word = Word.from_dict({'id': 1, 'text': '日本語', 'reading': 'にほんご', 'meaning': 'Japanese', 'kanji_components': [
+        {'id': 101, 'character': '日', 'meaning': 'day'},
+        {'id': 102, 'character': '本', 'meaning': 'book'},
+        {'id': 103, 'character': '語', 'meaning': 'word'},
+    ]})
+
+    start = time.perf_counter()
+    graph = asyncio.run(graphs.generate_graph([word]))
+    assert time.perf_counter() - start < 0.15 # three lookups of 0.05s each, overlapped
+    assert sorted(node['id'] for node in graph['nodes'] if node['type'] == 'kanji') == ['日', '本', '語']
+    assert len(graph['edges']) == 3
+    assert asyncio.run(graphs.generate_graph([word])) is graph
+    assert len(transport.calls) == 3
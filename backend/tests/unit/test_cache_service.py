@@ -0,0 +1,45 @@
+import pytest # type: ignore
+from unittest.mock import patch
+from backend.src.services.cache_service import LRUCache
+
+def test_get_returns_default_on_miss():
+    cache = LRUCache('test', maxsize=2)
+    assert cache.get('missing') is None
+    assert cache.get('missing', 'fallback') == 'fallback'
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache('test', maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert len(cache) == 2
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache('test', ttl=10)
+    with patch('backend.src.services.cache_service.time.monotonic', return_value=100.0):
+        cache.set('a', 1)
+    with patch('backend.src.services.cache_service.time.monotonic', return_value=109.0):
+        assert cache.get('a') == 1
+    with patch('backend.src.services.cache_service.time.monotonic', return_value=111.0):
+        assert cache.get('a') is None
+
+def test_lookups_are_recorded_in_metrics():
+    cache = LRUCache('unit-test-lru')
+    cache.set('a', 1)
+    with patch('backend.src.services.cache_service.metrics_service.record_cache_lookup') as record:
+        cache.get('a')
+        cache.get('b')
+    record.assert_any_call('unit-test-lru', hit=True)
+    record.assert_any_call('unit-test-lru', hit=False)
+
+def test_expires_in():
+    cache = LRUCache('test_expires', ttl=60)
+    assert cache.expires_in('missing') is None
+    cache.set('a', 1)
+    assert 0 < cache.expires_in('a') <= 60
+    forever = LRUCache('test_forever')
+    forever.set('a', 1)
+    assert forever.expires_in('a') == float('inf')
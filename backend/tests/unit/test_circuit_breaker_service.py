@@ -0,0 +1,85 @@
+import pytest # type: ignore
+from unittest.mock import patch
+from backend.src.services import circuit_breaker_service
+from backend.src.services.circuit_breaker_service import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+@pytest.fixture
+def clock():
+    now = [1000.0]
+    with patch.object(circuit_breaker_service.time, "monotonic", lambda: now[0]):
+        yield now
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = CircuitBreaker("test", min_calls=5)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+def test_opens_at_failure_ratio_and_refuses_calls(clock):
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_calls=4)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = CircuitBreaker("test", min_calls=3, window=10)
+    breaker.record_failure()
+    clock[0] += 11
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+def test_half_open_admits_limited_probes(clock):
+    breaker = CircuitBreaker("test", min_calls=1, open_duration=30, half_open_probes=1)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+def test_successful_probe_closes(clock):
+    breaker = CircuitBreaker("test", min_calls=1, open_duration=30)
+    breaker.record_failure()
+    clock[0] += 30
+    probe = breaker.allow()
+    assert probe
+    breaker.record_success(probe)
+    assert breaker.state == CLOSED
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("test", min_calls=1, open_duration=30)
+    breaker.record_failure()
+    clock[0] += 30
+    probe = breaker.allow()
+    assert probe
+    breaker.record_failure(probe)
+    assert breaker.state == OPEN
+    clock[0] += 29
+    assert not breaker.allow()
+
+def test_call_admitted_before_the_outage_does_not_decide_the_probe(clock):
+    breaker = CircuitBreaker("test", min_calls=1, open_duration=30)
+    slow_call = breaker.allow()
+    breaker.record_failure()
+    clock[0] += 30
+    probe = breaker.allow()
+    breaker.record_success(slow_call)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow() # the probe's slot is still taken
+    breaker.record_failure(probe)
+    assert breaker.state == OPEN
+
+def test_outcome_from_an_earlier_closed_period_is_ignored(clock):
+    breaker = CircuitBreaker("test", min_calls=1, open_duration=30)
+    slow_call = breaker.allow()
+    breaker.record_failure()
+    clock[0] += 30
+    breaker.record_success(breaker.allow())
+    assert breaker.state == CLOSED
+    breaker.record_failure(slow_call)
+    assert breaker.state == CLOSED
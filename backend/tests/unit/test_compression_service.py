@@ -0,0 +1,31 @@
+import gzip
+import pytest # type: ignore
+from unittest.mock import patch
+from backend.src.services import compression_service
+
+@pytest.mark.parametrize("header,expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("deflate, gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "gzip"),
+])
+def test_negotiate_without_brotli(header, expected):
+    with patch.object(compression_service, "brotli", None):
+        assert compression_service.negotiate(header) == expected
+
+def test_negotiate_prefers_brotli_when_available():
+    with patch.object(compression_service, "brotli", object()):
+        assert compression_service.negotiate("gzip, br") == "br"
+        assert compression_service.negotiate("gzip, br;q=0.5") == "gzip"
+
+def test_compress_round_trips_and_caches_by_key():
+    data = b'{"data": []}' * 200
+    first = compression_service.compress(data, "gzip", cache_key="unit-test-key")
+    assert gzip.decompress(first) == data
+    with patch.object(compression_service.gzip, "compress") as compress:
+        second = compression_service.compress(data, "gzip", cache_key="unit-test-key")
+    compress.assert_not_called()
+    assert second == first
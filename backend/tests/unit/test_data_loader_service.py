@@ -144,5 +144,20 @@ class TestDataLoaderService(unittest.TestCase):
         all_kanji = self.data_loader_service.get_all_kanji(mock_load_data.return_value)
         self.assertEqual(len(all_kanji), 0)
 
+    @patch.object(DataLoaderService, 'load_data')
+    def test_get_kanji_by_character_keeps_first_entry_and_follows_reloads(self, mock_load_data):
+        first = Kanji(id=101, character="日", meaning="day", on_reading=[], kun_reading=[], components=[])
+        mock_load_data.return_value = [
+            Word(id=1, text="日本", reading="にほん", meaning="Japan", kanji_components=[first]),
+            Word(id=2, text="日曜", reading="にちよう", meaning="Sunday", kanji_components=[
+                Kanji(id=104, character="日", meaning="sun", on_reading=[], kun_reading=[], components=[]),
+            ]),
+        ]
+        index = self.data_loader_service.get_kanji_by_character()
+        self.assertIs(index["日"], first)
+        self.assertIs(self.data_loader_service.get_kanji_by_character(), index)
+        mock_load_data.return_value = []
+        self.assertEqual(self.data_loader_service.get_kanji_by_character(), {})
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,46 @@
+import json
+import pytest # type: ignore
+from unittest.mock import MagicMock, patch
+from backend.src.services import encoding_service
+
+def test_negotiate_defaults_to_json():
+    assert encoding_service.negotiate(None) == encoding_service.JSON
+    assert encoding_service.negotiate("*/*") == encoding_service.JSON
+    assert encoding_service.negotiate("text/html, application/json") == encoding_service.JSON
+
+def test_negotiate_ignores_binary_types_without_library():
+    with patch.object(encoding_service, "msgpack", None), patch.object(encoding_service, "cbor2", None):
+        assert encoding_service.negotiate("application/msgpack") == encoding_service.JSON
+
+def test_negotiate_honours_preference_between_binary_types():
+    with patch.object(encoding_service, "msgpack", MagicMock()), patch.object(encoding_service, "cbor2", MagicMock()):
+        assert encoding_service.negotiate("application/x-msgpack") == encoding_service.MSGPACK
+        assert encoding_service.negotiate("application/msgpack;q=0.5, application/cbor") == encoding_service.CBOR
+        assert encoding_service.negotiate("application/json, application/msgpack;q=0.9") == encoding_service.JSON
+
+def test_encode_uses_selected_library():
+    fake_msgpack = MagicMock()
+    fake_msgpack.packb.return_value = b"\x80"
+    with patch.object(encoding_service, "msgpack", fake_msgpack):
+        assert encoding_service.encode({}, encoding_service.MSGPACK) == b"\x80"
+    fake_msgpack.packb.assert_called_once_with({}, use_bin_type=True)
+
+def test_encode_json_fallback():
+    assert json.loads(encoding_service.encode({"a": "日"}, encoding_service.JSON)) == {"a": "日"}
+
+def test_set_json_encoder_plugs_in_encoder():
+    try:
+        encoding_service.set_json_encoder(lambda body: '{"plugged":true}')
+        assert encoding_service.encode({}, encoding_service.JSON) == b'{"plugged":true}'
+    finally:
+        encoding_service.set_json_encoder(None)
+    assert json.loads(encoding_service.encode({"a": 1}, encoding_service.JSON)) == {"a": 1}
+
+def test_encode_json_falls_back_to_stdlib_when_fast_encoder_rejects_body():
+    def strict(body):
+        raise TypeError("Integer exceeds 64-bit range")
+    try:
+        encoding_service.set_json_encoder(strict)
+        assert json.loads(encoding_service.encode({"n": 2 ** 70}, encoding_service.JSON)) == {"n": 2 ** 70}
+    finally:
+        encoding_service.set_json_encoder(None)
@@ -0,0 +1,39 @@
+import pytest # type: ignore
+from backend.src.services import exclusion_service
+from backend.src.services.exclusion_service import BloomFilter, build_bloom, exclude_known, parse_exclusion
+
+def test_bloom_matches_frontend_encoding():
+    # The same slugs through frontend/src/js/utils/BloomFilter.js
+    assert build_bloom(["日曜", "月曜日", "abc"]).to_base64() == "lFoZ8w=="
+
+def test_bloom_has_no_false_negatives_and_few_false_positives():
+    known = [f"語{i}" for i in range(500)]
+    bloom = build_bloom(known)
+    assert all(slug in bloom for slug in known)
+    false_positives = sum(f"新{i}" in bloom for i in range(2000))
+    assert false_positives < 60 # ~1% expected
+
+def test_parse_exclusion_forms():
+    assert parse_exclusion({}) is None
+    assert parse_exclusion({"exclude": ["日本"]}) == frozenset({"日本"})
+    bloom = parse_exclusion({"bloom": {"bits": build_bloom(["日本"]).to_base64(), "hashes": 7}})
+    assert isinstance(bloom, BloomFilter) and "日本" in bloom
+    assert exclusion_service.parse_exclusion_body(b"") is None
+
+@pytest.mark.parametrize("payload", [
+    [],
+    {"exclude": "日本"},
+    {"exclude": ["x"] * (exclusion_service.MAX_EXCLUDED + 1)},
+    {"bloom": {"bits": "not base64!", "hashes": 7}},
+    {"bloom": {"bits": "AA==", "hashes": 0}},
+    {"bloom": {"bits": "AA==", "hashes": True}},
+])
+def test_parse_exclusion_rejects_malformed(payload):
+    with pytest.raises(ValueError):
+        parse_exclusion(payload)
+
+def test_exclude_known_keeps_other_keys_and_does_not_mutate():
+    result = {"meta": {"status": 200}, "data": [{"slug": "日本"}, {"slug": "日曜"}]}
+    filtered = exclude_known(result, frozenset({"日本"}))
+    assert filtered == {"meta": {"status": 200}, "data": [{"slug": "日曜"}]}
+    assert len(result["data"]) == 2
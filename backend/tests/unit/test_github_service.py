@@ -0,0 +1,50 @@
+import threading
+import pytest # type: ignore
+from backend.src.services import github_service
+from backend.src.services.github_service import ChangelogCache, parse_latest_version
+
+GITHUB_MD = "# Changelog\n\n## [2.0.0] - 2026-01-01\n- New\n"
+
+def test_parse_latest_version():
+    assert parse_latest_version(GITHUB_MD) == "ver.2.0.0"
+    assert parse_latest_version("## Unreleased") == "ver.Unreleased"
+    assert parse_latest_version("# Changelog") == "null"
+    assert parse_latest_version(None) == "null"
+
+def test_serves_bundled_copy_without_waiting_for_github():
+    release = threading.Event()
+    def slow_fetch():
+        release.wait(5)
+        return GITHUB_MD
+    cache = ChangelogCache(fetch=slow_fetch)
+    changelog = cache.get()
+    release.set()
+    assert changelog.source == "bundled"
+    assert changelog.markdown == github_service.load_bundled_changelog()
+    assert changelog.latest_version.startswith("ver.")
+
+def test_refresh_replaces_copy_and_parses_version_once():
+    cache = ChangelogCache(fetch=lambda: GITHUB_MD)
+    cache.refresh()
+    changelog = cache.get()
+    assert changelog == github_service.Changelog(GITHUB_MD, "ver.2.0.0", "github")
+
+def test_failed_refresh_keeps_current_copy():
+    responses = iter([GITHUB_MD, None])
+    cache = ChangelogCache(fetch=lambda: next(responses))
+    cache.refresh()
+    cache.refresh()
+    assert cache.get().markdown == GITHUB_MD
+
+def test_expired_copy_starts_single_background_refresh():
+    calls = []
+    release = threading.Event()
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return GITHUB_MD
+    cache = ChangelogCache(fetch=fetch, ttl=0)
+    cache.get()
+    cache.get()
+    release.set()
+    assert len(calls) <= 1
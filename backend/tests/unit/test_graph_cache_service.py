@@ -0,0 +1,20 @@
+import time
+import pytest # type: ignore
+from backend.src.services import graph_cache_service
+
+GRAPH = {"nodes": [{"id": 1, "text": "日本語", "type": "word"}], "edges": []}
+
+def test_write_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "graphs.json.gz")
+    graph_cache_service.write_precomputed(path, "v1", {(1,): (GRAPH, None), (2, 3): (GRAPH, time.time() + 60)})
+    loaded = graph_cache_service.load_precomputed(path)
+    assert set(loaded) == {("v1", (1,)), ("v1", (2, 3))}
+    assert loaded[("v1", (1,))] == (GRAPH, None)
+
+def test_expired_graphs_are_not_loaded(tmp_path):
+    path = str(tmp_path / "graphs.json.gz")
+    graph_cache_service.write_precomputed(path, "v1", {(1,): (GRAPH, time.time() - 1)})
+    assert len(graph_cache_service.load_precomputed(path)) == 0
+
+def test_missing_file_is_empty(tmp_path):
+    assert len(graph_cache_service.load_precomputed(str(tmp_path / "missing.json.gz"))) == 0
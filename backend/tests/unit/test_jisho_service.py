@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import patch, Mock
 import requests
-from backend.src.services.jisho_service import JishoService
+from backend.src.services.circuit_breaker_service import CircuitBreaker
+from backend.src.services.jisho_service import JishoService, PageMerger
+from backend.src.services.projection_service import parse_projection
+from backend.src.services.sampling_service import Page
+from backend.src.services.scheduler_service import QueueRejected
 
 class TestJishoService(unittest.TestCase):
 
@@ -18,7 +22,19 @@ class TestJishoService(unittest.TestCase):
         response, status = self.jisho_service.search_words("test")
         self.assertEqual(status, 200)
         self.assertIn("data", response)
-        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=test")
+        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=test", timeout=JishoService.REQUEST_TIMEOUT)
+
+    @patch('requests.get')
+    def test_search_words_normalizes_query_before_caching(self, mock_get):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": [{"slug": "テスト"}]}
+        mock_get.return_value = mock_response
+
+        for query in ("test", "ＴＥＳＴ", "  Test "):
+            response, status = self.jisho_service.search_words(query)
+            self.assertEqual(status, 200)
+        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=test", timeout=JishoService.REQUEST_TIMEOUT)
 
     def test_search_words_empty_query(self):
         response, status = self.jisho_service.search_words("")
@@ -34,7 +50,7 @@ class TestJishoService(unittest.TestCase):
         self.assertEqual(status, 502)
         self.assertIn("error", response)
         self.assertEqual(response["error"], "Failed to fetch data from the external API.")
-        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=test")
+        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=test", timeout=JishoService.REQUEST_TIMEOUT)
 
     @patch('requests.get')
     def test_search_by_kanji_success(self, mock_get):
@@ -46,7 +62,7 @@ class TestJishoService(unittest.TestCase):
         response, status = self.jisho_service.search_by_kanji("日")
         self.assertEqual(status, 200)
         self.assertIn("data", response)
-        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=日")
+        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=日", timeout=JishoService.REQUEST_TIMEOUT)
 
     def test_search_by_kanji_empty_kanji(self):
         response, status = self.jisho_service.search_by_kanji("")
@@ -68,7 +84,7 @@ class TestJishoService(unittest.TestCase):
         self.assertEqual(status, 502)
         self.assertIn("error", response)
         self.assertEqual(response["error"], "Failed to fetch data from the external API.")
-        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=日")
+        mock_get.assert_called_once_with(f"{self.jisho_service.JISHO_API_URL}?keyword=日", timeout=JishoService.REQUEST_TIMEOUT)
 
     @patch('requests.get')
     def test_search_by_kanji_consolidates_similar_kanjis(self, mock_get):
@@ -95,5 +111,204 @@ class TestJishoService(unittest.TestCase):
         self.assertEqual(len(response["data"][0]["meanings"]), 2)
         self.assertTrue(response["data"][0]["is_consolidated"])
 
+    @patch('requests.get')
+    def test_search_by_kanji_caches_successful_results(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": [{"slug": "日", "japanese": [{"word": "ひ"}]}]}
+        mock_get.return_value = mock_response
+
+        first, _ = self.jisho_service.search_by_kanji("日")
+        second, status = self.jisho_service.search_by_kanji("日")
+        self.assertEqual(status, 200)
+        self.assertEqual(first, second)
+        mock_get.assert_called_once()
+
+    @patch('requests.get')
+    def test_search_by_kanji_does_not_cache_failures(self, mock_get):
+        mock_get.side_effect = requests.exceptions.RequestException("Test exception")
+        self.jisho_service.search_by_kanji("日")
+        self.jisho_service.search_by_kanji("日")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.get')
+    def test_search_by_kanji_slim_view_is_projected_and_cached(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": [{
+            "slug": "休日",
+            "japanese": [{"reading": "きゅうじつ"}],
+            "senses": [{"english_definitions": ["holiday"]}],
+            "attribution": {"jmdict": True},
+        }]}
+        mock_get.return_value = mock_response
+        slim = parse_projection(None, "slim")
+
+        response, status = self.jisho_service.search_by_kanji("休", slim)
+        self.assertEqual(status, 200)
+        self.assertEqual(response["data"], [{"slug": "休日", "is_consolidated": False, "readings": ["きゅうじつ"], "meanings": ["holiday"]}])
+        self.assertIs(self.jisho_service.search_by_kanji("休", slim)[0], response)
+        full, _ = self.jisho_service.search_by_kanji("休")
+        self.assertIn("attribution", full["data"][0])
+        mock_get.assert_called_once()
+
+    @patch('requests.get')
+    def test_search_by_kanji_serves_stale_result_when_upstream_fails(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": [{"slug": "休日"}]}
+        mock_get.return_value = mock_response
+        fresh, _ = self.jisho_service.search_by_kanji("休")
+        self.jisho_service._results.clear()
+        mock_get.side_effect = requests.exceptions.Timeout("Test timeout")
+
+        response, status = self.jisho_service.search_by_kanji("休")
+        self.assertEqual(status, 200)
+        self.assertIs(response, fresh)
+
+    @patch('requests.get')
+    def test_open_circuit_fails_fast_without_calling_upstream(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ConnectionError("Test exception")
+        for kanji in "一二三四五":
+            self.jisho_service.search_by_kanji(kanji)
+        self.assertEqual(self.jisho_service.breaker.state, "open")
+
+        response, status = self.jisho_service.search_by_kanji("六")
+        self.assertEqual(status, 503)
+        self.assertIn("error", response)
+        self.assertEqual(mock_get.call_count, 5)
+
+    @patch('requests.get')
+    def test_empty_results_are_cached_briefly(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": []}
+        mock_get.return_value = mock_response
+        with patch.object(self.jisho_service._results, 'set', wraps=self.jisho_service._results.set) as cache_set:
+            self.jisho_service.search_words("zzzz")
+        cache_set.assert_called_once_with(('search_words', 'zzzz'), {"data": []}, ttl=JishoService.NEGATIVE_CACHE_TTL)
+
+    @patch('requests.get')
+    def test_empty_slim_result_expires_with_the_negative_ttl(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": []}
+        mock_get.return_value = mock_response
+        slim = parse_projection(None, 'slim')
+        with patch('backend.src.services.cache_service.time') as clock:
+            clock.monotonic.return_value = 1000.0
+            self.assertEqual(self.jisho_service.search_by_kanji("日", slim)[1], 200)
+            self.jisho_service.search_by_kanji("日", slim)
+            self.assertEqual(mock_get.call_count, 1)
+            clock.monotonic.return_value = 1000.0 + JishoService.NEGATIVE_CACHE_TTL + 1
+            self.jisho_service.search_by_kanji("日", slim)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.get')
+    def test_probe_failing_unexpectedly_still_releases_the_half_open_slot(self, mock_get):
+        service = JishoService(breaker=CircuitBreaker('jisho_probe', open_duration=0.0))
+        for _ in range(service.breaker.min_calls):
+            service.breaker.record_failure()
+        self.assertEqual(service.breaker.state, "half_open")
+        mock_get.side_effect = ValueError("bad body")
+        with self.assertRaises(ValueError):
+            service.search_words("test")
+        self.assertTrue(service.breaker.allow()) # reopened and half-open again, not stuck with the probe taken
+
+    @patch('requests.get')
+    def test_dropped_call_answers_503_without_calling_upstream(self, mock_get):
+        with patch.object(self.jisho_service.scheduler, 'acquire', side_effect=QueueRejected('prefetch', 'shed')):
+            response, status = self.jisho_service.search_by_kanji("日", priority='prefetch')
+        self.assertEqual(status, 503)
+        mock_get.assert_not_called()
+
+    def _paged_responses(self, mock_get, words_per_page):
+        """Serves page N of a kanji search with words_per_page[N - 1] distinct words."""
+        def respond(url, timeout):
+            number = int(url.split('&page=')[1]) if '&page=' in url else 1
+            response = Mock()
+            response.json.return_value = {"data": [
+                {"slug": f"日{number}x{i}", "japanese": [{"reading": "にち"}]} for i in range(words_per_page[number - 1])
+            ]}
+            return response
+        mock_get.side_effect = respond
+
+    @patch('requests.get')
+    def test_window_reads_only_the_pages_it_needs(self, mock_get):
+        self._paged_responses(mock_get, [20, 20, 20, 20])
+        response, status = self.jisho_service.search_by_kanji("日", page=Page(limit=10, offset=5))
+        self.assertEqual(status, 200)
+        self.assertEqual([item["slug"] for item in response["data"]], [f"日1x{i}" for i in range(5, 15)])
+        self.assertTrue(response["has_more"])
+        self.assertEqual(mock_get.call_count, 1)
+
+        response, _ = self.jisho_service.search_by_kanji("日", page=Page(limit=30, offset=25))
+        self.assertEqual(response["data"][0]["slug"], "日2x5")
+        self.assertEqual(len(response["data"]), 30)
+        self.assertEqual(mock_get.call_count, 3) # pages 2 and 3, page 1 was cached
+
+    @patch('requests.get')
+    def test_window_stops_at_a_short_page(self, mock_get):
+        self._paged_responses(mock_get, [20, 3, 20])
+        response, status = self.jisho_service.search_by_kanji("日", page=Page(limit=50, offset=10))
+        self.assertEqual(status, 200)
+        self.assertEqual(len(response["data"]), 13)
+        self.assertFalse(response["has_more"])
+        self.assertEqual(mock_get.call_count, 3) # pages 2 and 3 were fetched together
+
+    @patch('requests.get')
+    def test_seeded_sample_is_deterministic_and_cached(self, mock_get):
+        self._paged_responses(mock_get, [20, 20])
+        slim = parse_projection(None, "slim")
+        first, _ = self.jisho_service.search_by_kanji("日", slim, page=Page(limit=3, seed=7))
+        self.assertIs(self.jisho_service.search_by_kanji("日", slim, page=Page(limit=3, seed=7))[0], first)
+        other = JishoService()
+        again, _ = other.search_by_kanji("日", slim, page=Page(limit=3, seed=7))
+        self.assertEqual(again, first)
+        self.assertEqual(first["seed"], 7)
+        next_page, _ = other.search_by_kanji("日", slim, page=Page(limit=3, offset=3, seed=7))
+        self.assertFalse({item["slug"] for item in first["data"]} & {item["slug"] for item in next_page["data"]})
+        self.assertEqual(mock_get.call_count, 2) # one first page per service
+
+    @patch('requests.get')
+    def test_exclusion_applies_before_the_window(self, mock_get):
+        self._paged_responses(mock_get, [5])
+        exclude = {"日1x0", "日1x1"}
+        response, _ = self.jisho_service.search_by_kanji("日", page=Page(limit=2), exclude=exclude)
+        self.assertEqual([item["slug"] for item in response["data"]], ["日1x2", "日1x3"])
+
+    @patch('requests.get')
+    def test_max_pages_fetches_concurrently_and_stops_at_a_short_page(self, mock_get):
+        self._paged_responses(mock_get, [20, 20, 7, 20, 20])
+        response, status = self.jisho_service.search_by_kanji("日", max_pages=5)
+        self.assertEqual(status, 200)
+        self.assertEqual(len(response["data"]), 47)
+        self.assertEqual(response["pages"], 3)
+        self.assertFalse(response["has_more"])
+        self.assertEqual(mock_get.call_count, 4) # page 1, then pages 2-4 at once; page 4 is discarded
+        self.assertIs(self.jisho_service.search_by_kanji("日", max_pages=5)[0], response)
+        self.assertEqual(len(self.jisho_service.search_by_kanji("日")[0]["data"]), 20) # page 1 is shared
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch('requests.get')
+    def test_max_pages_reuses_cached_pages(self, mock_get):
+        self._paged_responses(mock_get, [20, 20, 20])
+        response, _ = self.jisho_service.search_words("日", max_pages=2)
+        self.assertTrue(response["has_more"])
+        self.jisho_service.search_words("日", max_pages=3)
+        self.assertEqual(mock_get.call_count, 3) # only page 3 was new
+
+    def test_word_pages_drop_repeated_slugs(self):
+        merger = PageMerger(consolidate=False)
+        merger.add({"data": [{"slug": "日本"}, {"slug": "日曜"}]})
+        merger.add({"data": [{"slug": "日曜"}, {"slug": "毎日"}]})
+        self.assertEqual([item["slug"] for item in merger.items()], ["日本", "日曜", "毎日"])
+
+    def test_pages_regroup_words_split_across_a_boundary(self):
+        first = {"data": [{"slug": "日-1", "senses": [{"english_definitions": ["day"]}]}]}
+        second = {"data": [{"slug": "日-2", "senses": [{"english_definitions": ["sun"]}]}]}
+        merger = PageMerger(consolidate=True)
+        merger.add(first)
+        merger.add(second)
+        merged = merger.items()
+        self.assertEqual(len(merged), 1)
+        self.assertTrue(merged[0]["is_consolidated"])
+        self.assertEqual(merged[0]["meanings"], ["day", "sun"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import threading
+import time
+import pytest # type: ignore
+from backend.src.services.latency_service import HedgeBudget, LatencyTracker, hedged_call
+from backend.src.services.scheduler_service import CONCURRENCY, UpstreamScheduler
+
+def test_uses_max_timeout_until_enough_samples():
+    tracker = LatencyTracker("test", min_samples=20, max_timeout=10)
+    for _ in range(19):
+        tracker.observe(0.2)
+    assert tracker.timeout() == 10
+    assert tracker.hedge_delay() is None
+
+def test_timeout_follows_p99_within_bounds():
+    tracker = LatencyTracker("test", window_size=100, min_samples=10, min_timeout=1, max_timeout=10)
+    for _ in range(100):
+        tracker.observe(0.5)
+    assert tracker.timeout() == pytest.approx(1.5)
+    assert tracker.hedge_delay() == pytest.approx(0.5)
+    for _ in range(100):
+        tracker.observe(0.1)
+    assert tracker.timeout() == 1
+
+def test_window_forgets_old_samples():
+    tracker = LatencyTracker("test", window_size=10, min_samples=10, max_timeout=10)
+    for _ in range(10):
+        tracker.observe(5.0)
+    for _ in range(10):
+        tracker.observe(1.0)
+    assert tracker.timeout() == pytest.approx(3.0)
+
+def test_budget_caps_hedges():
+    budget = HedgeBudget(ratio=0.1, burst=2)
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    for _ in range(11): # earns 0.1 tokens per primary request
+        budget.on_request()
+    assert budget.try_acquire()
+
+def test_hedge_answers_when_primary_is_slow():
+    release = threading.Event()
+    calls = []
+    def call():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return "primary"
+        return "hedge"
+    try:
+        assert hedged_call("test", call, 0.01, HedgeBudget()) == "hedge"
+    finally:
+        release.set()
+
+def test_no_hedge_without_budget():
+    release = threading.Event()
+    calls = []
+    def call():
+        calls.append(1)
+        release.wait(0.05)
+        return "primary"
+    assert hedged_call("test", call, 0.001, HedgeBudget(burst=0)) == "primary"
+    assert len(calls) == 1
+
+def test_no_hedge_without_a_rate_token():
+    scheduler = UpstreamScheduler("hedge_tokens", rate=0.001, burst=1.0)
+    scheduler.take_token() # spend the only token
+    calls = []
+    def call():
+        calls.append(1)
+        time.sleep(0.05)
+        return "primary"
+    assert hedged_call("test", call, 0.001, HedgeBudget(), scheduler.take_token) == "primary"
+    assert len(calls) == 1
+
+def test_hedge_errors_surface_when_both_fail():
+    def call():
+        raise ValueError("upstream failed")
+    with pytest.raises(ValueError):
+        hedged_call("test", call, 0.0, HedgeBudget())
+
+def test_admitted_calls_and_their_hedges_never_queue_for_a_worker():
+    # As many callers as the scheduler admits at once, each hedging: all 2x calls must start together.
+    callers = sum(CONCURRENCY.values())
+    started = threading.Semaphore(0)
+    release = threading.Event()
+    def call():
+        started.release()
+        release.wait(5)
+        return "done"
+    threads = [threading.Thread(target=hedged_call, args=("test", call, 0.01, HedgeBudget(burst=2)))
+               for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    try:
+        assert all(started.acquire(timeout=2) for _ in range(2 * callers))
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join(5)
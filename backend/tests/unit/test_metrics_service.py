@@ -0,0 +1,51 @@
+import pytest # type: ignore
+from backend.src.services.metrics_service import MetricsRegistry
+from backend.src.services import metrics_service
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counter_renders_labelled_samples(registry):
+    counter = registry.counter('demo_total', 'A demo counter.', ('route',))
+    counter.inc(route='/a')
+    counter.inc(2, route='/a')
+    text = registry.render()
+    assert '# TYPE demo_total counter' in text
+    assert 'demo_total{route="/a"} 3' in text
+
+def test_counter_rejects_unknown_labels(registry):
+    counter = registry.counter('demo_total', 'A demo counter.', ('route',))
+    with pytest.raises(ValueError):
+        counter.inc(path='/a')
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram('demo_seconds', 'A demo histogram.', buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    text = registry.render()
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+    assert 'demo_seconds_count 3' in text
+
+def test_registering_twice_returns_same_metric(registry):
+    assert registry.counter('demo_total', 'doc') is registry.counter('demo_total', 'doc')
+
+def test_label_values_are_escaped(registry):
+    gauge = registry.gauge('demo', 'doc', ('name',))
+    gauge.set(1, name='a"b')
+    assert 'demo{name="a\\"b"} 1' in registry.render()
+
+def test_record_cache_lookup_updates_hit_ratio():
+    metrics_service.record_cache_lookup('unit-test-cache', hit=True)
+    metrics_service.record_cache_lookup('unit-test-cache', hit=False)
+    assert metrics_service.CACHE_HIT_RATIO.value(cache='unit-test-cache') == 0.5
+
+def test_observe_jisho_call_updates_error_ratio():
+    metrics_service.observe_jisho_call('unit-test', 0.1, ok=True)
+    metrics_service.observe_jisho_call('unit-test', 0.2, ok=False)
+    assert metrics_service.JISHO_REQUESTS.value(endpoint='unit-test', outcome='error') == 1
+    assert metrics_service.JISHO_ERROR_RATIO.value(endpoint='unit-test') == 0.5
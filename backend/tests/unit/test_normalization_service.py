@@ -0,0 +1,30 @@
+import pytest # type: ignore
+from backend.src.services.normalization_service import (
+    HIRAGANA, KANJI, KATAKANA, LATIN, PUNCTUATION, fold_kana, is_japanese, is_kanji, kanji_in, match_key, normalize,
+    script_of,
+)
+
+@pytest.mark.parametrize("text, expected", [
+    ("ＴＥＳＴ", "test"), ("  Hello   World ", "hello world"), ("ﾃｽﾄ", "テスト"), ("ｶﾞ", "ガ"), ("日本", "日本"),
+    ("⽇", "日"), ("隆", "隆"),  # a Kangxi radical and a compatibility ideograph
+])
+def test_normalize_folds_width_case_and_compatibility_forms(text, expected):
+    assert normalize(text) == expected
+
+def test_fold_kana_and_match_key():
+    assert fold_kana("ニホンゴ") == "にほんご"
+    assert fold_kana("ラーメン") == "らーめん"
+    assert match_key("ﾆﾎﾝｺﾞ") == match_key("にほんご") == "にほんご"
+
+@pytest.mark.parametrize("ch, script", [
+    ("あ", HIRAGANA), ("ア", KATAKANA), ("ー", KATAKANA), ("日", KANJI), ("㐀", KANJI), ("𠀋", KANJI), ("々", KANJI),
+    ("a", LATIN), ("7", LATIN), ("。", PUNCTUATION), ("〜", PUNCTUATION), ("!", None), ("한", None),
+])
+def test_script_of(ch, script):
+    assert script_of(ch) == script
+
+def test_is_japanese_and_kanji():
+    assert is_japanese("test テスト") and is_japanese("㐀")
+    assert not is_japanese("test") and not is_japanese("。")
+    assert is_kanji("鿿") and not is_kanji("か")
+    assert kanji_in("日曜日と㐂") == ["日", "曜", "㐂"]
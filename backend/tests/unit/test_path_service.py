@@ -0,0 +1,74 @@
+import pytest # type: ignore
+from backend.src.models.kanji import Kanji
+from backend.src.models.word import Word
+from backend.src.services.path_service import PathService, WordKanjiIndex
+
+def make_words(texts):
+    kanji = {}
+    words = []
+    for n, text in enumerate(texts, start=1):
+        components = [kanji.setdefault(ch, Kanji(100 + len(kanji), ch, f"meaning of {ch}", [], [], [])) for ch in text]
+        words.append(Word(n, text, "", f"meaning of {text}", components))
+    return words
+
+WORDS = make_words(["日本", "本気", "気分", "分野", "野球", "日曜", "猫"])
+
+class FakeLoader:
+    def __init__(self, words, version="v1"):
+        self.words = words
+        self.version = version
+        self.loads = 0
+
+    def load_data(self):
+        self.loads += 1
+        return self.words
+
+    def dataset_version(self):
+        return self.version
+
+def test_index_is_bipartite_csr():
+    index = WordKanjiIndex(WORDS)
+    assert len(index) == len(WORDS) + len(index.kanji)
+    assert len(index.targets) == 2 * sum(len(w.kanji_components) for w in WORDS)
+    assert sorted(index.kanji[k - len(WORDS)].character for k in index.neighbours(index.word_node("日本"))) == ["日", "本"]
+    hon = next(n for n in range(len(WORDS), len(index)) if index.kanji[n - len(WORDS)].character == "本")
+    assert sorted(index.words[w].text for w in index.neighbours(hon)) == ["日本", "本気"]
+
+def test_shortest_path_alternates_words_and_kanji():
+    index = WordKanjiIndex(WORDS)
+    path = index.shortest_path(index.word_node("日曜"), index.word_node("野球"))
+    graph = index.to_graph(path)
+    assert [node["text"] for node in graph["nodes"]] == ["日曜", "日", "日本", "本", "本気", "気", "気分", "分", "分野", "野", "野球"]
+    assert [node["type"] for node in graph["nodes"]][:3] == ["word", "kanji", "word"]
+    assert graph["edges"][0] == {"source": 6, "target": "日", "type": "contains"}
+    assert graph["edges"][1] == {"source": 1, "target": "日", "type": "contains"}
+    assert len(graph["edges"]) == len(path) - 1
+
+def test_path_nodes_have_the_graph_node_shape():
+    index = WordKanjiIndex(WORDS)
+    graph = index.to_graph(index.shortest_path(index.word_node("日曜"), index.word_node("日本")))
+    word, kanji = graph["nodes"][:2]
+    assert word == {"id": 6, "text": "日曜", "type": "word", "meaning": "meaning of 日曜", "reading": ""}
+    assert kanji == {"id": "日", "text": "日", "type": "kanji", "meanings": ["meaning of 日"], "is_consolidated": False}
+
+def test_shortest_path_same_word_and_disconnected_words():
+    index = WordKanjiIndex(WORDS)
+    assert index.shortest_path(index.word_node("日本"), index.word_node("日本")) == [index.word_node("日本")]
+    assert index.shortest_path(index.word_node("日本"), index.word_node("猫")) is None
+
+def test_shortest_path_is_shortest():
+    words = make_words(["一二", "二三", "三四", "四五", "一五"])
+    index = WordKanjiIndex(words)
+    path = index.shortest_path(index.word_node("一二"), index.word_node("四五"))
+    assert [index.to_graph(path)["nodes"][i]["text"] for i in (0, 2, 4)] == ["一二", "一五", "四五"]
+
+def test_path_service_rebuilds_index_when_dataset_changes():
+    loader = FakeLoader(WORDS)
+    service = PathService(loader)
+    assert service.find_path("日本", "本気")["nodes"][1]["text"] == "本"
+    assert service.find_path("日本", "未知") is None
+    assert loader.loads == 1
+    loader.words, loader.version = make_words(["日本", "猫"]), "v2"
+    assert service.find_path("日本", "本気") is None
+    assert not service.has_word("本気")
+    assert loader.loads == 2
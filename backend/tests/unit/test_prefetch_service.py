@@ -0,0 +1,61 @@
+import pytest # type: ignore
+from backend.src.services import metrics_service
+from backend.src.services.prefetch_service import Prefetcher, kanji_in_graph
+
+GRAPH = {"nodes": [
+    {"id": 1, "text": "日本", "type": "word"},
+    {"id": "休日", "text": "休日", "type": "kanji"},
+    {"id": "日曜日", "text": "日曜日", "type": "kanji"},
+    {"id": "月曜", "text": "月曜", "type": "kanji"},
+]}
+
+class FakeJisho:
+    def __init__(self, cached=(), status=200):
+        self.cached = set(cached)
+        self.status = status
+        self.calls = []
+
+    def is_cached(self, kanji):
+        return kanji in self.cached
+
+    def search_by_kanji(self, kanji, projection=None, priority="interactive"):
+        self.calls.append((kanji, projection.slim if projection else None, priority))
+        return {"data": []}, self.status
+
+def test_kanji_in_graph_orders_by_frequency_and_skips_word_nodes():
+    assert kanji_in_graph(GRAPH)[:2] == ["日", "曜"]
+    assert set(kanji_in_graph(GRAPH)) == {"日", "曜", "休", "月"}
+    assert "本" not in kanji_in_graph(GRAPH)
+
+def test_prefetches_uncached_kanji_at_prefetch_priority_in_slim_view():
+    jisho = FakeJisho(cached=("休",))
+    prefetcher = Prefetcher(jisho)
+    scheduled = prefetcher.prefetch_graph(GRAPH)
+    prefetcher.join(2)
+    assert set(scheduled) == {"日", "曜", "月"}
+    assert {(kanji, True, "prefetch") for kanji in scheduled} == set(jisho.calls)
+
+def test_per_graph_cap_and_budget():
+    jisho = FakeJisho()
+    assert len(Prefetcher(jisho, per_graph=2).prefetch_graph(GRAPH)) == 2
+    assert Prefetcher(jisho, burst=1).prefetch_graph(GRAPH) == ["日"]
+
+def test_hit_ratio_counts_lookups_of_prefetched_kanji():
+    metrics_service.REGISTRY.reset()
+    prefetcher = Prefetcher(FakeJisho())
+    prefetcher.prefetch_graph({"nodes": [{"text": "日", "type": "kanji"}, {"text": "月", "type": "kanji"}]})
+    prefetcher.join(2)
+    prefetcher.record_lookup("日")
+    prefetcher.record_lookup("日") # only the first lookup after a prefetch counts
+    prefetcher.record_lookup("火")
+    assert metrics_service.PREFETCHES.value(result="issued") == 2
+    assert metrics_service.PREFETCHES.value(result="used") == 1
+    assert metrics_service.PREFETCH_HIT_RATIO.value() == 0.5
+
+def test_failed_prefetch_is_not_counted_as_issued():
+    metrics_service.REGISTRY.reset()
+    prefetcher = Prefetcher(FakeJisho(status=503))
+    prefetcher.prefetch_graph({"nodes": [{"text": "日", "type": "kanji"}]})
+    prefetcher.join(2)
+    assert metrics_service.PREFETCHES.value(result="issued") == 0
+    assert metrics_service.PREFETCHES.value(result="failed") == 1
@@ -0,0 +1,90 @@
+import json
+import re
+import pytest # type: ignore
+from backend.src.models.word import Word
+from backend.src.services import prerender_service
+
+GRAPHS = {
+    "日曜": {"nodes": [{"id": 1, "text": "日曜", "type": "word"},
+                      {"id": "休日", "text": "休日", "type": "kanji"},
+                      {"id": "月曜", "text": "月曜", "type": "kanji"}]},
+    "日本": {"nodes": [{"id": 2, "text": "日本", "type": "word"},
+                      {"id": "本日", "text": "本日", "type": "kanji"}]},
+    "失敗": {"nodes": []},
+}
+
+class FakeLoader:
+    def load_data(self):
+        return [Word(id=i, text=text, reading="", meaning="", kanji_components=[]) for i, text in enumerate(GRAPHS)]
+
+class FakeGraphService:
+    def build_cacheable(self, targets):
+        text = targets[0].text
+        return GRAPHS[text], None if text == "失敗" else 3600.0
+
+class FakeJisho:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def search_by_kanji(self, kanji, projection=None, priority="interactive"):
+        self.calls.append((kanji, projection.slim, priority))
+        if kanji in self.failing:
+            return {"error": "unavailable"}, 503
+        return {"data": [{"slug": kanji}]}, 200
+
+@pytest.fixture
+def vercel_config(tmp_path):
+    path = tmp_path / "vercel.json"
+    path.write_text(json.dumps({"rewrites": [{"source": "/api/graph", "destination": "/api/graph.py"}]}))
+    return path
+
+def run(tmp_path, vercel_config, jisho, words=("日曜", "日本", "失敗", "未知"), **kwargs):
+    return prerender_service.prerender(FakeLoader(), FakeGraphService(), jisho, list(words),
+                                       output_dir=str(tmp_path / "out"), vercel_config=str(vercel_config), **kwargs)
+
+def test_writes_complete_graphs_and_slim_expansions(tmp_path, vercel_config):
+    jisho = FakeJisho(failing=("月",))
+    assert run(tmp_path, vercel_config, jisho) == (2, 4)
+    assert {call[1:] for call in jisho.calls} == {(True, "prefetch")}
+    config = json.loads(vercel_config.read_text())
+    rules = config["rewrites"]
+    # Generated rules come first so matching requests never reach the functions.
+    assert rules[-1] == {"source": "/api/graph", "destination": "/api/graph.py"}
+    graph_rule = next(r for r in rules if r["source"] == "/api/graph" and re.match(r["has"][0]["value"], "日曜"))
+    served = tmp_path / "out" / graph_rule["destination"][len(prerender_service.URL_PREFIX):]
+    assert json.loads(served.read_text(encoding="utf-8")) == GRAPHS["日曜"]
+    assert [m["key"] for m in graph_rule["missing"]] == ["format", "related", "include"]
+    expansions = [r for r in rules if r["source"] == "/search_by_kanji"]
+    assert {r["has"][0]["value"] for r in expansions} == {"^日$", "^休$", "^曜$", "^本$"}
+    assert {m["key"] for m in expansions[0]["missing"]} == {"fields", "limit", "offset", "seed", "max_pages", "delta",
+                                                            "content-type"}
+    assert config["headers"][0]["source"] == "/prerendered/(.*)"
+
+def _matches(rule, path, query, headers=()):
+    """Vercel's has/missing matching, for query and header conditions."""
+    values = {("query", k): v for k, v in query.items()}
+    values.update({("header", k.lower()): v for k, v in headers})
+    if rule["source"] != path:
+        return False
+    if any((c["type"], c["key"]) not in values or not re.match(c.get("value", ".*"), values[(c["type"], c["key"])])
+           for c in rule["has"]):
+        return False
+    return not any((c["type"], c["key"]) in values for c in rule["missing"])
+
+def test_expansion_rule_skips_the_delta_post(tmp_path, vercel_config):
+    run(tmp_path, vercel_config, FakeJisho())
+    rule = next(r for r in json.loads(vercel_config.read_text())["rewrites"]
+                if r["source"] == "/search_by_kanji" and r["has"][0]["value"] == "^日$")
+    assert _matches(rule, "/search_by_kanji", {"kanji": "日", "view": "slim"})
+    assert not _matches(rule, "/search_by_kanji", {"kanji": "日", "view": "slim", "delta": "1"})
+    assert not _matches(rule, "/search_by_kanji", {"kanji": "日", "view": "slim"}, [("Content-Type", "text/plain")])
+
+def test_limits_and_rerun_replaces_generated_rules(tmp_path, vercel_config):
+    jisho = FakeJisho()
+    run(tmp_path, vercel_config, jisho)
+    assert run(tmp_path, vercel_config, jisho, words=("日本",), max_expansions=1) == (1, 1)
+    config = json.loads(vercel_config.read_text())
+    assert [r["source"] for r in config["rewrites"]] == ["/api/graph", "/graph", "/search_by_kanji", "/api/graph"]
+    assert len(config["headers"]) == 1
+    assert len(list((tmp_path / "out" / "graph").iterdir())) == 1
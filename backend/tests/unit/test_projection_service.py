@@ -0,0 +1,48 @@
+import pytest # type: ignore
+from backend.src.services.projection_service import Projection, parse_projection, project_results
+
+NORMAL_ITEM = {
+    "slug": "休日",
+    "japanese": [{"word": "休日", "reading": "きゅうじつ"}],
+    "senses": [{"english_definitions": ["holiday", "day off"]}, {"english_definitions": ["rest day"]}],
+    "attribution": {"jmdict": True},
+}
+CONSOLIDATED_ITEM = {
+    "slug": "日",
+    "meanings": ["day", "sun"],
+    "readings": ["ひ", "にち"],
+    "is_consolidated": True,
+    "consolidated_members": [
+        {"slug": "日-1", "japanese": [{"word": "日", "reading": "ひ"}], "attribution": {},
+         "senses": [{"english_definitions": [f"sense {i}"], "parts_of_speech": ["Noun"]} for i in range(5)]},
+    ],
+}
+
+def test_parse_projection_without_parameters():
+    assert parse_projection(None, None) is None
+    assert parse_projection("", "") is None
+
+def test_parse_projection_fields_are_deduplicated():
+    assert parse_projection("slug, readings,slug", None) == Projection(("slug", "readings"))
+
+def test_parse_projection_rejects_unknown_view():
+    with pytest.raises(ValueError):
+        parse_projection(None, "full")
+
+def test_slim_view_derives_readings_and_meanings():
+    result = project_results({"data": [NORMAL_ITEM]}, parse_projection(None, "slim"))
+    assert result["data"] == [{"slug": "休日", "is_consolidated": False, "readings": ["きゅうじつ"], "meanings": ["holiday"]}]
+
+def test_slim_view_trims_consolidated_members():
+    item = project_results({"data": [CONSOLIDATED_ITEM]}, parse_projection(None, "slim"))["data"][0]
+    assert item["meanings"] == ["day", "sun"]
+    member = item["consolidated_members"][0]
+    assert member == {
+        "slug": "日-1",
+        "japanese": [{"reading": "ひ"}],
+        "senses": [{"english_definitions": ["sense 0"]}, {"english_definitions": ["sense 1"]}, {"english_definitions": ["sense 2"]}],
+    }
+
+def test_fields_projection_keeps_only_requested_fields_and_meta():
+    result = project_results({"meta": {"status": 200}, "data": [NORMAL_ITEM]}, Projection(("slug", "attribution")))
+    assert result == {"meta": {"status": 200}, "data": [{"slug": "休日", "attribution": {"jmdict": True}}]}
@@ -0,0 +1,59 @@
+import pytest # type: ignore
+from backend.src.models.kanji import Kanji
+from backend.src.models.word import Word
+from backend.src.services.reading_service import ReadingIndex, ReadingService, fold_reading, is_kana
+
+KATARU = Kanji(1, "語", "word", ["ゴ"], ["かた.る", "かた.らう"], [])
+HI = Kanji(2, "日", "day", ["ニチ", "ジツ"], ["ひ", "-び", "-か"], [])
+WORDS = [
+    Word(1, "日本語", "にほんご", "Japanese language", [HI, KATARU]),
+    Word(2, "物語", "ものがたり", "tale", [KATARU]),
+    Word(3, "begin", "begin", "start", []),
+]
+
+class FakeLoader:
+    def __init__(self, words, version="v1"):
+        self.words = words
+        self.version = version
+
+    def load_data(self):
+        return self.words
+
+    def dataset_version(self):
+        return self.version
+
+@pytest.mark.parametrize("reading, folded", [
+    ("ニチ", "にち"), ("かた.る", "かたる"), ("-び", "び"), ("ヶ", "ゖ"), (" ほん ", "ほん"),
+])
+def test_fold_reading(reading, folded):
+    assert fold_reading(reading) == folded
+
+def test_is_kana():
+    assert is_kana("にち") and is_kana("ニチ") and is_kana("ラーメン") and is_kana("かた.る")
+    assert not is_kana("") and not is_kana("日") and not is_kana("nichi") and not is_kana("-")
+
+def test_index_maps_on_and_kun_readings_to_kanji():
+    index = ReadingIndex(WORDS)
+    assert [k.character for k in index.kanji("にち")] == ["日"]
+    assert [k.character for k in index.kanji("ニチ")] == ["日"]
+    assert [k.character for k in index.kanji("かたる")] == ["語"]
+    # Okurigana readings are also found by their stem.
+    assert [k.character for k in index.kanji("かた")] == ["語"]
+    assert [k.character for k in index.kanji("び")] == ["日"]
+    assert index.kanji("ねこ") == []
+
+def test_index_maps_word_readings_to_words():
+    index = ReadingIndex(WORDS)
+    assert [w.text for w in index.words("ニホンゴ")] == ["日本語"]
+    assert index.words("begin") == []
+
+def test_service_lookup_and_rebuild():
+    loader = FakeLoader(WORDS)
+    service = ReadingService(loader)
+    result = service.lookup("ゴ")
+    assert result["reading"] == "ご"
+    assert [k["character"] for k in result["kanji"]] == ["語"]
+    assert service.words_for_reading("ものがたり")[0].id == 2
+    assert service.words_for_reading("物語") == []
+    loader.words, loader.version = WORDS[:1], "v2"
+    assert service.words_for_reading("ものがたり") == []
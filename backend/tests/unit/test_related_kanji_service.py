@@ -0,0 +1,65 @@
+import pytest # type: ignore
+from backend.src.models.kanji import Kanji
+from backend.src.models.word import Word
+from backend.src.services import related_kanji_service
+from backend.src.services.related_kanji_service import RelatedIndex, RelatedKanjiService, build_related
+
+def make_words(texts):
+    return [Word(n, text, "", text, [Kanji(ord(ch), ch, f"meaning of {ch}", [], [], []) for ch in text])
+            for n, text in enumerate(texts, start=1)]
+
+WORDS = make_words(["日本", "日本人", "本日", "日曜", "月曜", "人気", "気分", "日光"])
+
+class FakeLoader:
+    def __init__(self, words, version="v1"):
+        self.words = words
+        self.version = version
+
+    def load_data(self):
+        return self.words
+
+    def dataset_version(self):
+        return self.version
+
+def test_build_related_ranks_by_normalized_pmi():
+    related = build_related(WORDS)
+    assert set(related) == set("日本人曜月気分光")
+    # 本 appears in three words, all with 日; 光 only once, with 日.
+    assert [n[0] for n in related["本"]][:1] == ["日"]
+    assert related["本"][0][2] == 3
+    # 曜 shares one word each with 月 and 日, but 日 is so common that the pair is below chance.
+    assert [n[0] for n in related["曜"]] == ["月"]
+    assert all(score > 0 for _, score, _ in related["日"])
+    assert related["分"] == [("気", pytest.approx(related["分"][0][1]), 1)]
+
+def test_build_related_top_k_and_min_count():
+    assert len(build_related(WORDS, top_k=1)["日"]) == 1
+    assert build_related(WORDS, min_count=2)["日"] == [("本", pytest.approx(build_related(WORDS)["本"][0][1]), 3)]
+
+def test_write_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "related.json.gz")
+    related = build_related(WORDS)
+    related_kanji_service.write_related(path, "v1", related)
+    loaded = related_kanji_service.load_related(path)
+    assert loaded.dataset_version == "v1"
+    assert dict(loaded.neighbours) == related
+    assert related_kanji_service.load_related(str(tmp_path / "missing.json.gz")) is None
+
+def test_service_uses_precomputed_index_only_for_its_dataset_version():
+    precomputed = RelatedIndex("v1", {"日": [("猫", 0.5, 1)]})
+    loader = FakeLoader(WORDS)
+    service = RelatedKanjiService(loader, precomputed=precomputed)
+    assert service.related("日") == [{"kanji": "猫", "meaning": "", "score": 0.5, "count": 1}]
+    loader.version = "v2"
+    assert service.related("日", limit=1)[0]["kanji"] == "本"
+    assert service.related("日", limit=1)[0]["meaning"] == "meaning of 本"
+    assert service.related("猫") is None
+
+@pytest.mark.parametrize("parse, value", [
+    (related_kanji_service.parse_limit, "0"), (related_kanji_service.parse_limit, "21"),
+    (related_kanji_service.parse_related, "-1"), (related_kanji_service.parse_related, "6"),
+    (related_kanji_service.parse_related, "x"),
+])
+def test_parse_rejects_out_of_range(parse, value):
+    with pytest.raises(ValueError):
+        parse(value)
@@ -0,0 +1,24 @@
+import pytest # type: ignore
+from backend.src.services.sampling_service import DEFAULT_LIMIT, MAX_LIMIT, Page, parse_page, select
+
+def test_parse_page():
+    assert parse_page(None, None, None) is None
+    assert parse_page("5", None, None) == Page(limit=5)
+    assert parse_page(None, "20", "3") == Page(limit=DEFAULT_LIMIT, offset=20, seed=3)
+
+@pytest.mark.parametrize("limit, offset, seed", [
+    ("0", None, None), (str(MAX_LIMIT + 1), None, None), ("x", None, None), (None, "-1", None), (None, None, "abc"),
+])
+def test_parse_page_rejects_invalid(limit, offset, seed):
+    with pytest.raises(ValueError):
+        parse_page(limit, offset, seed)
+
+def test_select_window_and_seeded_sample():
+    items = list(range(50))
+    assert select(items, Page(limit=3, offset=4), "日") == [4, 5, 6]
+    sample = select(items, Page(limit=10, seed=1), "日")
+    assert sample == select(items, Page(limit=10, seed=1), "日")
+    assert sample != items[:10]
+    assert sample != select(items, Page(limit=10, seed=2), "日")
+    shuffled = [x for offset in range(0, 50, 10) for x in select(items, Page(limit=10, offset=offset, seed=1), "日")]
+    assert sorted(shuffled) == items
@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest # type: ignore
+from backend.src.services.scheduler_service import (
+    EXPANSION, INTERACTIVE, PREFETCH, QueueRejected, TokenBucket, UpstreamScheduler)
+
+def _wait_for_depth(scheduler, depth, priority=None):
+    deadline = time.monotonic() + 2
+    while scheduler.depth(priority) != depth and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert scheduler.depth(priority) == depth
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=10, burst=2)
+    now = time.monotonic()
+    assert bucket.try_take(now)
+    assert bucket.try_take(now)
+    assert not bucket.try_take(now)
+    assert bucket.time_until_token(now) == pytest.approx(0.1, abs=0.01)
+    assert bucket.try_take(now + 0.11)
+
+def test_higher_priority_goes_first():
+    scheduler = UpstreamScheduler("test", rate=5, burst=1)
+    with scheduler.slot(PREFETCH): # drain the bucket so the next two calls queue
+        pass
+    order = []
+
+    def run(priority):
+        with scheduler.slot(priority):
+            order.append(priority)
+
+    prefetch = threading.Thread(target=run, args=(PREFETCH,))
+    with scheduler._cond: # hold the scheduler so both calls are queued before either is admitted
+        prefetch.start()
+        expansion = threading.Thread(target=run, args=(EXPANSION,))
+        expansion.start()
+        time.sleep(0.01)
+    prefetch.join(2)
+    expansion.join(2)
+    assert order == [EXPANSION, PREFETCH]
+
+def test_concurrency_limit_per_class():
+    scheduler = UpstreamScheduler("test", concurrency={PREFETCH: 1}, max_wait={PREFETCH: 0.05})
+    scheduler.acquire(PREFETCH)
+    with pytest.raises(QueueRejected) as excinfo:
+        scheduler.acquire(PREFETCH)
+    assert excinfo.value.reason == "timeout"
+    scheduler.acquire(INTERACTIVE) # other classes are unaffected
+
+def test_full_queue_rejects():
+    scheduler = UpstreamScheduler("test", concurrency={PREFETCH: 0}, queue_sizes={PREFETCH: 1},
+                                  max_wait={PREFETCH: 1})
+    waiter = threading.Thread(target=lambda: pytest.raises(QueueRejected, scheduler.acquire, PREFETCH))
+    waiter.start()
+    _wait_for_depth(scheduler, 1, PREFETCH)
+    with pytest.raises(QueueRejected) as excinfo:
+        scheduler.acquire(PREFETCH)
+    assert excinfo.value.reason == "queue_full"
+    waiter.join(2)
+
+def test_low_priority_is_shed_under_pressure():
+    scheduler = UpstreamScheduler("test", concurrency={INTERACTIVE: 0, PREFETCH: 0}, max_queued=1,
+                                  max_wait={INTERACTIVE: 0.05, PREFETCH: 2})
+    reasons = []
+    def prefetch():
+        try:
+            scheduler.acquire(PREFETCH)
+        except QueueRejected as e:
+            reasons.append(e.reason)
+    thread = threading.Thread(target=prefetch)
+    thread.start()
+    _wait_for_depth(scheduler, 1, PREFETCH)
+    with pytest.raises(QueueRejected) as excinfo:
+        scheduler.acquire(INTERACTIVE)
+    thread.join(2)
+    assert reasons == ["shed"]
+    assert excinfo.value.reason == "timeout" # it was queued in place of the prefetch
+
+def test_unknown_priority():
+    with pytest.raises(ValueError):
+        UpstreamScheduler("test").acquire("urgent")
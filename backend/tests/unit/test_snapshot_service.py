@@ -0,0 +1,62 @@
+import pytest # type: ignore
+from unittest.mock import patch
+from backend.src.services import snapshot_service
+from backend.src.services.jisho_service import JishoService
+
+class FakeJisho:
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = failing
+
+    def search_by_kanji(self, kanji, projection=None, priority="interactive"):
+        self.calls.append((kanji, priority))
+        if kanji in self.failing:
+            return {"error": "Failed"}, 502
+        return {"data": [{"slug": kanji + "本"}]}, 200
+
+def test_write_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    snapshot_service.write_snapshot(path, {("search_by_kanji", "日"): {"data": []}})
+    snapshot = snapshot_service.load_snapshot(path)
+    assert dict(snapshot) == {("search_by_kanji", "日"): {"data": []}}
+    with pytest.raises(TypeError):
+        snapshot[("search_by_kanji", "月")] = {} # read-only
+
+def test_missing_or_unreadable_snapshot_is_empty(tmp_path):
+    assert len(snapshot_service.load_snapshot(str(tmp_path / "missing.json.gz"))) == 0
+    corrupt = tmp_path / "corrupt.json.gz"
+    corrupt.write_bytes(b"not gzip")
+    assert len(snapshot_service.load_snapshot(str(corrupt))) == 0
+
+def test_kanji_in_text():
+    assert snapshot_service.kanji_in_text("日本 語、日\nabc ひらがな") == ["日", "本", "語"]
+
+def test_warm_kanji_fetches_at_prefetch_priority(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    jisho = FakeJisho(failing=("月",))
+    fetched, skipped, failed = snapshot_service.warm_kanji(jisho, ["日", "月", "本"], path)
+    assert (fetched, skipped, failed) == (2, 0, 1)
+    assert {priority for _, priority in jisho.calls} == {"prefetch"}
+    assert set(snapshot_service.load_snapshot(path)) == {("search_by_kanji", "日"), ("search_by_kanji", "本")}
+
+def test_warm_kanji_resumes_from_existing_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    snapshot_service.warm_kanji(FakeJisho(failing=("月",)), ["日", "月"], path)
+    jisho = FakeJisho()
+    fetched, skipped, failed = snapshot_service.warm_kanji(jisho, ["日", "月"], path)
+    assert (fetched, skipped, failed) == (1, 1, 0)
+    assert jisho.calls == [("月", "prefetch")]
+
+def test_warm_kanji_checkpoints_progress(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    with patch.object(snapshot_service, "write_snapshot", wraps=snapshot_service.write_snapshot) as write:
+        snapshot_service.warm_kanji(FakeJisho(), ["日", "月", "本"], path, concurrency=1, checkpoint_every=1)
+    assert write.call_count == 4
+
+@patch("requests.get")
+def test_jisho_service_serves_snapshot_without_upstream_call(mock_get):
+    snapshot = {("search_by_kanji", "日"): {"data": [{"slug": "日本"}]}}
+    response, status = JishoService(snapshot=snapshot).search_by_kanji("日")
+    assert status == 200
+    assert response == {"data": [{"slug": "日本"}]}
+    mock_get.assert_not_called()
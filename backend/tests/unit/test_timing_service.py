@@ -0,0 +1,37 @@
+import pytest # type: ignore
+from backend.src.services import timing_service
+
+
+@pytest.fixture(autouse=True)
+def clear_request():
+    yield
+    timing_service.end_request()
+
+def test_phase_without_request_is_noop():
+    with timing_service.phase('jisho'):
+        pass
+    assert timing_service.current() is None
+
+def test_repeated_phases_are_summed():
+    timing = timing_service.start_request()
+    timing.add('jisho', 0.010)
+    timing.add('jisho', 0.020)
+    header = timing.header(include_total=False)
+    assert header == 'jisho;dur=30.0;desc="2 calls"'
+
+def test_phase_records_into_current_request():
+    timing_service.start_request()
+    with timing_service.phase('build'):
+        pass
+    header = timing_service.end_request().header()
+    assert header.startswith('build;dur=')
+    assert 'total;dur=' in header
+
+def test_cache_results_are_merged_per_cache():
+    timing = timing_service.start_request()
+    timing_service.record_cache('words', hit=True)
+    timing_service.record_cache('jisho', hit=True)
+    timing_service.record_cache('jisho', hit=False)
+    header = timing.header(include_total=False)
+    assert 'cache-words;desc="hit"' in header
+    assert 'cache-jisho;desc="partial"' in header
@@ -13,6 +13,7 @@ import { MeaningDisplayManager } from '../managers/MeaningDisplayManager.js';
 import { GraphExpansionManager } from '../managers/GraphExpansionManager.js';
 import { GraphLayoutManager } from '../managers/GraphLayoutManager.js';
 import { GraphViewManager } from '../managers/GraphViewManager.js';
+import { BloomFilter } from '../utils/BloomFilter.js';
 import { VERCEL_URL } from '../api-config.js';
 
 // Class to manage the Rinku Graph functionality (expansion, nodes, sidebar)
@@ -30,6 +31,11 @@ export class RinkuGraph extends CanvasComponent {
 
         this.isSearching = false;
         this.MAX_WORDS_TO_DISPLAY = 3;
+        // Below this many words on the canvas, expansions use the cacheable GET (CDN, prerendered copies).
+        // Beyond it, the canvas's slugs are posted so the server only returns new words,
+        // as a plain list up to DELTA_MAX_LIST_SLUGS and as a Bloom filter above that.
+        this.DELTA_MIN_SLUGS = 16;
+        this.DELTA_MAX_LIST_SLUGS = 256;
 
         this.kanjiRegex = /[\u4e00-\u9faf]/;
 
@@ -190,17 +196,47 @@ export class RinkuGraph extends CanvasComponent {
 
     // --- Data Fetching ---
 
-    async fetchRelatedWords(kanjiChar) {
+    /**
+     * Fetches the words containing a kanji that are not on the canvas yet.
+     * @param {string} kanjiChar - The kanji to expand.
+     * @param {{limit?: number, seed?: number}} [options] - Ask the server for at most `limit` words,
+     *     sampled deterministically with `seed` instead of downloading every related word.
+     * @returns {Promise<Array<Object>>}
+     */
+    async fetchRelatedWords(kanjiChar, { limit, seed } = {}) {
         try {
-            const response = await fetch(`${VERCEL_URL}/search_by_kanji?kanji=${encodeURIComponent(kanjiChar)}`);
+            const existingSlugs = new Set(Array.from(this.nodesContainer.querySelectorAll('[data-word-slug]')).map(n => n.dataset.wordSlug));
+            existingSlugs.add(this.word);
+            const useDelta = existingSlugs.size >= this.DELTA_MIN_SLUGS;
+
+            // view=slim trims each result to what expansion nodes display (slug, readings, meanings).
+            let url = `${VERCEL_URL}/search_by_kanji?kanji=${encodeURIComponent(kanjiChar)}&view=slim`;
+            if (limit !== undefined) {
+                // A GET sample may include words already on the canvas, so ask for enough to drop them.
+                url += `&limit=${useDelta ? limit : limit + existingSlugs.size}`;
+            }
+            if (seed !== undefined) {
+                url += `&seed=${seed}`;
+            }
+            let response;
+            if (!useDelta) {
+                response = await fetch(url);
+            } else {
+                // delta=1 keeps the POST off the prerendered static copies, which rewrites match by URL alone.
+                url += '&delta=1';
+                const body = existingSlugs.size <= this.DELTA_MAX_LIST_SLUGS
+                    ? { exclude: Array.from(existingSlugs) }
+                    : { bloom: BloomFilter.from(existingSlugs) };
+                // text/plain keeps this a simple request (no CORS preflight); the server reads it as JSON.
+                response = await fetch(url, { method: 'POST', headers: { 'Content-Type': 'text/plain' }, body: JSON.stringify(body) });
+            }
             if (!response.ok) {
                 throw new Error(`API error for ${kanjiChar}: ${response.status}`);
             }
             const results = await response.json();
             //console.log(`API response for ${kanjiChar}:`, results);
-            const existingSlugs = new Set(Array.from(this.nodesContainer.querySelectorAll('[data-word-slug]')).map(n => n.dataset.wordSlug));
-            existingSlugs.add(this.word);
 
+            // Still filtered here, since GET responses carry every word.
             return results.data.filter(item => !existingSlugs.has(item.slug));
         } catch (error) {
             console.error('Failed to expand kanji:', error);
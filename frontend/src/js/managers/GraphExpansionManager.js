@@ -7,6 +7,8 @@ export class GraphExpansionManager {
         this.viewManager = config.viewManager;
         this.kanjiRegex = config.kanjiRegex;
         this.MAX_WORDS_TO_DISPLAY = config.MAX_WORDS_TO_DISPLAY;
+        // Rerandomizing draws one of this many server-side samples, few enough that HTTP caches share them.
+        this.SAMPLE_SEEDS = 100;
     }
 
     /**
@@ -191,16 +193,13 @@ export class GraphExpansionManager {
             return;
         }
 
-        const allRelatedWords = await this.graph.fetchRelatedWords(sourceKanji);
+        // The server shuffles with the seed and returns only a sample; one extra word tells whether more remain.
+        const seed = Math.floor(Math.random() * this.SAMPLE_SEEDS);
+        const sampledWords = await this.graph.fetchRelatedWords(sourceKanji, { limit: slotsToFill + 1, seed });
 
         const expandedWordSlugs = expandedChildren.map(child => child.dataset.wordSlug).filter(slug => slug);
-        const availableWords = allRelatedWords.filter(word => !expandedWordSlugs.includes(word.slug));
-
-        let newWordsToDisplay = [];
-        if (availableWords.length > 0) {
-            this._shuffleArray(availableWords);
-            newWordsToDisplay = availableWords.slice(0, slotsToFill);
-        }
+        const availableWords = sampledWords.filter(word => !expandedWordSlugs.includes(word.slug));
+        const newWordsToDisplay = availableWords.slice(0, slotsToFill);
 
         const hasMore = availableWords.length > newWordsToDisplay.length;
         if (hasMore) {
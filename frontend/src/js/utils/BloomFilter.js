@@ -0,0 +1,85 @@
+// FNV-1a (32-bit), with MurmurHash3's finalizer to spread it into the two double-hashing seeds.
+const FNV_PRIME = 0x01000193;
+const FNV_BASIS = 0x811c9dc5;
+const SEED_2 = 0x5bd1e995;
+
+const encoder = new TextEncoder();
+
+function fnv1a(bytes) {
+    let h = FNV_BASIS;
+    for (const byte of bytes) {
+        h = Math.imul(h ^ byte, FNV_PRIME) >>> 0;
+    }
+    return h;
+}
+
+function fmix32(h) {
+    h ^= h >>> 16;
+    h = Math.imul(h, 0x85ebca6b);
+    h ^= h >>> 13;
+    h = Math.imul(h, 0xc2b2ae35);
+    return (h ^ (h >>> 16)) >>> 0;
+}
+
+/**
+ * A Bloom filter over word slugs, sent to /search_by_kanji so the server can leave out
+ * words already on the canvas. The layout and hashing must match
+ * backend/src/services/exclusion_service.py.
+ */
+export class BloomFilter {
+    /**
+     * @param {number} capacity - Number of slugs the filter is sized for.
+     * @param {number} [bitsPerItem=10] - Bits per slug; 10 with 7 hashes gives about 1% false positives.
+     * @param {number} [hashes=7] - Probes per slug.
+     */
+    constructor(capacity, bitsPerItem = 10, hashes = 7) {
+        this.bits = new Uint8Array(Math.max(1, Math.ceil(capacity * bitsPerItem / 8)));
+        this.hashes = hashes;
+        this.size = this.bits.length * 8;
+    }
+
+    /**
+     * Builds a filter holding every slug in the iterable.
+     * @param {Iterable<string>} slugs
+     * @returns {BloomFilter}
+     */
+    static from(slugs) {
+        const list = Array.from(slugs);
+        const filter = new BloomFilter(list.length);
+        list.forEach(slug => filter.add(slug));
+        return filter;
+    }
+
+    *probes(slug) {
+        const h = fnv1a(encoder.encode(slug));
+        const h1 = fmix32(h);
+        const h2 = fmix32((h ^ SEED_2) >>> 0);
+        for (let k = 0; k < this.hashes; k++) {
+            yield ((h1 + Math.imul(k, h2)) >>> 0) % this.size;
+        }
+    }
+
+    add(slug) {
+        for (const i of this.probes(slug)) {
+            this.bits[i >> 3] |= 1 << (i & 7);
+        }
+    }
+
+    has(slug) {
+        for (const i of this.probes(slug)) {
+            if (!(this.bits[i >> 3] & (1 << (i & 7)))) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /**
+     * @returns {{bits: string, hashes: number}} The request body form: base64 bits and the probe count.
+     */
+    toJSON() {
+        let binary = '';
+        this.bits.forEach(byte => { binary += String.fromCharCode(byte); });
+        return { bits: btoa(binary), hashes: this.hashes };
+    }
+}
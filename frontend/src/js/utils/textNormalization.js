@@ -0,0 +1,72 @@
+// Script ranges as [first, last, script], sorted by first code point. This is the table in
+// backend/src/services/normalization_service.py; change both together. NFKC output never
+// contains half-width katakana or full-width Latin, so those blocks are not listed.
+const SCRIPT_RANGES = [
+    [0x0030, 0x0039, 'latin'],
+    [0x0041, 0x005A, 'latin'],
+    [0x0061, 0x007A, 'latin'],
+    [0x00C0, 0x024F, 'latin'],
+    [0x3000, 0x3004, 'punctuation'],
+    [0x3005, 0x3007, 'kanji'],
+    [0x3008, 0x303F, 'punctuation'],
+    [0x3041, 0x309F, 'hiragana'],
+    [0x30A0, 0x30FF, 'katakana'],
+    [0x31F0, 0x31FF, 'katakana'],
+    [0x3400, 0x4DBF, 'kanji'],
+    [0x4E00, 0x9FFF, 'kanji'],
+    [0xF900, 0xFAFF, 'kanji'],
+    [0x20000, 0x3134F, 'kanji'],
+];
+
+const JAPANESE_SCRIPTS = new Set(['hiragana', 'katakana', 'kanji']);
+
+/**
+ * The canonical form of a query, as the backend computes it: NFKC (full-width Latin and
+ * half-width katakana folded to their usual width), trimmed, whitespace collapsed and
+ * lower-cased. Sending it keeps equivalent queries on one URL, and so one cache entry.
+ * @param {string} text
+ * @returns {string}
+ */
+export function normalizeQuery(text) {
+    return text.normalize('NFKC').trim().split(/\s+/).join(' ').toLowerCase();
+}
+
+/**
+ * @param {string} ch - One character (a full code point).
+ * @returns {string|null} 'hiragana', 'katakana', 'kanji', 'latin', 'punctuation', or null.
+ */
+export function scriptOf(ch) {
+    const code = ch.codePointAt(0);
+    let lo = 0;
+    let hi = SCRIPT_RANGES.length - 1;
+    while (lo <= hi) {
+        const mid = (lo + hi) >> 1;
+        const [first, last, script] = SCRIPT_RANGES[mid];
+        if (code < first) {
+            hi = mid - 1;
+        } else if (code > last) {
+            lo = mid + 1;
+        } else {
+            return script;
+        }
+    }
+    return null;
+}
+
+export function isKanji(ch) {
+    return scriptOf(ch) === 'kanji';
+}
+
+/**
+ * Whether every character is kana, kanji or CJK punctuation.
+ * @param {string} text
+ * @returns {boolean}
+ */
+export function isJapaneseText(text) {
+    const chars = Array.from(text.normalize('NFKC'));
+    return chars.length > 0 && chars.every(ch => JAPANESE_SCRIPTS.has(scriptOf(ch)) || scriptOf(ch) === 'punctuation');
+}
+
+export function containsKanji(text) {
+    return Array.from(text).some(isKanji);
+}
@@ -1,5 +1,6 @@
 // This service will communicate with the backend API.
 import { VERCEL_URL } from '../js/api-config.js';
+import { containsKanji, isJapaneseText, normalizeQuery } from '../js/utils/textNormalization.js';
 
 // Prefix all API calls with the Vercel URL when set, otherwise use relative paths.
 const BASE = VERCEL_URL;
@@ -10,7 +11,7 @@ export async function getLocalSuggestions(query) {
         return [];
     }
     try {
-        const response = await fetch(`${BASE}/api/suggestions?q=${encodeURIComponent(query)}`);
+        const response = await fetch(`${BASE}/api/suggestions?q=${encodeURIComponent(normalizeQuery(query))}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -27,16 +28,14 @@ export async function searchJishoWords(query) {
         return [];
     }
     try {
-        const response = await fetch(`${BASE}/search_words?query=${encodeURIComponent(query.toLowerCase())}`);
+        const response = await fetch(`${BASE}/search_words?query=${encodeURIComponent(normalizeQuery(query))}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         const data = await response.json();
         // Extract relevant terms for suggestions
         const suggestions = data.data ? data.data.map(item => item.slug) : [];
-        const japaneseRegex = /^[\u3000-\u303f\u3040-\u309f\u30a0-\u30ff\uff00-\uff9f\u4e00-\u9faf\u3400-\u4dbf]+$/;
-        const kanjiRegex = /[\u4e00-\u9faf\u3400-\u4dbf]/;
-        return suggestions.filter(s => japaneseRegex.test(s) && kanjiRegex.test(s));
+        return suggestions.filter(s => isJapaneseText(s) && containsKanji(s));
     } catch (error) {
         console.error("Failed to fetch Jisho words:", error);
         return [];
@@ -49,15 +48,14 @@ export async function searchJishoKanji(query) {
         return [];
     }
     try {
-        const response = await fetch(`${BASE}/search_by_kanji?kanji=${encodeURIComponent(query.toLowerCase())}`);
+        const response = await fetch(`${BASE}/search_by_kanji?kanji=${encodeURIComponent(normalizeQuery(query))}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         const data = await response.json();
         // Extract relevant terms for suggestions
         const suggestions = data.data ? data.data.map(item => item.character) : [];
-        const japaneseRegex = /^[　-〿぀-ゟ゠-ヿ＀-ﾟ一-龯㐀-䶿]+$/;
-        return suggestions.filter(s => japaneseRegex.test(s));
+        return suggestions.filter(s => isJapaneseText(s));
     } catch (error) {
         console.error("Failed to fetch Jisho kanji:", error);
         return [];
@@ -125,7 +125,7 @@ describe('Integration: API Mocking', () => {
 
         await rinkuGraph.expansionManager.handleKanjiClick({ currentTarget: kanjiSpan });
 
-        expect(fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5');
+        expect(fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5&view=slim');
         expect(nodesContainer.querySelector('[data-word-slug="mockRelated1"]')).not.toBeNull();
         expect(nodesContainer.querySelector('[data-word-slug="mockRelated2"]')).not.toBeNull();
     });
@@ -145,7 +145,7 @@ describe('Integration: API Mocking', () => {
 
         await rinkuGraph.expansionManager.handleKanjiClick({ currentTarget: kanjiSpan });
 
-        expect(fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5');
+        expect(fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5&view=slim');
         expect(consoleErrorSpy).toHaveBeenCalledWith("Failed to expand kanji:", new Error('API error for 日: 500'));
         expect(nodesContainer.children.length).toBe(0); // No nodes should be added on error
 
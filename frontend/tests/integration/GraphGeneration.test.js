@@ -123,7 +123,7 @@ describe('Integration: Word Input and Graph Generation Flow', () => {
         await rinkuGraph.expansionManager.handleKanjiClick({ currentTarget: clickedKanjiSpan });
 
         // Assertions
-        expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5');
+        expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5&view=slim');
         expect(clickedKanjiSpan.classList.contains('active-source-kanji')).toBe(true);
 
         // Expect new nodes and lines to be created
@@ -145,7 +145,7 @@ describe('Integration: Word Input and Graph Generation Flow', () => {
 
         await rinkuGraph.expansionManager.handleKanjiClick({ currentTarget: clickedKanjiSpan });
 
-        expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5');
+        expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5&view=slim');
         expect(clickedKanjiSpan.classList.contains('expanded-parent-kanji')).toBe(true);
         expect(nodesContainer.children.length).toBe(0);
         expect(svgLayer.children.length).toBe(0);
@@ -159,7 +159,7 @@ describe('Integration: Word Input and Graph Generation Flow', () => {
 
         await rinkuGraph.expansionManager.handleKanjiClick({ currentTarget: clickedKanjiSpan });
 
-        expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5');
+        expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5&view=slim');
         expect(consoleErrorSpy).toHaveBeenCalledWith('Failed to expand kanji:', expect.any(Error));
         expect(nodesContainer.children.length).toBe(0);
 
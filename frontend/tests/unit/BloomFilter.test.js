@@ -0,0 +1,14 @@
+import { BloomFilter } from '../../src/js/utils/BloomFilter.js';
+
+describe('BloomFilter', () => {
+    test('should encode like the backend filter', () => {
+        // Same slugs as backend/tests/unit/test_exclusion_service.py
+        expect(BloomFilter.from(['日曜', '月曜日', 'abc']).toJSON()).toEqual({ bits: 'lFoZ8w==', hashes: 7 });
+    });
+
+    test('should contain every added slug', () => {
+        const slugs = Array.from({ length: 300 }, (_, i) => `語${i}`);
+        const filter = BloomFilter.from(slugs);
+        expect(slugs.every(slug => filter.has(slug))).toBe(true);
+    });
+});
@@ -235,7 +235,7 @@ describe('GraphExpansionManager', () => {
 
             expect(unexpandedChild.parentNode).toBeNull();
             expect(parentNode._children.length).toBe(0);
-            expect(mockGraph.fetchRelatedWords).toHaveBeenCalledWith('日');
+            expect(mockGraph.fetchRelatedWords).toHaveBeenCalledWith('日', { limit: 4, seed: expect.any(Number) });
             expect(mockLayoutManager.drawExpansion).toHaveBeenCalledWith(sourceKanjiElement, '日', [{ slug: 'newWord' }]);
         });
 
@@ -271,19 +271,16 @@ describe('GraphExpansionManager', () => {
             expect(sourceKanjiElement.dataset.hasMoreWords).toBeUndefined();
         });
 
-        test('should select random words from the available pool', async () => {
-            const allWords = [{ slug: '日' }, { slug: '日本' }, { slug: '本日' }, { slug: '休日' }];
-            mockGraph.fetchRelatedWords.mockResolvedValueOnce(allWords);
-            // Mock shuffle to be predictable
-            const shuffleSpy = jest.spyOn(expansionManager, '_shuffleArray').mockImplementation(arr => arr.reverse());
+        test('should show the server sample in order and keep the extra word as a hint', async () => {
+            const sampledWords = [{ slug: '休日' }, { slug: '本日' }, { slug: '日本' }, { slug: '日' }];
+            mockGraph.fetchRelatedWords.mockResolvedValueOnce(sampledWords);
 
             await expansionManager.rerandomizeNode(sourceKanjiElement);
 
-            expect(mockLayoutManager.drawExpansion).toHaveBeenCalled();
             const wordsToDisplay = mockLayoutManager.drawExpansion.mock.calls[0][2];
-            // With 3 slots to fill and a reversed array, we expect the last 3 words.
+            // 3 slots to fill: the first 3 sampled words, and the 4th means more are available.
             expect(wordsToDisplay.map(w => w.slug)).toEqual(['休日', '本日', '日本']);
-            shuffleSpy.mockRestore();
+            expect(sourceKanjiElement.dataset.hasMoreWords).toBe('true');
         });
     });
 });
\ No newline at end of file
@@ -260,10 +260,29 @@ describe('RinkuGraph', () => {
             });
 
             const results = await rinkuGraph.fetchRelatedWords('日');
-            expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5'); // URL encoding for '日'
+            expect(global.fetch).toHaveBeenCalledWith('/search_by_kanji?kanji=%E6%97%A5&view=slim'); // URL encoding for '日'
             expect(results).toEqual([{ slug: 'word1' }, { slug: 'word2' }]);
         });
 
+        test('should post existing slugs once the canvas is large', async () => {
+            for (let i = 0; i < rinkuGraph.DELTA_MIN_SLUGS; i++) {
+                const node = document.createElement('div');
+                node.dataset.wordSlug = `word${i}`;
+                nodesContainer.appendChild(node);
+            }
+            global.fetch.mockResolvedValueOnce({
+                ok: true,
+                json: () => Promise.resolve({ data: [{ slug: 'newword' }] })
+            });
+
+            const results = await rinkuGraph.fetchRelatedWords('日');
+            const [url, options] = global.fetch.mock.calls[0];
+            expect(url).toBe('/search_by_kanji?kanji=%E6%97%A5&view=slim');
+            expect(options.method).toBe('POST');
+            expect(JSON.parse(options.body).exclude).toContain('word0');
+            expect(results).toEqual([{ slug: 'newword' }]);
+        });
+
         test('should handle API errors', async () => {
             global.fetch.mockResolvedValueOnce({
                 ok: false,
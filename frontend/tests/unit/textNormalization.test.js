@@ -0,0 +1,29 @@
+import { containsKanji, isJapaneseText, isKanji, normalizeQuery, scriptOf } from '../../src/js/utils/textNormalization.js';
+
+describe('textNormalization', () => {
+    test('should normalize like the backend', () => {
+        // Same cases as backend/tests/unit/test_normalization_service.py
+        expect(normalizeQuery('ＴＥＳＴ')).toBe('test');
+        expect(normalizeQuery('  Hello   World ')).toBe('hello world');
+        expect(normalizeQuery('ﾃｽﾄ')).toBe('テスト');
+    });
+
+    test('should classify scripts like the backend', () => {
+        expect(scriptOf('あ')).toBe('hiragana');
+        expect(scriptOf('ー')).toBe('katakana');
+        expect(scriptOf('㐀')).toBe('kanji');
+        expect(scriptOf('𠀋')).toBe('kanji');
+        expect(scriptOf('〜')).toBe('punctuation');
+        expect(scriptOf('!')).toBeNull();
+        expect(isKanji('日')).toBe(true);
+    });
+
+    test('should require every character to be Japanese', () => {
+        expect(isJapaneseText('日本語')).toBe(true);
+        expect(isJapaneseText('ﾃｽﾄ')).toBe(true);
+        expect(isJapaneseText('日本a')).toBe(false);
+        expect(isJapaneseText('')).toBe(false);
+        expect(containsKanji('ひらがな')).toBe(false);
+        expect(containsKanji('㐀')).toBe(true);
+    });
+});